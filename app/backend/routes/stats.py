@@ -0,0 +1,17 @@
+from fastapi import APIRouter
+
+from src.data.stats import get_stats
+
+router = APIRouter(prefix="/stats")
+
+
+@router.get("/data")
+async def data_stats():
+    """Cache hits and misses, stored bytes, evictions and upstream latency per dataset and ticker."""
+    return get_stats().snapshot()
+
+
+@router.post("/data/reset")
+async def reset_data_stats():
+    get_stats().reset()
+    return {"status": "reset"}
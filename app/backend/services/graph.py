@@ -8,7 +8,7 @@ from src.agents.portfolio_manager import portfolio_management_agent
 from src.agents.risk_manager import risk_management_agent
 from src.graph.state import AgentState
 from src.main import start
-from src.utils.analysts import ANALYST_CONFIG
+from src.utils.analysts import ANALYST_CONFIG, get_analyst_nodes
 
 
 # Helper function to create the agent graph
@@ -21,7 +21,7 @@ def create_graph(selected_agents: list[str]) -> StateGraph:
     selected_agents = [agent for agent in selected_agents if agent in ANALYST_CONFIG]
 
     # Get analyst nodes from the configuration
-    analyst_nodes = {key: (f"{key}_agent", config["agent_func"]) for key, config in ANALYST_CONFIG.items()}
+    analyst_nodes = get_analyst_nodes()
 
     # Add selected analyst nodes
     for agent_name in selected_agents:
@@ -4,6 +4,7 @@ import json
 from typing import Literal
 
 from langchain_core.messages import HumanMessage
+from langchain_core.prompt_values import ChatPromptValue
 from langchain_core.prompts import ChatPromptTemplate
 from pydantic import BaseModel
 
@@ -13,8 +14,12 @@ from src.tools.api import (
     get_market_cap,
     search_line_items,
 )
-from src.utils.llm import call_llm
+from src.utils.llm import call_llm_per_ticker
 from src.utils.progress import progress
+from src.utils.tickers import run_per_ticker
+
+# Bump when the prompt or scoring changes, so the decision store stops serving older signals
+PROMPT_VERSION = 1
 
 
 class AswathDamodaranSignal(BaseModel):
@@ -37,9 +42,8 @@ def aswath_damodaran_agent(state: AgentState):
     tickers = data["tickers"]
 
     analysis_data: dict[str, dict] = {}
-    damodaran_signals: dict[str, dict] = {}
 
-    for ticker in tickers:
+    def analyze_ticker(ticker: str) -> ChatPromptValue:
         # ─── Fetch core data ────────────────────────────────────────────────────
         progress.update_status("aswath_damodaran_agent", ticker, "Fetching financial metrics")
         metrics = get_financial_metrics(ticker, end_date, period="ttm", limit=5)
@@ -95,15 +99,13 @@ def aswath_damodaran_agent(state: AgentState):
 
         # ─── LLM: craft Damodaran-style narrative ──────────────────────────────
         progress.update_status("aswath_damodaran_agent", ticker, "Generating Damodaran analysis")
-        damodaran_output = generate_damodaran_output(
-            ticker=ticker,
-            analysis_data=analysis_data,
-            state=state,
-        )
-
-        damodaran_signals[ticker] = damodaran_output.model_dump()
+        return damodaran_prompt(ticker, analysis_data)
 
+    prompts = run_per_ticker(tickers, analyze_ticker)
+    damodaran_signals = {}
+    for ticker, damodaran_output in call_llm_per_ticker(prompts, AswathDamodaranSignal, "aswath_damodaran_agent", state, default_factory=default_signal).items():
         progress.update_status("aswath_damodaran_agent", ticker, "Done", analysis=damodaran_output.reasoning)
+        damodaran_signals[ticker] = damodaran_output.model_dump()
 
     # ─── Push message back to graph state ──────────────────────────────────────
     message = HumanMessage(content=json.dumps(damodaran_signals), name="aswath_damodaran_agent")
@@ -333,11 +335,10 @@ def estimate_cost_of_equity(beta: float | None) -> float:
 # ────────────────────────────────────────────────────────────────────────────────
 # LLM generation
 # ────────────────────────────────────────────────────────────────────────────────
-def generate_damodaran_output(
+def damodaran_prompt(
     ticker: str,
     analysis_data: dict[str, any],
-    state: AgentState,
-) -> AswathDamodaranSignal:
+) -> ChatPromptValue:
     """
     Ask the LLM to channel Prof. Damodaran's analytical style:
       • Story → Numbers → Value narrative
@@ -375,19 +376,12 @@ def generate_damodaran_output(
         ]
     )
 
-    prompt = template.invoke({"analysis_data": json.dumps(analysis_data, indent=2), "ticker": ticker})
+    return template.invoke({"analysis_data": json.dumps(analysis_data, indent=2), "ticker": ticker})
 
-    def default_signal():
-        return AswathDamodaranSignal(
-            signal="neutral",
-            confidence=0.0,
-            reasoning="Parsing error; defaulting to neutral",
-        )
 
-    return call_llm(
-        prompt=prompt,
-        pydantic_model=AswathDamodaranSignal,
-        agent_name="aswath_damodaran_agent",
-        state=state,
-        default_factory=default_signal,
+def default_signal() -> AswathDamodaranSignal:
+    return AswathDamodaranSignal(
+        signal="neutral",
+        confidence=0.0,
+        reasoning="Parsing error; defaulting to neutral",
     )
@@ -3,13 +3,18 @@ import math
 from typing import Literal
 
 from langchain_core.messages import HumanMessage
+from langchain_core.prompt_values import ChatPromptValue
 from langchain_core.prompts import ChatPromptTemplate
 from pydantic import BaseModel
 
 from src.graph.state import AgentState, show_agent_reasoning
 from src.tools.api import get_market_cap, search_line_items
-from src.utils.llm import call_llm
+from src.utils.llm import call_llm_per_ticker
 from src.utils.progress import progress
+from src.utils.tickers import run_per_ticker
+
+# Bump when the prompt or scoring changes, so the decision store stops serving older signals
+PROMPT_VERSION = 1
 
 
 class BenGrahamSignal(BaseModel):
@@ -31,9 +36,8 @@ def ben_graham_agent(state: AgentState):
     tickers = data["tickers"]
 
     analysis_data = {}
-    graham_analysis = {}
 
-    for ticker in tickers:
+    def analyze_ticker(ticker: str) -> ChatPromptValue:
         progress.update_status("ben_graham_agent", ticker, "Fetching financial metrics")
         # metrics = get_financial_metrics(ticker, end_date, period="annual", limit=10)
 
@@ -92,20 +96,18 @@ def ben_graham_agent(state: AgentState):
         }
 
         progress.update_status("ben_graham_agent", ticker, "Generating Ben Graham analysis")
-        graham_output = generate_graham_output(
-            ticker=ticker,
-            analysis_data=analysis_data,
-            state=state,
-        )
+        return graham_prompt(ticker, {ticker: analysis_data[ticker]})
 
+    prompts = run_per_ticker(tickers, analyze_ticker)
+    graham_analysis = {}
+    for ticker, graham_output in call_llm_per_ticker(prompts, BenGrahamSignal, "ben_graham_agent", state, default_factory=create_default_ben_graham_signal).items():
+        progress.update_status("ben_graham_agent", ticker, "Done", analysis=graham_output.reasoning)
         graham_analysis[ticker] = {
             "signal": graham_output.signal,
             "confidence": graham_output.confidence,
             "reasoning": graham_output.reasoning,
         }
 
-        progress.update_status("ben_graham_agent", ticker, "Done", analysis=graham_output.reasoning)
-
     # Wrap results in a single message for the chain
     message = HumanMessage(content=json.dumps(graham_analysis), name="ben_graham_agent")
 
@@ -308,11 +310,10 @@ def analyze_valuation_graham(financial_line_items: list, market_cap: float) -> d
     return {"score": score, "details": "; ".join(details)}
 
 
-def generate_graham_output(
+def graham_prompt(
     ticker: str,
     analysis_data: dict[str, any],
-    state: AgentState,
-) -> BenGrahamSignal:
+) -> ChatPromptValue:
     """
     Generates an investment decision in the style of Benjamin Graham:
     - Value emphasis, margin of safety, net-nets, conservative balance sheet, stable earnings.
@@ -362,19 +363,12 @@ def generate_graham_output(
         ]
     )
 
-    prompt = template.invoke({"analysis_data": json.dumps(analysis_data, indent=2), "ticker": ticker})
+    return template.invoke({"analysis_data": json.dumps(analysis_data, indent=2), "ticker": ticker})
 
-    def create_default_ben_graham_signal():
-        return BenGrahamSignal(
-            signal="neutral",
-            confidence=0.0,
-            reasoning="Error in generating analysis; defaulting to neutral.",
-        )
 
-    return call_llm(
-        prompt=prompt,
-        pydantic_model=BenGrahamSignal,
-        agent_name="ben_graham_agent",
-        state=state,
-        default_factory=create_default_ben_graham_signal,
+def create_default_ben_graham_signal() -> BenGrahamSignal:
+    return BenGrahamSignal(
+        signal="neutral",
+        confidence=0.0,
+        reasoning="Error in generating analysis; defaulting to neutral.",
     )
@@ -2,13 +2,18 @@ import json
 from typing import Literal
 
 from langchain_core.messages import HumanMessage
+from langchain_core.prompt_values import ChatPromptValue
 from langchain_core.prompts import ChatPromptTemplate
 from pydantic import BaseModel
 
 from src.graph.state import AgentState, show_agent_reasoning
 from src.tools.api import get_financial_metrics, get_market_cap, search_line_items
-from src.utils.llm import call_llm
+from src.utils.llm import call_llm_per_ticker
 from src.utils.progress import progress
+from src.utils.tickers import run_per_ticker
+
+# Bump when the prompt or scoring changes, so the decision store stops serving older signals
+PROMPT_VERSION = 1
 
 
 class BillAckmanSignal(BaseModel):
@@ -28,9 +33,8 @@ def bill_ackman_agent(state: AgentState):
     tickers = data["tickers"]
 
     analysis_data = {}
-    ackman_analysis = {}
 
-    for ticker in tickers:
+    def analyze_ticker(ticker: str) -> ChatPromptValue:
         progress.update_status("bill_ackman_agent", ticker, "Fetching financial metrics")
         metrics = get_financial_metrics(ticker, end_date, period="annual", limit=5)
 
@@ -97,20 +101,18 @@ def bill_ackman_agent(state: AgentState):
         }
 
         progress.update_status("bill_ackman_agent", ticker, "Generating Bill Ackman analysis")
-        ackman_output = generate_ackman_output(
-            ticker=ticker,
-            analysis_data=analysis_data,
-            state=state,
-        )
+        return ackman_prompt(ticker, {ticker: analysis_data[ticker]})
 
+    prompts = run_per_ticker(tickers, analyze_ticker)
+    ackman_analysis = {}
+    for ticker, ackman_output in call_llm_per_ticker(prompts, BillAckmanSignal, "bill_ackman_agent", state, default_factory=create_default_bill_ackman_signal).items():
+        progress.update_status("bill_ackman_agent", ticker, "Done", analysis=ackman_output.reasoning)
         ackman_analysis[ticker] = {
             "signal": ackman_output.signal,
             "confidence": ackman_output.confidence,
             "reasoning": ackman_output.reasoning,
         }
 
-        progress.update_status("bill_ackman_agent", ticker, "Done", analysis=ackman_output.reasoning)
-
     # Wrap results in a single message for the chain
     message = HumanMessage(content=json.dumps(ackman_analysis), name="bill_ackman_agent")
 
@@ -364,11 +366,10 @@ def analyze_valuation(financial_line_items: list, market_cap: float) -> dict:
     }
 
 
-def generate_ackman_output(
+def ackman_prompt(
     ticker: str,
     analysis_data: dict[str, any],
-    state: AgentState,
-) -> BillAckmanSignal:
+) -> ChatPromptValue:
     """
     Generates investment decisions in the style of Bill Ackman.
     Includes more explicit references to brand strength, activism potential,
@@ -416,19 +417,12 @@ def generate_ackman_output(
         ]
     )
 
-    prompt = template.invoke({"analysis_data": json.dumps(analysis_data, indent=2), "ticker": ticker})
+    return template.invoke({"analysis_data": json.dumps(analysis_data, indent=2), "ticker": ticker})
 
-    def create_default_bill_ackman_signal():
-        return BillAckmanSignal(
-            signal="neutral",
-            confidence=0.0,
-            reasoning="Error in analysis, defaulting to neutral",
-        )
 
-    return call_llm(
-        prompt=prompt,
-        pydantic_model=BillAckmanSignal,
-        agent_name="bill_ackman_agent",
-        state=state,
-        default_factory=create_default_bill_ackman_signal,
+def create_default_bill_ackman_signal() -> BillAckmanSignal:
+    return BillAckmanSignal(
+        signal="neutral",
+        confidence=0.0,
+        reasoning="Error in analysis, defaulting to neutral",
     )
@@ -2,13 +2,18 @@ import json
 from typing import Literal
 
 from langchain_core.messages import HumanMessage
+from langchain_core.prompt_values import ChatPromptValue
 from langchain_core.prompts import ChatPromptTemplate
 from pydantic import BaseModel
 
 from src.graph.state import AgentState, show_agent_reasoning
 from src.tools.api import get_financial_metrics, get_market_cap, search_line_items
-from src.utils.llm import call_llm
+from src.utils.llm import call_llm_per_ticker
 from src.utils.progress import progress
+from src.utils.tickers import run_per_ticker
+
+# Bump when the prompt or scoring changes, so the decision store stops serving older signals
+PROMPT_VERSION = 1
 
 
 class CathieWoodSignal(BaseModel):
@@ -30,9 +35,8 @@ def cathie_wood_agent(state: AgentState):
     tickers = data["tickers"]
 
     analysis_data = {}
-    cw_analysis = {}
 
-    for ticker in tickers:
+    def analyze_ticker(ticker: str) -> ChatPromptValue:
         progress.update_status("cathie_wood_agent", ticker, "Fetching financial metrics")
         metrics = get_financial_metrics(ticker, end_date, period="annual", limit=5)
 
@@ -92,20 +96,18 @@ def cathie_wood_agent(state: AgentState):
         }
 
         progress.update_status("cathie_wood_agent", ticker, "Generating Cathie Wood analysis")
-        cw_output = generate_cathie_wood_output(
-            ticker=ticker,
-            analysis_data=analysis_data,
-            state=state,
-        )
+        return cathie_wood_prompt(ticker, {ticker: analysis_data[ticker]})
 
+    prompts = run_per_ticker(tickers, analyze_ticker)
+    cw_analysis = {}
+    for ticker, cw_output in call_llm_per_ticker(prompts, CathieWoodSignal, "cathie_wood_agent", state, default_factory=create_default_cathie_wood_signal).items():
+        progress.update_status("cathie_wood_agent", ticker, "Done", analysis=cw_output.reasoning)
         cw_analysis[ticker] = {
             "signal": cw_output.signal,
             "confidence": cw_output.confidence,
             "reasoning": cw_output.reasoning,
         }
 
-        progress.update_status("cathie_wood_agent", ticker, "Done", analysis=cw_output.reasoning)
-
     message = HumanMessage(content=json.dumps(cw_analysis), name="cathie_wood_agent")
 
     if state["metadata"].get("show_reasoning"):
@@ -399,11 +401,10 @@ def analyze_cathie_wood_valuation(financial_line_items: list, market_cap: float)
     }
 
 
-def generate_cathie_wood_output(
+def cathie_wood_prompt(
     ticker: str,
     analysis_data: dict[str, any],
-    state: AgentState,
-) -> CathieWoodSignal:
+) -> ChatPromptValue:
     """
     Generates investment decisions in the style of Cathie Wood.
     """
@@ -468,21 +469,14 @@ def generate_cathie_wood_output(
         ]
     )
 
-    prompt = template.invoke({"analysis_data": json.dumps(analysis_data, indent=2), "ticker": ticker})
+    return template.invoke({"analysis_data": json.dumps(analysis_data, indent=2), "ticker": ticker})
 
-    def create_default_cathie_wood_signal():
-        return CathieWoodSignal(
-            signal="neutral",
-            confidence=0.0,
-            reasoning="Error in analysis, defaulting to neutral",
-        )
 
-    return call_llm(
-        prompt=prompt,
-        pydantic_model=CathieWoodSignal,
-        agent_name="cathie_wood_agent",
-        state=state,
-        default_factory=create_default_cathie_wood_signal,
+def create_default_cathie_wood_signal() -> CathieWoodSignal:
+    return CathieWoodSignal(
+        signal="neutral",
+        confidence=0.0,
+        reasoning="Error in analysis, defaulting to neutral",
     )
 
 
@@ -2,6 +2,7 @@ import json
 from typing import Literal
 
 from langchain_core.messages import HumanMessage
+from langchain_core.prompt_values import ChatPromptValue
 from langchain_core.prompts import ChatPromptTemplate
 from pydantic import BaseModel
 
@@ -13,8 +14,12 @@ from src.tools.api import (
     get_market_cap,
     search_line_items,
 )
-from src.utils.llm import call_llm
+from src.utils.llm import call_llm_per_ticker
 from src.utils.progress import progress
+from src.utils.tickers import run_per_ticker
+
+# Bump when the prompt or scoring changes, so the decision store stops serving older signals
+PROMPT_VERSION = 1
 
 
 class CharlieMungerSignal(BaseModel):
@@ -33,9 +38,8 @@ def charlie_munger_agent(state: AgentState):
     tickers = data["tickers"]
 
     analysis_data = {}
-    munger_analysis = {}
 
-    for ticker in tickers:
+    def analyze_ticker(ticker: str) -> ChatPromptValue:
         progress.update_status("charlie_munger_agent", ticker, "Fetching financial metrics")
         metrics = get_financial_metrics(ticker, end_date, period="annual", limit=10)  # Munger looks at longer periods
 
@@ -125,20 +129,18 @@ def charlie_munger_agent(state: AgentState):
         }
 
         progress.update_status("charlie_munger_agent", ticker, "Generating Charlie Munger analysis")
-        munger_output = generate_munger_output(
-            ticker=ticker,
-            analysis_data=analysis_data,
-            state=state,
-        )
+        return munger_prompt(ticker, {ticker: analysis_data[ticker]})
 
+    prompts = run_per_ticker(tickers, analyze_ticker)
+    munger_analysis = {}
+    for ticker, munger_output in call_llm_per_ticker(prompts, CharlieMungerSignal, "charlie_munger_agent", state, default_factory=create_default_charlie_munger_signal).items():
+        progress.update_status("charlie_munger_agent", ticker, "Done", analysis=munger_output.reasoning)
         munger_analysis[ticker] = {
             "signal": munger_output.signal,
             "confidence": munger_output.confidence,
             "reasoning": munger_output.reasoning,
         }
 
-        progress.update_status("charlie_munger_agent", ticker, "Done", analysis=munger_output.reasoning)
-
     # Wrap results in a single message for the chain
     message = HumanMessage(content=json.dumps(munger_analysis), name="charlie_munger_agent")
 
@@ -631,11 +633,10 @@ def analyze_news_sentiment(news_items: list) -> str:
     return f"Qualitative review of {len(news_items)} recent news items would be needed"
 
 
-def generate_munger_output(
+def munger_prompt(
     ticker: str,
     analysis_data: dict[str, any],
-    state: AgentState,
-) -> CharlieMungerSignal:
+) -> ChatPromptValue:
     """
     Generates investment decisions in the style of Charlie Munger.
     """
@@ -695,19 +696,12 @@ def generate_munger_output(
         ]
     )
 
-    prompt = template.invoke({"analysis_data": json.dumps(analysis_data, indent=2), "ticker": ticker})
+    return template.invoke({"analysis_data": json.dumps(analysis_data, indent=2), "ticker": ticker})
 
-    def create_default_charlie_munger_signal():
-        return CharlieMungerSignal(
-            signal="neutral",
-            confidence=0.0,
-            reasoning="Error in analysis, defaulting to neutral",
-        )
 
-    return call_llm(
-        prompt=prompt,
-        state=state,
-        pydantic_model=CharlieMungerSignal,
-        agent_name="charlie_munger_agent",
-        default_factory=create_default_charlie_munger_signal,
+def create_default_charlie_munger_signal() -> CharlieMungerSignal:
+    return CharlieMungerSignal(
+        signal="neutral",
+        confidence=0.0,
+        reasoning="Error in analysis, defaulting to neutral",
     )
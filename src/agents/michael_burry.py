@@ -5,6 +5,7 @@ from datetime import datetime, timedelta
 from typing import Literal
 
 from langchain_core.messages import HumanMessage
+from langchain_core.prompt_values import ChatPromptValue
 from langchain_core.prompts import ChatPromptTemplate
 from pydantic import BaseModel
 
@@ -16,14 +17,19 @@ from src.tools.api import (
     get_market_cap,
     search_line_items,
 )
-from src.utils.llm import call_llm
+from src.utils.llm import call_llm_per_ticker
 from src.utils.progress import progress
+from src.utils.tickers import run_per_ticker
 
 __all__ = [
+    "PROMPT_VERSION",
     "MichaelBurrySignal",
     "michael_burry_agent",
 ]
 
+# Bump when the prompt or scoring changes, so the decision store stops serving older signals
+PROMPT_VERSION = 1
+
 ###############################################################################
 # Pydantic output model
 ###############################################################################
@@ -53,9 +59,8 @@ def michael_burry_agent(state: AgentState):
     start_date = (datetime.fromisoformat(end_date) - timedelta(days=365)).date().isoformat()
 
     analysis_data: dict[str, dict] = {}
-    burry_analysis: dict[str, dict] = {}
 
-    for ticker in tickers:
+    def analyze_ticker(ticker: str) -> ChatPromptValue:
         # ------------------------------------------------------------------
         # Fetch raw data
         # ------------------------------------------------------------------
@@ -130,20 +135,18 @@ def michael_burry_agent(state: AgentState):
         }
 
         progress.update_status("michael_burry_agent", ticker, "Generating LLM output")
-        burry_output = _generate_burry_output(
-            ticker=ticker,
-            analysis_data=analysis_data,
-            state=state,
-        )
+        return _burry_prompt(ticker, {ticker: analysis_data[ticker]})
 
+    prompts = run_per_ticker(tickers, analyze_ticker)
+    burry_analysis = {}
+    for ticker, burry_output in call_llm_per_ticker(prompts, MichaelBurrySignal, "michael_burry_agent", state, default_factory=create_default_michael_burry_signal).items():
+        progress.update_status("michael_burry_agent", ticker, "Done", analysis=burry_output.reasoning)
         burry_analysis[ticker] = {
             "signal": burry_output.signal,
             "confidence": burry_output.confidence,
             "reasoning": burry_output.reasoning,
         }
 
-        progress.update_status("michael_burry_agent", ticker, "Done", analysis=burry_output.reasoning)
-
     # ----------------------------------------------------------------------
     # Return to the graph
     # ----------------------------------------------------------------------
@@ -317,11 +320,10 @@ def _analyze_contrarian_sentiment(news):
 ###############################################################################
 
 
-def _generate_burry_output(
+def _burry_prompt(
     ticker: str,
     analysis_data: dict,
-    state: AgentState,
-) -> MichaelBurrySignal:
+) -> ChatPromptValue:
     """Call the LLM to craft the final trading signal in Burry's voice."""
 
     template = ChatPromptTemplate.from_messages(
@@ -364,20 +366,13 @@ def _generate_burry_output(
         ]
     )
 
-    prompt = template.invoke({"analysis_data": json.dumps(analysis_data, indent=2), "ticker": ticker})
+    return template.invoke({"analysis_data": json.dumps(analysis_data, indent=2), "ticker": ticker})
 
-    # Default fallback signal in case parsing fails
-    def create_default_michael_burry_signal():
-        return MichaelBurrySignal(
-            signal="neutral",
-            confidence=0.0,
-            reasoning="Parsing error - defaulting to neutral",
-        )
 
-    return call_llm(
-        prompt=prompt,
-        pydantic_model=MichaelBurrySignal,
-        agent_name="michael_burry_agent",
-        state=state,
-        default_factory=create_default_michael_burry_signal,
+# Default fallback signal in case parsing fails
+def create_default_michael_burry_signal() -> MichaelBurrySignal:
+    return MichaelBurrySignal(
+        signal="neutral",
+        confidence=0.0,
+        reasoning="Parsing error - defaulting to neutral",
     )
@@ -2,6 +2,7 @@ import json
 from typing import Literal
 
 from langchain_core.messages import HumanMessage
+from langchain_core.prompt_values import ChatPromptValue
 from langchain_core.prompts import ChatPromptTemplate
 from pydantic import BaseModel
 
@@ -14,8 +15,12 @@ from src.tools.api import (
     get_prices,
     search_line_items,
 )
-from src.utils.llm import call_llm
+from src.utils.llm import call_llm_per_ticker
 from src.utils.progress import progress
+from src.utils.tickers import run_per_ticker
+
+# Bump when the prompt or scoring changes, so the decision store stops serving older signals
+PROMPT_VERSION = 1
 
 
 class PeterLynchSignal(BaseModel):
@@ -49,9 +54,8 @@ def peter_lynch_agent(state: AgentState):
     tickers = data["tickers"]
 
     analysis_data = {}
-    lynch_analysis = {}
 
-    for ticker in tickers:
+    def analyze_ticker(ticker: str) -> ChatPromptValue:
         progress.update_status("peter_lynch_agent", ticker, "Fetching financial metrics")
         get_financial_metrics(ticker, end_date, period="annual", limit=5)
 
@@ -133,20 +137,18 @@ def peter_lynch_agent(state: AgentState):
         }
 
         progress.update_status("peter_lynch_agent", ticker, "Generating Peter Lynch analysis")
-        lynch_output = generate_lynch_output(
-            ticker=ticker,
-            analysis_data=analysis_data[ticker],
-            state=state,
-        )
+        return lynch_prompt(ticker, analysis_data[ticker])
 
+    prompts = run_per_ticker(tickers, analyze_ticker)
+    lynch_analysis = {}
+    for ticker, lynch_output in call_llm_per_ticker(prompts, PeterLynchSignal, "peter_lynch_agent", state, default_factory=create_default_signal).items():
+        progress.update_status("peter_lynch_agent", ticker, "Done", analysis=lynch_output.reasoning)
         lynch_analysis[ticker] = {
             "signal": lynch_output.signal,
             "confidence": lynch_output.confidence,
             "reasoning": lynch_output.reasoning,
         }
 
-        progress.update_status("peter_lynch_agent", ticker, "Done", analysis=lynch_output.reasoning)
-
     # Wrap up results
     message = HumanMessage(content=json.dumps(lynch_analysis), name="peter_lynch_agent")
 
@@ -443,11 +445,10 @@ def analyze_insider_activity(insider_trades: list) -> dict:
     return {"score": score, "details": "; ".join(details)}
 
 
-def generate_lynch_output(
+def lynch_prompt(
     ticker: str,
     analysis_data: dict[str, any],
-    state: AgentState,
-) -> PeterLynchSignal:
+) -> ChatPromptValue:
     """
     Generates a final JSON signal in Peter Lynch's voice & style.
     """
@@ -493,19 +494,12 @@ def generate_lynch_output(
         ]
     )
 
-    prompt = template.invoke({"analysis_data": json.dumps(analysis_data, indent=2), "ticker": ticker})
+    return template.invoke({"analysis_data": json.dumps(analysis_data, indent=2), "ticker": ticker})
 
-    def create_default_signal():
-        return PeterLynchSignal(
-            signal="neutral",
-            confidence=0.0,
-            reasoning="Error in analysis; defaulting to neutral",
-        )
 
-    return call_llm(
-        prompt=prompt,
-        pydantic_model=PeterLynchSignal,
-        agent_name="peter_lynch_agent",
-        state=state,
-        default_factory=create_default_signal,
+def create_default_signal() -> PeterLynchSignal:
+    return PeterLynchSignal(
+        signal="neutral",
+        confidence=0.0,
+        reasoning="Error in analysis; defaulting to neutral",
     )
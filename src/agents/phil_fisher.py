@@ -3,6 +3,7 @@ import statistics
 from typing import Literal
 
 from langchain_core.messages import HumanMessage
+from langchain_core.prompt_values import ChatPromptValue
 from langchain_core.prompts import ChatPromptTemplate
 from pydantic import BaseModel
 
@@ -14,8 +15,12 @@ from src.tools.api import (
     get_market_cap,
     search_line_items,
 )
-from src.utils.llm import call_llm
+from src.utils.llm import call_llm_per_ticker
 from src.utils.progress import progress
+from src.utils.tickers import run_per_ticker
+
+# Bump when the prompt or scoring changes, so the decision store stops serving older signals
+PROMPT_VERSION = 1
 
 
 class PhilFisherSignal(BaseModel):
@@ -41,9 +46,8 @@ def phil_fisher_agent(state: AgentState):
     tickers = data["tickers"]
 
     analysis_data = {}
-    fisher_analysis = {}
 
-    for ticker in tickers:
+    def analyze_ticker(ticker: str) -> ChatPromptValue:
         progress.update_status("phil_fisher_agent", ticker, "Fetching financial metrics")
         get_financial_metrics(ticker, end_date, period="annual", limit=5)
 
@@ -134,20 +138,18 @@ def phil_fisher_agent(state: AgentState):
         }
 
         progress.update_status("phil_fisher_agent", ticker, "Generating Phil Fisher-style analysis")
-        fisher_output = generate_fisher_output(
-            ticker=ticker,
-            analysis_data=analysis_data,
-            state=state,
-        )
+        return fisher_prompt(ticker, {ticker: analysis_data[ticker]})
 
+    prompts = run_per_ticker(tickers, analyze_ticker)
+    fisher_analysis = {}
+    for ticker, fisher_output in call_llm_per_ticker(prompts, PhilFisherSignal, "phil_fisher_agent", state, default_factory=create_default_signal).items():
+        progress.update_status("phil_fisher_agent", ticker, "Done", analysis=fisher_output.reasoning)
         fisher_analysis[ticker] = {
             "signal": fisher_output.signal,
             "confidence": fisher_output.confidence,
             "reasoning": fisher_output.reasoning,
         }
 
-        progress.update_status("phil_fisher_agent", ticker, "Done", analysis=fisher_output.reasoning)
-
     # Wrap results in a single message
     message = HumanMessage(content=json.dumps(fisher_analysis), name="phil_fisher_agent")
 
@@ -529,11 +531,10 @@ def analyze_sentiment(news_items: list) -> dict:
     return {"score": score, "details": "; ".join(details)}
 
 
-def generate_fisher_output(
+def fisher_prompt(
     ticker: str,
     analysis_data: dict[str, any],
-    state: AgentState,
-) -> PhilFisherSignal:
+) -> ChatPromptValue:
     """
     Generates a JSON signal in the style of Phil Fisher.
     """
@@ -595,19 +596,12 @@ def generate_fisher_output(
         ]
     )
 
-    prompt = template.invoke({"analysis_data": json.dumps(analysis_data, indent=2), "ticker": ticker})
+    return template.invoke({"analysis_data": json.dumps(analysis_data, indent=2), "ticker": ticker})
 
-    def create_default_signal():
-        return PhilFisherSignal(
-            signal="neutral",
-            confidence=0.0,
-            reasoning="Error in analysis, defaulting to neutral",
-        )
 
-    return call_llm(
-        prompt=prompt,
-        pydantic_model=PhilFisherSignal,
-        state=state,
-        agent_name="phil_fisher_agent",
-        default_factory=create_default_signal,
+def create_default_signal() -> PhilFisherSignal:
+    return PhilFisherSignal(
+        signal="neutral",
+        confidence=0.0,
+        reasoning="Error in analysis, defaulting to neutral",
     )
@@ -211,4 +211,5 @@ def generate_trading_decision(
         agent_name="portfolio_manager",
         state=state,
         default_factory=create_default_portfolio_output,
+        ticker=",".join(tickers),
     )
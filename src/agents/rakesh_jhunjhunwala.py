@@ -2,13 +2,18 @@ import json
 from typing import Literal
 
 from langchain_core.messages import HumanMessage
+from langchain_core.prompt_values import ChatPromptValue
 from langchain_core.prompts import ChatPromptTemplate
 from pydantic import BaseModel
 
 from src.graph.state import AgentState, show_agent_reasoning
 from src.tools.api import get_market_cap, search_line_items
-from src.utils.llm import call_llm
+from src.utils.llm import call_llm_per_ticker
 from src.utils.progress import progress
+from src.utils.tickers import run_per_ticker
+
+# Bump when the prompt or scoring changes, so the decision store stops serving older signals
+PROMPT_VERSION = 1
 
 
 class RakeshJhunjhunwalaSignal(BaseModel):
@@ -25,9 +30,8 @@ def rakesh_jhunjhunwala_agent(state: AgentState):
 
     # Collect all analysis for LLM reasoning
     analysis_data = {}
-    jhunjhunwala_analysis = {}
 
-    for ticker in tickers:
+    def analyze_ticker(ticker: str) -> ChatPromptValue:
         # Core Data
         progress.update_status("rakesh_jhunjhunwala_agent", ticker, "Fetching financial metrics")
         # metrics = get_financial_metrics(ticker, end_date, period="ttm", limit=5)
@@ -111,15 +115,13 @@ def rakesh_jhunjhunwala_agent(state: AgentState):
 
         # ─── LLM: craft Jhunjhunwala-style narrative ──────────────────────────────
         progress.update_status("rakesh_jhunjhunwala_agent", ticker, "Generating Jhunjhunwala analysis")
-        jhunjhunwala_output = generate_jhunjhunwala_output(
-            ticker=ticker,
-            analysis_data=analysis_data[ticker],
-            state=state,
-        )
-
-        jhunjhunwala_analysis[ticker] = jhunjhunwala_output.model_dump()
+        return jhunjhunwala_prompt(ticker, analysis_data[ticker])
 
+    prompts = run_per_ticker(tickers, analyze_ticker)
+    jhunjhunwala_analysis = {}
+    for ticker, jhunjhunwala_output in call_llm_per_ticker(prompts, RakeshJhunjhunwalaSignal, "rakesh_jhunjhunwala_agent", state, default_factory=create_default_rakesh_jhunjhunwala_signal).items():
         progress.update_status("rakesh_jhunjhunwala_agent", ticker, "Done", analysis=jhunjhunwala_output.reasoning)
+        jhunjhunwala_analysis[ticker] = jhunjhunwala_output.model_dump()
 
     # ─── Push message back to graph state ──────────────────────────────────────
     message = HumanMessage(content=json.dumps(jhunjhunwala_analysis), name="rakesh_jhunjhunwala_agent")
@@ -587,11 +589,10 @@ def analyze_rakesh_jhunjhunwala_style(
 # ────────────────────────────────────────────────────────────────────────────────
 # LLM generation
 # ────────────────────────────────────────────────────────────────────────────────
-def generate_jhunjhunwala_output(
+def jhunjhunwala_prompt(
     ticker: str,
     analysis_data: dict[str, any],
-    state: AgentState,
-) -> RakeshJhunjhunwalaSignal:
+) -> ChatPromptValue:
     """Get investment decision from LLM with Jhunjhunwala's principles"""
     template = ChatPromptTemplate.from_messages(
         [
@@ -638,16 +639,9 @@ def generate_jhunjhunwala_output(
         ]
     )
 
-    prompt = template.invoke({"analysis_data": json.dumps(analysis_data, indent=2), "ticker": ticker})
+    return template.invoke({"analysis_data": json.dumps(analysis_data, indent=2), "ticker": ticker})
 
-    # Default fallback signal in case parsing fails
-    def create_default_rakesh_jhunjhunwala_signal():
-        return RakeshJhunjhunwalaSignal(signal="neutral", confidence=0.0, reasoning="Error in analysis, defaulting to neutral")
 
-    return call_llm(
-        prompt=prompt,
-        pydantic_model=RakeshJhunjhunwalaSignal,
-        state=state,
-        agent_name="rakesh_jhunjhunwala_agent",
-        default_factory=create_default_rakesh_jhunjhunwala_signal,
-    )
+# Default fallback signal in case parsing fails
+def create_default_rakesh_jhunjhunwala_signal() -> RakeshJhunjhunwalaSignal:
+    return RakeshJhunjhunwalaSignal(signal="neutral", confidence=0.0, reasoning="Error in analysis, defaulting to neutral")
@@ -3,6 +3,7 @@ import statistics
 from typing import Literal
 
 from langchain_core.messages import HumanMessage
+from langchain_core.prompt_values import ChatPromptValue
 from langchain_core.prompts import ChatPromptTemplate
 from pydantic import BaseModel
 
@@ -15,8 +16,12 @@ from src.tools.api import (
     get_prices,
     search_line_items,
 )
-from src.utils.llm import call_llm
+from src.utils.llm import call_llm_per_ticker
 from src.utils.progress import progress
+from src.utils.tickers import run_per_ticker
+
+# Bump when the prompt or scoring changes, so the decision store stops serving older signals
+PROMPT_VERSION = 1
 
 
 class StanleyDruckenmillerSignal(BaseModel):
@@ -41,9 +46,8 @@ def stanley_druckenmiller_agent(state: AgentState):
     tickers = data["tickers"]
 
     analysis_data = {}
-    druck_analysis = {}
 
-    for ticker in tickers:
+    def analyze_ticker(ticker: str) -> ChatPromptValue:
         progress.update_status("stanley_druckenmiller_agent", ticker, "Fetching financial metrics")
         get_financial_metrics(ticker, end_date, period="annual", limit=5)
 
@@ -142,20 +146,18 @@ def stanley_druckenmiller_agent(state: AgentState):
             ticker,
             "Generating Stanley Druckenmiller analysis",
         )
-        druck_output = generate_druckenmiller_output(
-            ticker=ticker,
-            analysis_data=analysis_data,
-            state=state,
-        )
+        return druckenmiller_prompt(ticker, {ticker: analysis_data[ticker]})
 
+    prompts = run_per_ticker(tickers, analyze_ticker)
+    druck_analysis = {}
+    for ticker, druck_output in call_llm_per_ticker(prompts, StanleyDruckenmillerSignal, "stanley_druckenmiller_agent", state, default_factory=create_default_signal).items():
+        progress.update_status("stanley_druckenmiller_agent", ticker, "Done", analysis=druck_output.reasoning)
         druck_analysis[ticker] = {
             "signal": druck_output.signal,
             "confidence": druck_output.confidence,
             "reasoning": druck_output.reasoning,
         }
 
-        progress.update_status("stanley_druckenmiller_agent", ticker, "Done", analysis=druck_output.reasoning)
-
     # Wrap results in a single message
     message = HumanMessage(content=json.dumps(druck_analysis), name="stanley_druckenmiller_agent")
 
@@ -539,11 +541,10 @@ def analyze_druckenmiller_valuation(financial_line_items: list, market_cap: floa
     return {"score": final_score, "details": "; ".join(details)}
 
 
-def generate_druckenmiller_output(
+def druckenmiller_prompt(
     ticker: str,
     analysis_data: dict[str, any],
-    state: AgentState,
-) -> StanleyDruckenmillerSignal:
+) -> ChatPromptValue:
     """
     Generates a JSON signal in the style of Stanley Druckenmiller.
     """
@@ -601,19 +602,12 @@ def generate_druckenmiller_output(
         ]
     )
 
-    prompt = template.invoke({"analysis_data": json.dumps(analysis_data, indent=2), "ticker": ticker})
+    return template.invoke({"analysis_data": json.dumps(analysis_data, indent=2), "ticker": ticker})
 
-    def create_default_signal():
-        return StanleyDruckenmillerSignal(
-            signal="neutral",
-            confidence=0.0,
-            reasoning="Error in analysis, defaulting to neutral",
-        )
 
-    return call_llm(
-        prompt=prompt,
-        pydantic_model=StanleyDruckenmillerSignal,
-        agent_name="stanley_druckenmiller_agent",
-        state=state,
-        default_factory=create_default_signal,
+def create_default_signal() -> StanleyDruckenmillerSignal:
+    return StanleyDruckenmillerSignal(
+        signal="neutral",
+        confidence=0.0,
+        reasoning="Error in analysis, defaulting to neutral",
     )
@@ -6,7 +6,7 @@ import pandas as pd
 from langchain_core.messages import HumanMessage
 
 from src.graph.state import AgentState, show_agent_reasoning
-from src.tools.api import get_prices, prices_to_df
+from src.tools.api import get_price_frame
 from src.utils.progress import progress
 
 
@@ -30,6 +30,16 @@ def safe_float(value, default=0.0):
 
 
 ##### Technical Analyst #####
+# Weights of the strategies in the combined signal
+STRATEGY_WEIGHTS = {
+    "trend": 0.25,
+    "mean_reversion": 0.20,
+    "momentum": 0.25,
+    "volatility": 0.15,
+    "stat_arb": 0.15,
+}
+
+
 def technical_analyst_agent(state: AgentState):
     """
     Sophisticated technical analysis system that combines multiple trading strategies for multiple tickers:
@@ -51,87 +61,18 @@ def technical_analyst_agent(state: AgentState):
         progress.update_status("technical_analyst_agent", ticker, "Analyzing price data")
 
         # Get the historical price data
-        prices = get_prices(
+        prices_df = get_price_frame(
             ticker=ticker,
             start_date=start_date,
             end_date=end_date,
         )
 
-        if not prices:
+        if prices_df.empty:
             progress.update_status("technical_analyst_agent", ticker, "Failed: No price data found")
             continue
 
-        # Convert prices to a DataFrame
-        prices_df = prices_to_df(prices)
-
-        progress.update_status("technical_analyst_agent", ticker, "Calculating trend signals")
-        trend_signals = calculate_trend_signals(prices_df)
-
-        progress.update_status("technical_analyst_agent", ticker, "Calculating mean reversion")
-        mean_reversion_signals = calculate_mean_reversion_signals(prices_df)
-
-        progress.update_status("technical_analyst_agent", ticker, "Calculating momentum")
-        momentum_signals = calculate_momentum_signals(prices_df)
-
-        progress.update_status("technical_analyst_agent", ticker, "Analyzing volatility")
-        volatility_signals = calculate_volatility_signals(prices_df)
-
-        progress.update_status("technical_analyst_agent", ticker, "Statistical analysis")
-        stat_arb_signals = calculate_stat_arb_signals(prices_df)
-
-        # Combine all signals using a weighted ensemble approach
-        strategy_weights = {
-            "trend": 0.25,
-            "mean_reversion": 0.20,
-            "momentum": 0.25,
-            "volatility": 0.15,
-            "stat_arb": 0.15,
-        }
-
-        progress.update_status("technical_analyst_agent", ticker, "Combining signals")
-        combined_signal = weighted_signal_combination(
-            {
-                "trend": trend_signals,
-                "mean_reversion": mean_reversion_signals,
-                "momentum": momentum_signals,
-                "volatility": volatility_signals,
-                "stat_arb": stat_arb_signals,
-            },
-            strategy_weights,
-        )
-
-        # Generate detailed analysis report for this ticker
-        technical_analysis[ticker] = {
-            "signal": combined_signal["signal"],
-            "confidence": round(combined_signal["confidence"] * 100),
-            "reasoning": {
-                "trend_following": {
-                    "signal": trend_signals["signal"],
-                    "confidence": round(trend_signals["confidence"] * 100),
-                    "metrics": normalize_pandas(trend_signals["metrics"]),
-                },
-                "mean_reversion": {
-                    "signal": mean_reversion_signals["signal"],
-                    "confidence": round(mean_reversion_signals["confidence"] * 100),
-                    "metrics": normalize_pandas(mean_reversion_signals["metrics"]),
-                },
-                "momentum": {
-                    "signal": momentum_signals["signal"],
-                    "confidence": round(momentum_signals["confidence"] * 100),
-                    "metrics": normalize_pandas(momentum_signals["metrics"]),
-                },
-                "volatility": {
-                    "signal": volatility_signals["signal"],
-                    "confidence": round(volatility_signals["confidence"] * 100),
-                    "metrics": normalize_pandas(volatility_signals["metrics"]),
-                },
-                "statistical_arbitrage": {
-                    "signal": stat_arb_signals["signal"],
-                    "confidence": round(stat_arb_signals["confidence"] * 100),
-                    "metrics": normalize_pandas(stat_arb_signals["metrics"]),
-                },
-            },
-        }
+        progress.update_status("technical_analyst_agent", ticker, "Calculating signals")
+        technical_analysis[ticker] = analyze_prices(prices_df)
         progress.update_status("technical_analyst_agent", ticker, "Done", analysis=json.dumps(technical_analysis, indent=4))
 
     # Create the technical analyst message
@@ -366,6 +307,63 @@ def calculate_stat_arb_signals(prices_df):
     }
 
 
+def analyze_prices(prices_df: pd.DataFrame) -> dict:
+    """
+    Combined technical signal, confidence and per-strategy reasoning for one ticker's price history.
+    Works on bars of any frequency, as long as there are enough of them for the longest lookback (126 bars).
+    """
+    trend_signals = calculate_trend_signals(prices_df)
+    mean_reversion_signals = calculate_mean_reversion_signals(prices_df)
+    momentum_signals = calculate_momentum_signals(prices_df)
+    volatility_signals = calculate_volatility_signals(prices_df)
+    stat_arb_signals = calculate_stat_arb_signals(prices_df)
+
+    # Combine all signals using a weighted ensemble approach
+    combined_signal = weighted_signal_combination(
+        {
+            "trend": trend_signals,
+            "mean_reversion": mean_reversion_signals,
+            "momentum": momentum_signals,
+            "volatility": volatility_signals,
+            "stat_arb": stat_arb_signals,
+        },
+        STRATEGY_WEIGHTS,
+    )
+
+    # Generate detailed analysis report
+    return {
+        "signal": combined_signal["signal"],
+        "confidence": round(combined_signal["confidence"] * 100),
+        "reasoning": {
+            "trend_following": {
+                "signal": trend_signals["signal"],
+                "confidence": round(trend_signals["confidence"] * 100),
+                "metrics": normalize_pandas(trend_signals["metrics"]),
+            },
+            "mean_reversion": {
+                "signal": mean_reversion_signals["signal"],
+                "confidence": round(mean_reversion_signals["confidence"] * 100),
+                "metrics": normalize_pandas(mean_reversion_signals["metrics"]),
+            },
+            "momentum": {
+                "signal": momentum_signals["signal"],
+                "confidence": round(momentum_signals["confidence"] * 100),
+                "metrics": normalize_pandas(momentum_signals["metrics"]),
+            },
+            "volatility": {
+                "signal": volatility_signals["signal"],
+                "confidence": round(volatility_signals["confidence"] * 100),
+                "metrics": normalize_pandas(volatility_signals["metrics"]),
+            },
+            "statistical_arbitrage": {
+                "signal": stat_arb_signals["signal"],
+                "confidence": round(stat_arb_signals["confidence"] * 100),
+                "metrics": normalize_pandas(stat_arb_signals["metrics"]),
+            },
+        },
+    }
+
+
 def weighted_signal_combination(signals, weights):
     """
     Combines multiple trading signals using a weighted approach
@@ -2,13 +2,18 @@ import json
 from typing import Literal
 
 from langchain_core.messages import HumanMessage
+from langchain_core.prompt_values import ChatPromptValue
 from langchain_core.prompts import ChatPromptTemplate
 from pydantic import BaseModel
 
 from src.graph.state import AgentState, show_agent_reasoning
 from src.tools.api import get_financial_metrics, get_market_cap, search_line_items
-from src.utils.llm import call_llm
+from src.utils.llm import call_llm_per_ticker
 from src.utils.progress import progress
+from src.utils.tickers import run_per_ticker
+
+# Bump when the prompt or scoring changes, so the decision store stops serving older signals
+PROMPT_VERSION = 1
 
 
 class WarrenBuffettSignal(BaseModel):
@@ -25,9 +30,8 @@ def warren_buffett_agent(state: AgentState):
 
     # Collect all analysis for LLM reasoning
     analysis_data = {}
-    buffett_analysis = {}
 
-    for ticker in tickers:
+    def analyze_ticker(ticker: str) -> ChatPromptValue:
         progress.update_status("warren_buffett_agent", ticker, "Fetching financial metrics")
         # Fetch required data - request more periods for better trend analysis
         metrics = get_financial_metrics(ticker, end_date, period="ttm", limit=10)
@@ -115,12 +119,12 @@ def warren_buffett_agent(state: AgentState):
         }
 
         progress.update_status("warren_buffett_agent", ticker, "Generating Warren Buffett analysis")
-        buffett_output = generate_buffett_output(
-            ticker=ticker,
-            analysis_data=analysis_data,
-            state=state,
-        )
+        return buffett_prompt(ticker, {ticker: analysis_data[ticker]})
 
+    prompts = run_per_ticker(tickers, analyze_ticker)
+    buffett_analysis = {}
+    for ticker, buffett_output in call_llm_per_ticker(prompts, WarrenBuffettSignal, "warren_buffett_agent", state, default_factory=create_default_warren_buffett_signal).items():
+        progress.update_status("warren_buffett_agent", ticker, "Done", analysis=buffett_output.reasoning)
         # Store analysis in consistent format with other agents
         buffett_analysis[ticker] = {
             "signal": buffett_output.signal,
@@ -128,8 +132,6 @@ def warren_buffett_agent(state: AgentState):
             "reasoning": buffett_output.reasoning,
         }
 
-        progress.update_status("warren_buffett_agent", ticker, "Done", analysis=buffett_output.reasoning)
-
     # Create the message
     message = HumanMessage(content=json.dumps(buffett_analysis), name="warren_buffett_agent")
 
@@ -702,11 +704,10 @@ def analyze_pricing_power(financial_line_items: list, metrics: list) -> dict[str
     return {"score": score, "details": "; ".join(reasoning) if reasoning else "Limited pricing power analysis available"}
 
 
-def generate_buffett_output(
+def buffett_prompt(
     ticker: str,
     analysis_data: dict[str, any],
-    state: AgentState,
-) -> WarrenBuffettSignal:
+) -> ChatPromptValue:
     """Get investment decision from LLM with Buffett's principles"""
     template = ChatPromptTemplate.from_messages(
         [
@@ -798,20 +799,13 @@ def generate_buffett_output(
         ]
     )
 
-    prompt = template.invoke({"analysis_data": json.dumps(analysis_data, indent=2), "ticker": ticker})
+    return template.invoke({"analysis_data": json.dumps(analysis_data, indent=2), "ticker": ticker})
 
-    # Default fallback signal in case parsing fails
-    def create_default_warren_buffett_signal():
-        return WarrenBuffettSignal(
-            signal="neutral",
-            confidence=0.0,
-            reasoning="Error in analysis, defaulting to neutral",
-        )
 
-    return call_llm(
-        prompt=prompt,
-        pydantic_model=WarrenBuffettSignal,
-        agent_name="warren_buffett_agent",
-        state=state,
-        default_factory=create_default_warren_buffett_signal,
+# Default fallback signal in case parsing fails
+def create_default_warren_buffett_signal() -> WarrenBuffettSignal:
+    return WarrenBuffettSignal(
+        signal="neutral",
+        confidence=0.0,
+        reasoning="Error in analysis, defaulting to neutral",
     )
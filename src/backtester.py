@@ -1,7 +1,9 @@
 import itertools
+import os
 import sys
 from collections.abc import Callable
 from datetime import datetime, timedelta
+from pathlib import Path
 
 import matplotlib.pyplot as plt
 import numpy as np
@@ -10,21 +12,32 @@ import questionary
 from colorama import Fore, Style, init
 from dateutil.relativedelta import relativedelta
 
+from src.backtesting.allocator import RULE_BASED_ANALYSTS, orders_for_targets, signal_scores, target_weights
+from src.backtesting.checkpoint import DEFAULT_CHECKPOINT_DIR, BacktestCheckpoint, checkpoint_fingerprint
+from src.backtesting.metrics import OnlineMetrics
+from src.backtesting.panel import PricePanel
+from src.backtesting.portfolio import ACTIONS, ArrayPortfolio
+from src.backtesting.results import RESULT_FORMATS, DaySummary, FileSink, ResultSink, TerminalSink, TickerRow
+from src.backtesting.signals import DEFAULT_SIGNALS_DIR, SignalStore, precompute_signals, signals_fingerprint
+from src.data.stats import get_stats
+from src.llm.cache import set_response_cache
+from src.llm.decisions import set_decision_store
 from src.llm.models import LLM_ORDER, OLLAMA_LLM_ORDER, ModelProvider, get_model_info
-from src.main import run_hedge_fund
-from src.tools.api import (
-    get_company_news,
-    get_financial_metrics,
-    get_insider_trades,
-    get_price_data,
-    get_prices,
-)
+from src.main import run_analysts, run_hedge_fund
+from src.tools.archive import DATA_MODES, DEFAULT_ARCHIVE_DIR
+from src.tools.async_api import prefetch_universe
+from src.tools.client import set_data_mode
 from src.utils.analysts import ANALYST_ORDER
-from src.utils.display import format_backtest_row, print_backtest_results
+from src.utils.display import print_data_stats
+from src.utils.llm import set_llm_batch_size
 from src.utils.ollama import ensure_ollama_and_model
+from src.utils.progress import progress
 
 init(autoreset=True)
 
+# Days of history the analysts look at for each trading day
+ANALYST_LOOKBACK_DAYS = 30
+
 
 class Backtester:
     def __init__(
@@ -38,6 +51,14 @@ class Backtester:
         model_provider: str = "OpenAI",
         selected_analysts: list[str] | None = None,
         initial_margin_requirement: float = 0.0,
+        two_phase: bool = False,
+        workers: int = 8,
+        signals_dir: str | None = DEFAULT_SIGNALS_DIR,
+        rolling_window: int | None = None,
+        checkpoint_dir: str | None = None,
+        checkpoint_every: int = 5,
+        fast: bool = False,
+        result_sinks: list[ResultSink] | None = None,
     ):
         """
         :param agent: The trading agent (Callable).
@@ -49,6 +70,18 @@ class Backtester:
         :param model_provider: Which LLM provider (OpenAI, etc).
         :param selected_analysts: List of analyst names or IDs to incorporate.
         :param initial_margin_requirement: The margin ratio (e.g. 0.5 = 50%).
+        :param two_phase: Precompute all analyst signals in parallel first, then simulate the portfolio day by day.
+        :param workers: Threads used to precompute analyst signals in two-phase mode.
+        :param signals_dir: Where two-phase mode persists analyst signals for reuse. None keeps them in memory.
+        :param rolling_window: Trading days covered by the rolling Sharpe, Sortino and drawdown metrics. None disables them.
+        :param checkpoint_dir: Where to save the backtest state while it runs. A run with the same settings resumes
+            after the last saved day. None disables checkpoints.
+        :param checkpoint_every: Trading days between checkpoints.
+        :param fast: Deterministic mode without LLM calls: only rule-based analysts (all of them by default), whose
+            precomputed signals a vectorized allocator turns into orders in place of the agent. The signals are computed
+            per date and ticker by the analysts themselves, as in two-phase mode. Checkpoints are not used.
+        :param result_sinks: Consumers of the per-ticker and per-day results, closed when the backtest ends.
+            None renders them in the terminal, except in fast mode.
         """
         self.agent = agent
         self.tickers = tickers
@@ -59,31 +92,35 @@ class Backtester:
         self.model_provider = model_provider
         if selected_analysts is None:
             selected_analysts = []
+        if fast:
+            selected_analysts = selected_analysts or list(RULE_BASED_ANALYSTS)
+            llm_analysts = [analyst for analyst in selected_analysts if analyst not in RULE_BASED_ANALYSTS]
+            if llm_analysts:
+                raise ValueError(f"Fast mode only supports the rule-based analysts ({', '.join(RULE_BASED_ANALYSTS)}), not {', '.join(llm_analysts)}")
+        self.fast = fast
+        self.selected_analysts = selected_analysts
+        self.price_panel: PricePanel | None = None
+        self.two_phase = two_phase
+        self.workers = workers
+        self.signals_dir = signals_dir
+        self.signal_store: SignalStore | None = None
+        self.rolling_window = rolling_window
+        self.online_metrics = OnlineMetrics(window=rolling_window)
+        self.checkpoint_dir = checkpoint_dir
+        self.checkpoint_every = checkpoint_every
+        self.trade_log: list[dict[str, any]] = []
+        if result_sinks is None:
+            result_sinks = [] if fast else [TerminalSink()]
+        self.result_sinks = result_sinks
 
         # Initialize portfolio with support for long/short positions
         self.portfolio_values = []
-        self.portfolio = {
-            "cash": initial_capital,
-            "margin_used": 0.0,  # total margin usage across all short positions
-            "margin_requirement": initial_margin_requirement,  # The margin ratio required for shorts
-            "positions": {
-                ticker: {
-                    "long": 0,
-                    "short": 0,
-                    "long_cost_basis": 0.0,
-                    "short_cost_basis": 0.0,
-                    "short_margin_used": 0.0,
-                }
-                for ticker in tickers
-            },  # Number of shares held long  # Number of shares held short  # Average cost basis per share (long)  # Average cost basis per share (short)  # Dollars of margin used for this ticker's short
-            "realized_gains": {
-                ticker: {
-                    "long": 0.0,  # Realized gains from long positions
-                    "short": 0.0,  # Realized gains from short positions
-                }
-                for ticker in tickers
-            },
-        }
+        self.array_portfolio = ArrayPortfolio(tickers, initial_capital, initial_margin_requirement)
+
+    @property
+    def portfolio(self) -> dict:
+        """The portfolio in the nested dict layout passed to the agents."""
+        return self.array_portfolio.to_dict()
 
     def execute_trade(self, ticker: str, action: str, quantity: float, current_price: float):
         """
@@ -91,163 +128,7 @@ class Backtester:
         `quantity` is the number of shares the agent wants to buy/sell/short/cover.
         We will only trade integer shares to keep it simple.
         """
-        if quantity <= 0:
-            return 0
-
-        quantity = int(quantity)  # force integer shares
-        position = self.portfolio["positions"][ticker]
-
-        if action == "buy":
-            cost = quantity * current_price
-            if cost <= self.portfolio["cash"]:
-                # Weighted average cost basis for the new total
-                old_shares = position["long"]
-                old_cost_basis = position["long_cost_basis"]
-                new_shares = quantity
-                total_shares = old_shares + new_shares
-
-                if total_shares > 0:
-                    total_old_cost = old_cost_basis * old_shares
-                    total_new_cost = cost
-                    position["long_cost_basis"] = (total_old_cost + total_new_cost) / total_shares
-
-                position["long"] += quantity
-                self.portfolio["cash"] -= cost
-                return quantity
-            else:
-                # Calculate maximum affordable quantity
-                max_quantity = int(self.portfolio["cash"] / current_price)
-                if max_quantity > 0:
-                    cost = max_quantity * current_price
-                    old_shares = position["long"]
-                    old_cost_basis = position["long_cost_basis"]
-                    total_shares = old_shares + max_quantity
-
-                    if total_shares > 0:
-                        total_old_cost = old_cost_basis * old_shares
-                        total_new_cost = cost
-                        position["long_cost_basis"] = (total_old_cost + total_new_cost) / total_shares
-
-                    position["long"] += max_quantity
-                    self.portfolio["cash"] -= cost
-                    return max_quantity
-                return 0
-
-        elif action == "sell":
-            # You can only sell as many as you own
-            quantity = min(quantity, position["long"])
-            if quantity > 0:
-                # Realized gain/loss using average cost basis
-                avg_cost_per_share = position["long_cost_basis"] if position["long"] > 0 else 0
-                realized_gain = (current_price - avg_cost_per_share) * quantity
-                self.portfolio["realized_gains"][ticker]["long"] += realized_gain
-
-                position["long"] -= quantity
-                self.portfolio["cash"] += quantity * current_price
-
-                if position["long"] == 0:
-                    position["long_cost_basis"] = 0.0
-
-                return quantity
-
-        elif action == "short":
-            """
-            Typical short sale flow:
-              1) Receive proceeds = current_price * quantity
-              2) Post margin_required = proceeds * margin_ratio
-              3) Net effect on cash = +proceeds - margin_required
-            """
-            proceeds = current_price * quantity
-            margin_required = proceeds * self.portfolio["margin_requirement"]
-            if margin_required <= self.portfolio["cash"]:
-                # Weighted average short cost basis
-                old_short_shares = position["short"]
-                old_cost_basis = position["short_cost_basis"]
-                new_shares = quantity
-                total_shares = old_short_shares + new_shares
-
-                if total_shares > 0:
-                    total_old_cost = old_cost_basis * old_short_shares
-                    total_new_cost = current_price * new_shares
-                    position["short_cost_basis"] = (total_old_cost + total_new_cost) / total_shares
-
-                position["short"] += quantity
-
-                # Update margin usage
-                position["short_margin_used"] += margin_required
-                self.portfolio["margin_used"] += margin_required
-
-                # Increase cash by proceeds, then subtract the required margin
-                self.portfolio["cash"] += proceeds
-                self.portfolio["cash"] -= margin_required
-                return quantity
-            else:
-                # Calculate maximum shortable quantity
-                margin_ratio = self.portfolio["margin_requirement"]
-                if margin_ratio > 0:
-                    max_quantity = int(self.portfolio["cash"] / (current_price * margin_ratio))
-                else:
-                    max_quantity = 0
-
-                if max_quantity > 0:
-                    proceeds = current_price * max_quantity
-                    margin_required = proceeds * margin_ratio
-
-                    old_short_shares = position["short"]
-                    old_cost_basis = position["short_cost_basis"]
-                    total_shares = old_short_shares + max_quantity
-
-                    if total_shares > 0:
-                        total_old_cost = old_cost_basis * old_short_shares
-                        total_new_cost = current_price * max_quantity
-                        position["short_cost_basis"] = (total_old_cost + total_new_cost) / total_shares
-
-                    position["short"] += max_quantity
-                    position["short_margin_used"] += margin_required
-                    self.portfolio["margin_used"] += margin_required
-
-                    self.portfolio["cash"] += proceeds
-                    self.portfolio["cash"] -= margin_required
-                    return max_quantity
-                return 0
-
-        elif action == "cover":
-            """
-            When covering shares:
-              1) Pay cover cost = current_price * quantity
-              2) Release a proportional share of the margin
-              3) Net effect on cash = -cover_cost + released_margin
-            """
-            quantity = min(quantity, position["short"])
-            if quantity > 0:
-                cover_cost = quantity * current_price
-                avg_short_price = position["short_cost_basis"] if position["short"] > 0 else 0
-                realized_gain = (avg_short_price - current_price) * quantity
-
-                if position["short"] > 0:
-                    portion = quantity / position["short"]
-                else:
-                    portion = 1.0
-
-                margin_to_release = portion * position["short_margin_used"]
-
-                position["short"] -= quantity
-                position["short_margin_used"] -= margin_to_release
-                self.portfolio["margin_used"] -= margin_to_release
-
-                # Pay the cost to cover, but get back the released margin
-                self.portfolio["cash"] += margin_to_release
-                self.portfolio["cash"] -= cover_cost
-
-                self.portfolio["realized_gains"][ticker]["short"] += realized_gain
-
-                if position["short"] == 0:
-                    position["short_cost_basis"] = 0.0
-                    position["short_margin_used"] = 0.0
-
-                return quantity
-
-        return 0
+        return self.array_portfolio.execute_trade(ticker, action, quantity, current_price)
 
     def calculate_portfolio_value(self, current_prices):
         """
@@ -256,21 +137,7 @@ class Backtester:
           - market value of long positions
           - unrealized gains/losses for short positions
         """
-        total_value = self.portfolio["cash"]
-
-        for ticker in self.tickers:
-            position = self.portfolio["positions"][ticker]
-            price = current_prices[ticker]
-
-            # Long position value
-            long_value = position["long"] * price
-            total_value += long_value
-
-            # Short position unrealized PnL = short_shares * (short_cost_basis - current_price)
-            if position["short"] > 0:
-                total_value -= position["short"] * price
-
-        return total_value
+        return self.array_portfolio.total_value(self.array_portfolio.prices_array(current_prices))
 
     def prefetch_data(self):
         """Pre-fetch all data needed for the backtest period."""
@@ -281,83 +148,165 @@ class Backtester:
         start_date_dt = end_date_dt - relativedelta(years=1)
         start_date_str = start_date_dt.strftime("%Y-%m-%d")
 
-        for ticker in self.tickers:
-            # Fetch price data for the entire period, plus 1 year
-            get_prices(ticker, start_date_str, self.end_date)
+        # Fetch prices (for the entire period, plus 1 year), financial metrics, insider trades
+        # and company news for all tickers concurrently
+        failures = prefetch_universe(
+            self.tickers,
+            start_date=self.start_date,
+            end_date=self.end_date,
+            price_start_date=start_date_str,
+        )
+        for (ticker, dataset), error in failures.items():
+            print(f"Warning: could not pre-fetch {dataset} for {ticker}: {error}")
+
+        # Load the prices the trading loop reads (each day falls back to the day before) into one panel
+        panel_start = (datetime.strptime(self.start_date, "%Y-%m-%d") - timedelta(days=1)).strftime("%Y-%m-%d")
+        self.price_panel = PricePanel.load(
+            self.tickers,
+            panel_start,
+            self.end_date,
+            on_error=lambda ticker, e: print(f"Error fetching prices for {ticker} between {panel_start} and {self.end_date}: {e}"),
+        )
 
-            # Fetch financial metrics
-            get_financial_metrics(ticker, self.end_date, limit=10)
+        print("Data pre-fetch complete.")
 
-            # Fetch insider trades
-            get_insider_trades(ticker, self.end_date, start_date=self.start_date, limit=1000)
+    def precompute_signals(self, dates: pd.DatetimeIndex):
+        """
+        First phase of a two-phase backtest: analyst signals depend only on the ticker and the date window,
+        so compute them for every tradable (date, ticker) in parallel and persist them.
+        """
+        trading_days = [date.strftime("%Y-%m-%d") for date in dates]
+        trading_days = [date for date in trading_days if len(self.price_panel.latest("close", date, lookback_days=1)) == len(self.tickers)]
 
-            # Fetch company news
-            get_company_news(ticker, self.end_date, start_date=self.start_date, limit=1000)
+        fingerprint = signals_fingerprint(self.selected_analysts, self.model_name, self.model_provider, ANALYST_LOOKBACK_DAYS)
+        self.signal_store = SignalStore(Path(self.signals_dir) / f"{fingerprint}.jsonl" if self.signals_dir else None)
 
-        print("Data pre-fetch complete.")
+        def compute(date: str, ticker: str) -> dict[str, dict]:
+            lookback_start = (datetime.strptime(date, "%Y-%m-%d") - timedelta(days=ANALYST_LOOKBACK_DAYS)).strftime("%Y-%m-%d")
+            signals = run_analysts(
+                tickers=[ticker],
+                start_date=lookback_start,
+                end_date=date,
+                selected_analysts=self.selected_analysts,
+                model_name=self.model_name,
+                model_provider=self.model_provider,
+            )
+            return {agent: by_ticker[ticker] for agent, by_ticker in signals.items() if ticker in by_ticker}
+
+        print(f"\nComputing analyst signals for {len(trading_days)} days x {len(self.tickers)} tickers with {self.workers} workers...")
+        progress.start()
+        try:
+            failures = precompute_signals(self.signal_store, trading_days, self.tickers, compute, workers=self.workers)
+        finally:
+            progress.stop()
+        for (date, ticker), error in sorted(failures.items()):
+            print(f"Warning: could not compute analyst signals for {ticker} on {date}: {error}")
+
+    def _checkpoint(self) -> BacktestCheckpoint | None:
+        if not self.checkpoint_dir:
+            return None
+        settings = {
+            "agent": f"{getattr(self.agent, '__module__', '')}.{getattr(self.agent, '__qualname__', repr(self.agent))}",
+            "tickers": self.tickers,
+            "start_date": self.start_date,
+            "end_date": self.end_date,
+            "initial_capital": self.initial_capital,
+            "model_name": self.model_name,
+            "model_provider": self.model_provider,
+            "selected_analysts": self.selected_analysts,
+            "margin_requirement": self.array_portfolio.margin_requirement,
+            "rolling_window": self.rolling_window,
+            "two_phase": self.two_phase,
+            "fast": self.fast,
+        }
+        return BacktestCheckpoint(Path(self.checkpoint_dir) / f"{checkpoint_fingerprint(settings)}.pkl")
 
     def run_backtest(self):
+        try:
+            if self.fast:
+                return self.run_fast_backtest()
+            return self.run_agent_backtest()
+        finally:
+            for sink in self.result_sinks:
+                sink.close()
+
+    def run_agent_backtest(self):
+        """Backtest driven by the trading agent, day by day. Use run_backtest, which also closes the result sinks."""
         # Pre-fetch all data at the start
         self.prefetch_data()
 
         dates = pd.date_range(self.start_date, self.end_date, freq="B")
-        table_rows = []
-        performance_metrics = {
-            "sharpe_ratio": None,
-            "sortino_ratio": None,
-            "max_drawdown": None,
-            "long_short_ratio": None,
-            "gross_exposure": None,
-            "net_exposure": None,
-        }
+        if self.two_phase:
+            self.precompute_signals(dates)
+        performance_metrics = self._new_performance_metrics()
 
         print("\nStarting backtest...")
 
         # Initialize portfolio values list with initial capital
+        self.online_metrics = OnlineMetrics(window=self.rolling_window)
         if len(dates) > 0:
             self.portfolio_values = [{"Date": dates[0], "Portfolio Value": self.initial_capital}]
+            self.online_metrics.update(dates[0], self.initial_capital)
         else:
             self.portfolio_values = []
 
+        # Pick up after the last checkpointed day of an interrupted run with the same settings
+        checkpoint = self._checkpoint()
+        state = checkpoint.load() if checkpoint is not None else None
+        resume_after = None
+        if state is not None:
+            resume_after = state["last_date"]
+            self.array_portfolio = state["portfolio"]
+            self.portfolio_values = state["portfolio_values"]
+            self.online_metrics = state["online_metrics"]
+            self.trade_log = state["trade_log"]
+            performance_metrics = state["performance_metrics"]
+            print(f"Resuming from checkpoint after {resume_after}")
+            for rows, summary in checkpoint.saved_days(state):
+                for sink in self.result_sinks:
+                    sink.write_day(rows, summary)
+        if checkpoint is not None:
+            checkpoint.start_days(state)
+        days_since_checkpoint = 0
+
+        def save_checkpoint(last_date: str):
+            checkpoint.save(
+                {
+                    "last_date": last_date,
+                    "portfolio": self.array_portfolio,
+                    "portfolio_values": self.portfolio_values,
+                    "online_metrics": self.online_metrics,
+                    "trade_log": self.trade_log,
+                    "performance_metrics": performance_metrics,
+                }
+            )
+
         for current_date in dates:
-            lookback_start = (current_date - timedelta(days=30)).strftime("%Y-%m-%d")
+            lookback_start = (current_date - timedelta(days=ANALYST_LOOKBACK_DAYS)).strftime("%Y-%m-%d")
             current_date_str = current_date.strftime("%Y-%m-%d")
-            previous_date_str = (current_date - timedelta(days=1)).strftime("%Y-%m-%d")
+
+            if resume_after is not None and current_date_str <= resume_after:
+                continue
 
             # Skip if there's no prior day to look back (i.e., first date in the range)
             if lookback_start == current_date_str:
                 continue
 
-            # Get current prices for all tickers
-            try:
-                current_prices = {}
-                missing_data = False
-
-                for ticker in self.tickers:
-                    try:
-                        price_data = get_price_data(ticker, previous_date_str, current_date_str)
-                        if price_data.empty:
-                            print(f"Warning: No price data for {ticker} on {current_date_str}")
-                            missing_data = True
-                            break
-                        current_prices[ticker] = price_data.iloc[-1]["close"]
-                    except Exception as e:
-                        print(f"Error fetching price for {ticker} between {previous_date_str} and {current_date_str}: {e}")
-                        missing_data = True
-                        break
-
-                if missing_data:
-                    print(f"Skipping trading day {current_date_str} due to missing price data")
-                    continue
-
-            except Exception as e:
-                # If there's a general API error, log it and skip this day
-                print(f"Error fetching prices for {current_date_str}: {e}")
+            # Get current prices for all tickers: the latest close from the previous day through today
+            current_prices = self.price_panel.latest("close", current_date_str, lookback_days=1)
+            missing_tickers = [ticker for ticker in self.tickers if ticker not in current_prices]
+            if missing_tickers:
+                print(f"Warning: No price data for {missing_tickers[0]} on {current_date_str}")
+                print(f"Skipping trading day {current_date_str} due to missing price data")
                 continue
 
             # ---------------------------------------------------------------
             # 1) Execute the agent's trades
             # ---------------------------------------------------------------
+            # In two-phase mode only risk and portfolio management run here, on the precomputed signals
+            agent_kwargs = {}
+            if self.signal_store is not None:
+                agent_kwargs["analyst_signals"] = self.signal_store.signals_for(current_date_str, self.tickers)
             output = self.agent(
                 tickers=self.tickers,
                 start_date=lookback_start,
@@ -366,57 +315,34 @@ class Backtester:
                 model_name=self.model_name,
                 model_provider=self.model_provider,
                 selected_analysts=self.selected_analysts,
+                **agent_kwargs,
             )
             decisions = output["decisions"]
             analyst_signals = output["analyst_signals"]
 
             # Execute trades for each ticker
-            executed_trades = {}
-            for ticker in self.tickers:
-                decision = decisions.get(ticker, {"action": "hold", "quantity": 0})
-                action, quantity = (
-                    decision.get("action", "hold"),
-                    decision.get("quantity", 0),
-                )
-
-                executed_quantity = self.execute_trade(ticker, action, quantity, current_prices[ticker])
-                executed_trades[ticker] = executed_quantity
+            portfolio = self.array_portfolio
+            prices = portfolio.prices_array(current_prices)
+            executed_trades = dict(zip(self.tickers, portfolio.execute_trades(decisions, prices).tolist()))
+            self.trade_log.extend({"date": current_date_str, "ticker": ticker, "action": decisions[ticker].get("action"), "quantity": quantity, "price": current_prices[ticker]} for ticker, quantity in executed_trades.items() if quantity)
 
             # ---------------------------------------------------------------
             # 2) Now that trades have executed trades, recalculate the final
             #    portfolio value for this day.
             # ---------------------------------------------------------------
-            total_value = self.calculate_portfolio_value(current_prices)
+            total_value = portfolio.total_value(prices)
 
             # Also compute long/short exposures for final post-trade state
-            long_exposure = sum(self.portfolio["positions"][t]["long"] * current_prices[t] for t in self.tickers)
-            short_exposure = sum(self.portfolio["positions"][t]["short"] * current_prices[t] for t in self.tickers)
-
-            # Calculate gross and net exposures
-            gross_exposure = long_exposure + short_exposure
-            net_exposure = long_exposure - short_exposure
-            long_short_ratio = long_exposure / short_exposure if short_exposure > 1e-9 else float("inf")
-
-            # Track each day's portfolio value in self.portfolio_values
-            self.portfolio_values.append(
-                {
-                    "Date": current_date,
-                    "Portfolio Value": total_value,
-                    "Long Exposure": long_exposure,
-                    "Short Exposure": short_exposure,
-                    "Gross Exposure": gross_exposure,
-                    "Net Exposure": net_exposure,
-                    "Long/Short Ratio": long_short_ratio,
-                }
-            )
+            long_exposure, short_exposure = portfolio.exposures(prices)
+            self._record_day(current_date, total_value, long_exposure, short_exposure)
 
             # ---------------------------------------------------------------
-            # 3) Build the table rows to display
+            # 3) Record each ticker's signals and trades
             # ---------------------------------------------------------------
-            date_rows = []
+            rows = []
+            long_shares, short_shares = portfolio.long.tolist(), portfolio.short.tolist()
 
-            # For each ticker, record signals/trades
-            for ticker in self.tickers:
+            for i, ticker in enumerate(self.tickers):
                 ticker_signals = {}
                 for agent_name, signals in analyst_signals.items():
                     if ticker in signals:
@@ -426,122 +352,185 @@ class Backtester:
                 bearish_count = len([s for s in ticker_signals.values() if s.get("signal", "").lower() == "bearish"])
                 neutral_count = len([s for s in ticker_signals.values() if s.get("signal", "").lower() == "neutral"])
 
-                # Calculate net position value
-                pos = self.portfolio["positions"][ticker]
-                long_val = pos["long"] * current_prices[ticker]
-                short_val = pos["short"] * current_prices[ticker]
-                net_position_value = long_val - short_val
-
-                # Get the action and quantity from the decisions
-                action = decisions.get(ticker, {}).get("action", "hold")
-                quantity = executed_trades.get(ticker, 0)
-
-                # Append the agent action to the table rows
-                date_rows.append(
-                    format_backtest_row(
+                rows.append(
+                    TickerRow(
                         date=current_date_str,
                         ticker=ticker,
-                        action=action,
-                        quantity=quantity,
+                        action=decisions.get(ticker, {}).get("action", "hold"),
+                        quantity=executed_trades.get(ticker, 0),
                         price=current_prices[ticker],
-                        shares_owned=pos["long"] - pos["short"],  # net shares
-                        position_value=net_position_value,
+                        shares_owned=long_shares[i] - short_shares[i],  # net shares
+                        position_value=(long_shares[i] - short_shares[i]) * current_prices[ticker],
                         bullish_count=bullish_count,
                         bearish_count=bearish_count,
                         neutral_count=neutral_count,
                     )
                 )
+
             # ---------------------------------------------------------------
-            # 4) Calculate performance summary metrics
+            # 4) Publish the day's results with the performance summary
             # ---------------------------------------------------------------
-            # Calculate portfolio return vs. initial capital
-            # The realized gains are already reflected in cash balance, so we don't add them separately
-            portfolio_return = (total_value / self.initial_capital - 1) * 100
-
-            # Add summary row for this day
-            date_rows.append(
-                format_backtest_row(
-                    date=current_date_str,
-                    ticker="",
-                    action="",
-                    quantity=0,
-                    price=0,
-                    shares_owned=0,
-                    position_value=0,
-                    bullish_count=0,
-                    bearish_count=0,
-                    neutral_count=0,
-                    is_summary=True,
-                    total_value=total_value,
-                    return_pct=portfolio_return,
-                    cash_balance=self.portfolio["cash"],
-                    total_position_value=total_value - self.portfolio["cash"],
-                    sharpe_ratio=performance_metrics["sharpe_ratio"],
-                    sortino_ratio=performance_metrics["sortino_ratio"],
-                    max_drawdown=performance_metrics["max_drawdown"],
-                ),
-            )
-
-            table_rows.extend(date_rows)
-            print_backtest_results(table_rows)
+            summary = self._day_summary(current_date_str, total_value, long_exposure, short_exposure, performance_metrics)
+            for sink in self.result_sinks:
+                sink.write_day(rows, summary)
+            if checkpoint is not None:
+                checkpoint.append_day(rows, summary)
 
             # Update performance metrics if we have enough data
             if len(self.portfolio_values) > 3:
                 self._update_performance_metrics(performance_metrics)
 
+            days_since_checkpoint += 1
+            if checkpoint is not None and days_since_checkpoint >= self.checkpoint_every:
+                save_checkpoint(current_date_str)
+                days_since_checkpoint = 0
+
+        # A finished run is checkpointed too, so rerunning it only replays the results to the sinks
+        if checkpoint is not None and days_since_checkpoint:
+            save_checkpoint(self.portfolio_values[-1]["Date"].strftime("%Y-%m-%d"))
+
         # Store the final performance metrics for reference in analyze_performance
         self.performance_metrics = performance_metrics
         return performance_metrics
 
-    def _update_performance_metrics(self, performance_metrics):
-        """Helper method to update performance metrics using daily returns."""
-        values_df = pd.DataFrame(self.portfolio_values).set_index("Date")
-        values_df["Daily Return"] = values_df["Portfolio Value"].pct_change()
-        clean_returns = values_df["Daily Return"].dropna()
+    def run_fast_backtest(self):
+        """
+        Deterministic backtest without LLM calls: precompute the rule-based analysts' signals, turn them
+        into target weights for every day in one vectorized pass, then trade towards the targets day by day.
 
-        if len(clean_returns) < 2:
-            return  # not enough data points
+        Only the allocation is vectorized. The signals still come from the analyst graph, run once per
+        (date, ticker) like a two-phase backtest and reading its data through the cache that prefetch_data
+        warmed, so the first run over a window costs about as much as that phase. Later runs read them from
+        signals_dir.
+        """
+        self.prefetch_data()
 
-        # Assumes 252 trading days/year
-        daily_risk_free_rate = 0.0434 / 252
-        excess_returns = clean_returns - daily_risk_free_rate
-        mean_excess_return = excess_returns.mean()
-        std_excess_return = excess_returns.std()
+        dates = pd.date_range(self.start_date, self.end_date, freq="B")
+        self.precompute_signals(dates)
+        days = [date.strftime("%Y-%m-%d") for date in dates]
+        closes = self.price_panel.asof("close", days, lookback_days=1)
+        weights = target_weights(signal_scores(self.signal_store, days, self.tickers))
+        performance_metrics = self._new_performance_metrics()
 
-        # Sharpe ratio
-        if std_excess_return > 1e-12:
-            performance_metrics["sharpe_ratio"] = np.sqrt(252) * (mean_excess_return / std_excess_return)
-        else:
-            performance_metrics["sharpe_ratio"] = 0.0
-
-        # Sortino ratio
-        negative_returns = excess_returns[excess_returns < 0]
-        if len(negative_returns) > 0:
-            downside_std = negative_returns.std()
-            if downside_std > 1e-12:
-                performance_metrics["sortino_ratio"] = np.sqrt(252) * (mean_excess_return / downside_std)
-            else:
-                performance_metrics["sortino_ratio"] = float("inf") if mean_excess_return > 0 else 0
-        else:
-            performance_metrics["sortino_ratio"] = float("inf") if mean_excess_return > 0 else 0
-
-        # Maximum drawdown (ensure it's stored as a negative percentage)
-        rolling_max = values_df["Portfolio Value"].cummax()
-        drawdown = (values_df["Portfolio Value"] - rolling_max) / rolling_max
-
-        if len(drawdown) > 0:
-            min_drawdown = drawdown.min()
-            # Store as a negative percentage
-            performance_metrics["max_drawdown"] = min_drawdown * 100
-
-            # Store the date of max drawdown for reference
-            if min_drawdown < 0:
-                performance_metrics["max_drawdown_date"] = drawdown.idxmin().strftime("%Y-%m-%d")
-            else:
-                performance_metrics["max_drawdown_date"] = None
-        else:
-            performance_metrics["max_drawdown"] = 0.0
-            performance_metrics["max_drawdown_date"] = None
+        print("\nStarting backtest...")
+
+        self.online_metrics = OnlineMetrics(window=self.rolling_window)
+        self.portfolio_values = []
+        if len(dates) > 0:
+            self.portfolio_values = [{"Date": dates[0], "Portfolio Value": self.initial_capital}]
+            self.online_metrics.update(dates[0], self.initial_capital)
+
+        portfolio = self.array_portfolio
+        for row, current_date in enumerate(dates):
+            prices = closes[row]
+            if np.isnan(prices).any():
+                continue
+
+            actions, quantities = orders_for_targets(portfolio, weights[row], prices)
+            executed = portfolio.execute_orders(actions, quantities, prices)
+            for i in np.flatnonzero(executed):
+                self.trade_log.append({"date": days[row], "ticker": self.tickers[i], "action": ACTIONS[actions[i]], "quantity": int(executed[i]), "price": float(prices[i])})
+
+            total_value = portfolio.total_value(prices)
+            long_exposure, short_exposure = portfolio.exposures(prices)
+            self._record_day(current_date, total_value, long_exposure, short_exposure)
+            if self.result_sinks:
+                rows = self._fast_ticker_rows(days[row], actions, executed, prices)
+                summary = self._day_summary(days[row], total_value, long_exposure, short_exposure, performance_metrics)
+                for sink in self.result_sinks:
+                    sink.write_day(rows, summary)
+            if len(self.portfolio_values) > 3:
+                self._update_performance_metrics(performance_metrics)
+
+        print(f"Simulated {len(self.portfolio_values) - 1} trading days, {len(self.trade_log)} trades")
+        self.performance_metrics = performance_metrics
+        return performance_metrics
+
+    def _fast_ticker_rows(self, date: str, actions: np.ndarray, executed: np.ndarray, prices: np.ndarray) -> list[TickerRow]:
+        """Result rows of a fast-mode day, with signal counts from the precomputed signals."""
+        portfolio = self.array_portfolio
+        net_shares = (portfolio.long - portfolio.short).tolist()
+        rows = []
+        for i, ticker in enumerate(self.tickers):
+            votes = [str(signal.get("signal", "")).lower() for signal in (self.signal_store.get(date, ticker) or {}).values()]
+            rows.append(
+                TickerRow(
+                    date=date,
+                    ticker=ticker,
+                    action=ACTIONS[actions[i]],
+                    quantity=int(executed[i]),
+                    price=float(prices[i]),
+                    shares_owned=net_shares[i],
+                    position_value=net_shares[i] * float(prices[i]),
+                    bullish_count=votes.count("bullish"),
+                    bearish_count=votes.count("bearish"),
+                    neutral_count=votes.count("neutral"),
+                )
+            )
+        return rows
+
+    def _day_summary(self, date: str, total_value: float, long_exposure: float, short_exposure: float, performance_metrics: dict[str, any]) -> DaySummary:
+        # The realized gains are already reflected in cash balance, so we don't add them separately
+        cash = float(self.array_portfolio.cash)
+        return DaySummary(
+            date=date,
+            total_value=total_value,
+            return_pct=(total_value / self.initial_capital - 1) * 100,
+            cash_balance=cash,
+            total_position_value=total_value - cash,
+            long_exposure=long_exposure,
+            short_exposure=short_exposure,
+            sharpe_ratio=performance_metrics["sharpe_ratio"],
+            sortino_ratio=performance_metrics["sortino_ratio"],
+            max_drawdown=performance_metrics["max_drawdown"],
+        )
+
+    @staticmethod
+    def _new_performance_metrics() -> dict[str, any]:
+        return {
+            "sharpe_ratio": None,
+            "sortino_ratio": None,
+            "max_drawdown": None,
+            "long_short_ratio": None,
+            "gross_exposure": None,
+            "net_exposure": None,
+        }
+
+    def _record_day(self, current_date: pd.Timestamp, total_value: float, long_exposure: float, short_exposure: float):
+        """Track the day's post-trade portfolio value and exposures in self.portfolio_values."""
+        # Calculate gross and net exposures
+        gross_exposure = long_exposure + short_exposure
+        net_exposure = long_exposure - short_exposure
+        long_short_ratio = long_exposure / short_exposure if short_exposure > 1e-9 else float("inf")
+
+        self.portfolio_values.append(
+            {
+                "Date": current_date,
+                "Portfolio Value": total_value,
+                "Long Exposure": long_exposure,
+                "Short Exposure": short_exposure,
+                "Gross Exposure": gross_exposure,
+                "Net Exposure": net_exposure,
+                "Long/Short Ratio": long_short_ratio,
+            }
+        )
+        self.online_metrics.update(current_date, total_value)
+
+    def _update_performance_metrics(self, performance_metrics):
+        """Helper method to publish the running performance metrics of the daily returns."""
+        metrics = self.online_metrics
+        if metrics.num_returns < 2:
+            return  # not enough data points
+
+        performance_metrics["sharpe_ratio"] = metrics.sharpe_ratio
+        performance_metrics["sortino_ratio"] = metrics.sortino_ratio
+        # Stored as a negative percentage, with the date of the max drawdown for reference
+        performance_metrics["max_drawdown"] = metrics.max_drawdown
+        performance_metrics["max_drawdown_date"] = metrics.max_drawdown_date.strftime("%Y-%m-%d") if metrics.max_drawdown_date is not None else None
+        if metrics.window:
+            performance_metrics["rolling_sharpe_ratio"] = metrics.rolling_sharpe_ratio
+            performance_metrics["rolling_sortino_ratio"] = metrics.rolling_sortino_ratio
+            performance_metrics["rolling_drawdown"] = metrics.rolling_drawdown
 
     def analyze_performance(self):
         """Creates a performance DataFrame, prints summary stats, and plots equity curve."""
@@ -561,7 +550,7 @@ class Backtester:
         print(f"Total Return: {Fore.GREEN if total_return >= 0 else Fore.RED}{total_return:.2f}%{Style.RESET_ALL}")
 
         # Print realized P&L for informational purposes only
-        total_realized_gains = sum(self.portfolio["realized_gains"][ticker]["long"] + self.portfolio["realized_gains"][ticker]["short"] for ticker in self.tickers)
+        total_realized_gains = float(self.array_portfolio.realized_long.sum() + self.array_portfolio.realized_short.sum())
         print(f"Total Realized Gains/Losses: {Fore.GREEN if total_realized_gains >= 0 else Fore.RED}${total_realized_gains:,.2f}{Style.RESET_ALL}")
 
         # Plot the portfolio value over time
@@ -687,15 +676,75 @@ if __name__ == "__main__":
         help="Use all available analysts (overrides --analysts)",
     )
     parser.add_argument("--ollama", action="store_true", help="Use Ollama for local LLM inference")
+    parser.add_argument(
+        "--data-mode",
+        choices=DATA_MODES,
+        default="live",
+        help="live: call the financial data API; record: also save every response to the archive; replay: answer only from the archive and fail on a miss",
+    )
+    parser.add_argument("--data-dir", type=str, help=f"Archive directory for --data-mode record/replay (default: {DEFAULT_ARCHIVE_DIR})")
+    parser.add_argument(
+        "--two-phase",
+        action="store_true",
+        help="Compute all analyst signals in parallel before simulating the portfolio day by day",
+    )
+    parser.add_argument("--workers", type=int, default=8, help="Threads used to compute analyst signals with --two-phase (default: 8)")
+    parser.add_argument(
+        "--signals-dir",
+        type=str,
+        default=DEFAULT_SIGNALS_DIR,
+        help=f"Where --two-phase persists analyst signals so repeated runs reuse them (default: {DEFAULT_SIGNALS_DIR})",
+    )
+
+    parser.add_argument(
+        "--decision-store",
+        type=str,
+        default=os.environ.get("AGENT_DECISION_STORE"),
+        help="SQLite file that stores analyst signals per ticker, date window, model and prompt version for windows ended before today; later runs reuse them instead of running the analyst",
+    )
+    parser.add_argument(
+        "--llm-cache",
+        type=str,
+        default=os.environ.get("LLM_RESPONSE_CACHE"),
+        help="SQLite file that caches LLM responses by exact prompt, model and schema, shared by every agent and run",
+    )
+    parser.add_argument("--llm-cache-bypass", action="store_true", help="Do not answer from --llm-cache, only refresh it with new responses")
+    parser.add_argument(
+        "--llm-batch-size",
+        type=int,
+        default=None,
+        help="Tickers per LLM request in the investor persona agents; above 1, their prompts share one request (default: LLM_BATCH_SIZE or 1)",
+    )
+    parser.add_argument(
+        "--checkpoint-dir",
+        type=str,
+        nargs="?",
+        const=DEFAULT_CHECKPOINT_DIR,
+        help=f"Save progress while running and resume an interrupted run with the same settings (default directory: {DEFAULT_CHECKPOINT_DIR})",
+    )
+    parser.add_argument("--checkpoint-every", type=int, default=5, help="Trading days between checkpoints (default: 5)")
+    parser.add_argument(
+        "--fast",
+        action="store_true",
+        help=f"Deterministic mode without LLM calls: rule-based analysts only (default: {', '.join(RULE_BASED_ANALYSTS)}), run per date and ticker as in --two-phase, and a vectorized allocator instead of the portfolio manager",
+    )
+    parser.add_argument("--results-dir", type=str, default=None, help="Also stream the per-ticker and daily results to rows and days files in this directory")
+    parser.add_argument("--results-format", type=str, choices=RESULT_FORMATS, default="parquet", help="File format of --results-dir (default: parquet)")
 
     args = parser.parse_args()
+    set_data_mode(args.data_mode, args.data_dir)
+    set_decision_store(args.decision_store)
+    set_response_cache(args.llm_cache, bypass=args.llm_cache_bypass or os.environ.get("LLM_RESPONSE_CACHE_BYPASS") == "1")
+    set_llm_batch_size(args.llm_batch_size)
 
     # Parse tickers from comma-separated string
     tickers = [ticker.strip() for ticker in args.tickers.split(",")] if args.tickers else []
 
     # Parse analysts from command-line flags
     selected_analysts = None
-    if args.analysts_all:
+    if args.fast and not args.analysts:
+        selected_analysts = list(RULE_BASED_ANALYSTS)
+    elif args.analysts_all:
         selected_analysts = [a[1] for a in ANALYST_ORDER]
     elif args.analysts:
         selected_analysts = [a.strip() for a in args.analysts.split(",") if a.strip()]
@@ -726,7 +775,9 @@ if __name__ == "__main__":
     model_name = ""
     model_provider = None
 
-    if args.ollama:
+    if args.fast:
+        print(f"{Fore.CYAN}Fast mode: rule-based analysts and allocator, no LLM.{Style.RESET_ALL}")
+    elif args.ollama:
         print(f"{Fore.CYAN}Using Ollama for local LLM inference.{Style.RESET_ALL}")
 
         # Select from Ollama-specific models
@@ -795,6 +846,10 @@ if __name__ == "__main__":
             print(f"\nSelected model: {Fore.GREEN + Style.BRIGHT}{model_name}{Style.RESET_ALL}\n")
 
     # Create and run the backtester
+    result_sinks = [] if args.fast else [TerminalSink()]
+    if args.results_dir:
+        result_sinks.append(FileSink(args.results_dir, args.results_format))
+
     backtester = Backtester(
         agent=run_hedge_fund,
         tickers=tickers,
@@ -805,7 +860,15 @@ if __name__ == "__main__":
         model_provider=model_provider,
         selected_analysts=selected_analysts,
         initial_margin_requirement=args.margin_requirement,
+        two_phase=args.two_phase,
+        workers=args.workers,
+        signals_dir=args.signals_dir,
+        checkpoint_dir=args.checkpoint_dir,
+        checkpoint_every=args.checkpoint_every,
+        fast=args.fast,
+        result_sinks=result_sinks,
     )
 
     performance_metrics = backtester.run_backtest()
     performance_df = backtester.analyze_performance()
+    print_data_stats(get_stats().snapshot())
@@ -0,0 +1 @@
+"""Building blocks for running backtests over preloaded market data."""
@@ -0,0 +1,64 @@
+"""Deterministic portfolio allocation from rule-based analyst signals, vectorized over dates and tickers."""
+
+import numpy as np
+
+from src.agents.risk_manager import POSITION_LIMIT
+from src.backtesting.portfolio import BUY, COVER, HOLD, SELL, SHORT, ArrayPortfolio
+from src.backtesting.signals import SignalStore
+
+# Analysts that compute their signals without an LLM
+RULE_BASED_ANALYSTS = ["technical_analyst", "fundamentals_analyst", "sentiment_analyst", "valuation_analyst"]
+
+SIGNAL_DIRECTIONS = {"bullish": 1.0, "bearish": -1.0, "neutral": 0.0}
+
+
+def consensus_score(signals: dict[str, dict]) -> float:
+    """
+    Consensus of one ticker's analyst signals in [-1, 1]: the mean over analysts of direction
+    (+1 bullish, -1 bearish, 0 neutral) times confidence / 100. Zero without signals.
+    """
+    if not signals:
+        return 0.0
+    votes = [SIGNAL_DIRECTIONS.get(str(signal.get("signal", "")).lower(), 0.0) * min(max(float(signal.get("confidence") or 0), 0.0), 100.0) / 100 for signal in signals.values()]
+    return sum(votes) / len(votes)
+
+
+def signal_scores(store: SignalStore, dates: list[str], tickers: list[str]) -> np.ndarray:
+    """Consensus score of the stored analyst signals as a (dates × tickers) array, zero where no analyst produced a signal."""
+    scores = np.zeros((len(dates), len(tickers)))
+    for row, date in enumerate(dates):
+        for column, ticker in enumerate(tickers):
+            scores[row, column] = consensus_score(store.get(date, ticker))
+    return scores
+
+
+def target_weights(scores: np.ndarray, position_limit: float = POSITION_LIMIT, min_score: float = 0.0) -> np.ndarray:
+    """
+    Target position per ticker as a signed fraction of portfolio value: the score scaled to the risk
+    manager's per-ticker limit, scores within `min_score` of zero ignored, and every date scaled down
+    so that gross exposure stays within 100% of the portfolio.
+    """
+    weights = np.where(np.abs(scores) > min_score, np.clip(scores, -1.0, 1.0) * position_limit, 0.0)
+    gross = np.abs(weights).sum(axis=-1, keepdims=True)
+    return weights / np.maximum(gross, 1.0)
+
+
+def orders_for_targets(portfolio: ArrayPortfolio, weights: np.ndarray, prices: np.ndarray) -> tuple[np.ndarray, np.ndarray]:
+    """
+    Action codes and share quantities (by ticker id) that move the portfolio's net positions towards
+    `weights` of its current value. Only one action per ticker fits in a day, so a position that
+    flips side is closed first and reopened on the next day.
+    """
+    target = np.trunc(weights * portfolio.total_value(prices) / prices).astype(np.int64)
+    delta = target - (portfolio.long - portfolio.short)
+    has_short, has_long = portfolio.short > 0, portfolio.long > 0
+
+    actions = np.full(len(delta), HOLD, dtype=np.int8)
+    actions[(delta > 0) & has_short] = COVER
+    actions[(delta > 0) & ~has_short] = BUY
+    actions[(delta < 0) & has_long] = SELL
+    actions[(delta < 0) & ~has_long] = SHORT
+    quantities = np.abs(delta)
+    quantities = np.where(actions == COVER, np.minimum(quantities, portfolio.short), quantities)
+    quantities = np.where(actions == SELL, np.minimum(quantities, portfolio.long), quantities)
+    return actions, quantities
@@ -0,0 +1,89 @@
+"""Periodic snapshots of a running backtest, so an interrupted run resumes instead of starting over."""
+
+import hashlib
+import json
+import os
+import pickle
+import tempfile
+from collections.abc import Iterator
+from pathlib import Path
+
+DEFAULT_CHECKPOINT_DIR = ".cache/checkpoints"
+
+# Bumped whenever the layout of the saved state changes, so old checkpoints are ignored
+CHECKPOINT_VERSION = 4
+
+
+def checkpoint_fingerprint(settings: dict[str, any]) -> str:
+    """Identify a backtest by the settings its results depend on; a resumed run must match all of them."""
+    return hashlib.sha256(json.dumps(settings, sort_keys=True, default=str).encode()).hexdigest()[:16]
+
+
+class BacktestCheckpoint:
+    """
+    The state of one backtest, pickled to a single file that is replaced atomically on every save.
+    Each day's results are appended to a side file as the run goes, and a save records how much of it
+    the state covers, so checkpoints stay small however long the run. Checkpoints hold arbitrary Python
+    objects: only load files written by this code.
+    """
+
+    def __init__(self, path: str | Path):
+        """
+        :param path: File holding the checkpoint; the day results go next to it, with a .days suffix.
+        """
+        self.path = Path(path)
+        self.days_path = self.path.with_suffix(".days")
+
+    def load(self) -> dict[str, any] | None:
+        """
+        Return the saved state, or None if there is no checkpoint, it was written by another version or its
+        day results are missing.
+        """
+        try:
+            with open(self.path, "rb") as f:
+                state = pickle.load(f)
+        except FileNotFoundError:
+            return None
+        if state.get("version") != CHECKPOINT_VERSION:
+            return None
+        if state["days_size"] > (self.days_path.stat().st_size if self.days_path.exists() else 0):
+            return None
+        return state
+
+    def saved_days(self, state: dict[str, any]) -> Iterator[tuple[any, any]]:
+        """Yield the (rows, summary) of every day up to the checkpoint in `state`, one at a time."""
+        if not state["days_size"]:
+            return
+        with open(self.days_path, "rb") as f:
+            while f.tell() < state["days_size"]:
+                yield pickle.load(f)
+
+    def start_days(self, state: dict[str, any] | None):
+        """Drop the day results appended after the checkpoint in `state`, or all of them without one."""
+        if state is None or not state["days_size"]:
+            self.days_path.unlink(missing_ok=True)
+        else:
+            os.truncate(self.days_path, state["days_size"])
+
+    def append_day(self, rows: any, summary: any):
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        with open(self.days_path, "ab") as f:
+            pickle.dump((rows, summary), f, protocol=pickle.HIGHEST_PROTOCOL)
+
+    def save(self, state: dict[str, any]):
+        """Save `state` along with the day results appended so far."""
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        days_size = self.days_path.stat().st_size if self.days_path.exists() else 0
+        # Write to a temporary file first so a crash mid-save keeps the previous checkpoint intact
+        fd, tmp = tempfile.mkstemp(dir=self.path.parent, suffix=".tmp")
+        try:
+            with os.fdopen(fd, "wb") as f:
+                pickle.dump({**state, "days_size": days_size, "version": CHECKPOINT_VERSION}, f, protocol=pickle.HIGHEST_PROTOCOL)
+            os.replace(tmp, self.path)
+        except BaseException:
+            os.unlink(tmp)
+            raise
+
+    def clear(self):
+        self.path.unlink(missing_ok=True)
+        self.days_path.unlink(missing_ok=True)
@@ -0,0 +1,268 @@
+"""Event-driven backtest over minute bars streamed from Parquet, trading on a fixed decision cadence."""
+
+import argparse
+from collections.abc import Callable, Iterator
+from pathlib import Path
+
+import numpy as np
+import pandas as pd
+import pyarrow as pa
+import pyarrow.parquet as pq
+
+from src.agents.risk_manager import POSITION_LIMIT
+from src.agents.technicals import analyze_prices
+from src.backtesting.allocator import consensus_score, orders_for_targets, target_weights
+from src.backtesting.metrics import OnlineMetrics
+from src.backtesting.portfolio import ArrayPortfolio
+from src.backtesting.results import ColumnBuffer
+
+BAR_COLUMNS = ("open", "high", "low", "close", "volume")
+_CLOSE = BAR_COLUMNS.index("close")
+
+# Bars kept per ticker: the technical analyst's longest lookback is 126 bars
+DEFAULT_WINDOW = 256
+
+# Analysts that work from a ticker's recent bars alone, as functions of its price frame
+DEFAULT_ANALYSTS = {"technical_analyst_agent": analyze_prices}
+
+# One row per decision
+EQUITY_SCHEMA = pa.schema(
+    [
+        ("time", pa.timestamp("ms")),
+        ("portfolio_value", pa.float64()),
+        ("cash", pa.float64()),
+        ("long_exposure", pa.float64()),
+        ("short_exposure", pa.float64()),
+        ("trades", pa.int32()),
+    ]
+)
+
+
+def read_bars(path: str | Path, time_column: str = "datetime", ticker_column: str = "ticker", batch_rows: int = 65_536) -> Iterator[tuple[np.ndarray, np.ndarray | None, np.ndarray]]:
+    """
+    Stream a Parquet file of OHLCV bars sorted by time, `batch_rows` bars at a time, as (times in epoch
+    milliseconds, tickers, values with one column per BAR_COLUMNS). Tickers is None when the file has
+    no `ticker_column`. An integer time column is read as epoch milliseconds.
+    """
+    parquet = pq.ParquetFile(path)
+    has_tickers = ticker_column in parquet.schema_arrow.names
+    columns = [time_column, *BAR_COLUMNS, *([ticker_column] if has_tickers else [])]
+    for batch in parquet.iter_batches(batch_size=batch_rows, columns=columns):
+        time = batch.column(time_column)
+        if pa.types.is_integer(time.type):
+            times = time.to_numpy().astype(np.int64)
+        else:
+            times = time.cast(pa.timestamp("ms"), safe=False).cast(pa.int64()).to_numpy()
+        values = np.column_stack([batch.column(column).to_numpy(zero_copy_only=False).astype(np.float64) for column in BAR_COLUMNS])
+        tickers = batch.column(ticker_column).to_numpy(zero_copy_only=False) if has_tickers else None
+        yield times, tickers, values
+
+
+class BarWindow:
+    """The most recent `size` bars of one ticker, in a fixed-size ring buffer."""
+
+    def __init__(self, size: int):
+        self.size = size
+        self.times = np.zeros(size, dtype=np.int64)  # epoch milliseconds
+        self.values = np.zeros((size, len(BAR_COLUMNS)))
+        self.count = 0
+        self._next = 0  # slot of the next bar
+
+    def extend(self, times: np.ndarray, values: np.ndarray):
+        """Append bars in time order, overwriting the oldest ones beyond `size`."""
+        times, values = times[-self.size :], values[-self.size :]
+        n = len(times)
+        head = min(n, self.size - self._next)
+        self.times[self._next : self._next + head] = times[:head]
+        self.values[self._next : self._next + head] = values[:head]
+        # Wrap around to the start of the buffer
+        self.times[: n - head] = times[head:]
+        self.values[: n - head] = values[head:]
+        self._next = (self._next + n) % self.size
+        self.count = min(self.count + n, self.size)
+
+    def frame(self) -> pd.DataFrame:
+        """The bars held, oldest first, as a new price frame indexed by time."""
+        order = np.arange(self._next - self.count, self._next) % self.size
+        return pd.DataFrame(self.values[order], columns=BAR_COLUMNS, index=pd.to_datetime(self.times[order], unit="ms"))
+
+
+class IntradayBacktester:
+    """
+    Event-driven backtest over a stream of bars. Each ticker's most recent `window` bars are kept in a ring
+    buffer. When a bar opens a new decision period, the analysts evaluate every ticker's window, their consensus
+    becomes target weights within the risk manager's position limit, and the portfolio trades towards the targets
+    at the last close with the same long/short and margin rules as Backtester.
+
+    Indicators are not kept as running state: at each decision, every ticker's window is rebuilt as a price frame
+    and the analysts recompute their indicators over all of it. That costs O(window) per ticker per decision,
+    not per bar, and lets any function of a price frame serve as an analyst. Running EMA/RSI state would tie the
+    analysts to a fixed set of indicators and diverge from the daily technical analyst on the same bars.
+
+    Bars are read from Parquet in batches and per-decision results are streamed to `equity_path`, so memory
+    stays bounded however many bars the file holds.
+    """
+
+    def __init__(
+        self,
+        bars_path: str | Path,
+        tickers: list[str],
+        initial_capital: float,
+        cadence: str = "1h",
+        window: int = DEFAULT_WINDOW,
+        min_bars: int | None = None,
+        margin_requirement: float = 0.0,
+        position_limit: float = POSITION_LIMIT,
+        analysts: dict[str, Callable[[pd.DataFrame], dict]] | None = None,
+        time_column: str = "datetime",
+        ticker_column: str = "ticker",
+        batch_rows: int = 65_536,
+        periods_per_year: int | None = None,
+        equity_path: str | Path | None = None,
+    ):
+        """
+        :param bars_path: Parquet file of OHLCV bars sorted by time. Without a `ticker_column`, its bars belong to the only ticker.
+        :param tickers: Tickers to trade. Bars of other tickers are ignored.
+        :param initial_capital: Starting portfolio cash.
+        :param cadence: Length of a decision period, as a pandas offset such as "15min" or "1h".
+        :param window: Bars kept per ticker and passed to the analysts.
+        :param min_bars: Bars a ticker needs before it is traded. Defaults to `window`.
+        :param margin_requirement: The margin ratio for short positions (e.g. 0.5 = 50%).
+        :param position_limit: Largest position in one ticker, as a fraction of portfolio value.
+        :param analysts: Signal functions of a ticker's price frame, keyed by agent. Defaults to the technical analyst.
+        :param time_column: Column holding bar timestamps.
+        :param ticker_column: Column holding the ticker of each bar, if any.
+        :param batch_rows: Bars read and results written per batch.
+        :param periods_per_year: Decisions per year, to annualise the ratios. Defaults to round-the-clock trading at `cadence`.
+        :param equity_path: Parquet file for one row per decision. None keeps only the summary.
+        """
+        has_tickers = ticker_column in pq.ParquetFile(bars_path).schema_arrow.names
+        if not has_tickers and len(tickers) != 1:
+            raise ValueError(f"{bars_path} has no {ticker_column!r} column, so it can only be backtested for a single ticker")
+        self.bars_path = bars_path
+        self.tickers = tickers
+        self.initial_capital = initial_capital
+        self.cadence = pd.Timedelta(cadence)
+        self.min_bars = min_bars or window
+        self.position_limit = position_limit
+        self.analysts = analysts or DEFAULT_ANALYSTS
+        self.time_column = time_column
+        self.ticker_column = ticker_column
+        self.batch_rows = batch_rows
+        self.equity_path = equity_path
+
+        self.portfolio = ArrayPortfolio(tickers, initial_capital, margin_requirement)
+        self.metrics = OnlineMetrics(periods_per_year=periods_per_year or int(pd.Timedelta(days=365) / self.cadence))
+        self.index = {ticker: i for i, ticker in enumerate(tickers)}
+        self.windows = [BarWindow(window) for _ in tickers]
+        self.prices = np.full(len(tickers), np.nan)  # last close by ticker id
+        self.bars = 0
+        self.decisions = 0
+        self.trades = 0
+        self._equity: ColumnBuffer | None = None
+
+    def run(self) -> dict[str, any]:
+        """Replay every bar, decide at the end of each period and return the performance summary."""
+        cadence_ms = self.cadence // pd.Timedelta(milliseconds=1)
+        writer = pq.ParquetWriter(self.equity_path, EQUITY_SCHEMA) if self.equity_path else None
+        self._equity = ColumnBuffer(EQUITY_SCHEMA, writer.write_batch, self.batch_rows) if writer else None
+        period = last_time = None
+        try:
+            for times, tickers, values in read_bars(self.bars_path, self.time_column, self.ticker_column, self.batch_rows):
+                periods = times // cadence_ms
+                starts = [0, *(np.flatnonzero(np.diff(periods)) + 1).tolist()]
+                for start, end in zip(starts, [*starts[1:], len(times)]):
+                    # The first bar of a new period closes the previous one
+                    if period is not None and periods[start] != period:
+                        self._decide(last_time)
+                    self._add_bars(times[start:end], tickers[start:end] if tickers is not None else None, values[start:end])
+                    period, last_time = periods[start], int(times[end - 1])
+            if period is not None:
+                self._decide(last_time)
+        finally:
+            if writer is not None:
+                self._equity.flush()
+                writer.close()
+        return self.summary()
+
+    def _add_bars(self, times: np.ndarray, tickers: np.ndarray | None, values: np.ndarray):
+        self.bars += len(times)
+        if tickers is None:
+            self.windows[0].extend(times, values)
+            self.prices[0] = values[-1, _CLOSE]
+            return
+        for ticker in pd.unique(tickers):
+            i = self.index.get(ticker)
+            if i is None:
+                continue
+            mask = tickers == ticker
+            self.windows[i].extend(times[mask], values[mask])
+            self.prices[i] = values[mask][-1, _CLOSE]
+
+    def _decide(self, time: int):
+        scores = np.zeros(len(self.tickers))
+        for i, window in enumerate(self.windows):
+            if window.count >= self.min_bars:
+                # Full-window recompute: the analysts see the whole window, not just the bars since the last decision
+                prices_df = window.frame()
+                scores[i] = consensus_score({agent: analyze(prices_df) for agent, analyze in self.analysts.items()})
+
+        # Tickers without a bar yet hold no position and get no target
+        quoted = ~np.isnan(self.prices)
+        prices = np.where(quoted, self.prices, 1.0)
+        weights = np.where(quoted, target_weights(scores, self.position_limit), 0.0)
+        actions, quantities = orders_for_targets(self.portfolio, weights, prices)
+        trades = int(np.count_nonzero(self.portfolio.execute_orders(actions, quantities, prices)))
+
+        total_value = self.portfolio.total_value(prices)
+        self.metrics.update(time, total_value)
+        self.decisions += 1
+        self.trades += trades
+        if self._equity is not None:
+            long_exposure, short_exposure = self.portfolio.exposures(prices)
+            self._equity.append((time, total_value, float(self.portfolio.cash), long_exposure, short_exposure, trades))
+
+    def summary(self) -> dict[str, any]:
+        final_value = self.portfolio.total_value(np.where(np.isnan(self.prices), 1.0, self.prices))
+        drawdown_time = self.metrics.max_drawdown_date
+        return {
+            "bars": self.bars,
+            "decisions": self.decisions,
+            "trades": self.trades,
+            "final_value": final_value,
+            "return_pct": (final_value / self.initial_capital - 1) * 100,
+            "sharpe_ratio": self.metrics.sharpe_ratio,
+            "sortino_ratio": self.metrics.sortino_ratio,
+            "max_drawdown": self.metrics.max_drawdown,
+            "max_drawdown_date": pd.Timestamp(drawdown_time, unit="ms") if drawdown_time is not None else None,
+        }
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Run an event-driven backtest over minute bars")
+    parser.add_argument("--bars", type=str, required=True, help="Parquet file of OHLCV bars sorted by time")
+    parser.add_argument("--tickers", type=str, required=True, help="Comma-separated list of tickers to trade")
+    parser.add_argument("--initial-capital", type=float, default=100000, help="Initial capital amount (default: 100000)")
+    parser.add_argument("--cadence", type=str, default="1h", help="Decision period, e.g. 15min or 1h (default: 1h)")
+    parser.add_argument("--window", type=int, default=DEFAULT_WINDOW, help=f"Bars per ticker the analysts look at (default: {DEFAULT_WINDOW})")
+    parser.add_argument("--margin-requirement", type=float, default=0.0, help="Initial margin requirement (default: 0.0)")
+    parser.add_argument("--time-column", type=str, default="datetime", help="Timestamp column of the bars (default: datetime)")
+    parser.add_argument("--equity-output", type=str, default=None, help="Parquet file for one row per decision")
+    args = parser.parse_args()
+
+    backtester = IntradayBacktester(
+        args.bars,
+        [ticker.strip() for ticker in args.tickers.split(",") if ticker.strip()],
+        args.initial_capital,
+        cadence=args.cadence,
+        window=args.window,
+        margin_requirement=args.margin_requirement,
+        time_column=args.time_column,
+        equity_path=args.equity_output,
+    )
+    for key, value in backtester.run().items():
+        print(f"{key}: {value}")
+
+
+if __name__ == "__main__":
+    main()
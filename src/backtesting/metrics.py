@@ -0,0 +1,155 @@
+"""Performance metrics that are updated in O(1) per observation instead of recomputed from the full history."""
+
+import math
+from collections import deque
+
+TRADING_DAYS_PER_YEAR = 252
+RISK_FREE_RATE = 0.0434  # annual
+
+
+class RunningStats:
+    """Welford's running mean and sample variance."""
+
+    def __init__(self):
+        self.count = 0
+        self.mean = 0.0
+        self._m2 = 0.0
+
+    def add(self, x: float):
+        self.count += 1
+        delta = x - self.mean
+        self.mean += delta / self.count
+        self._m2 += delta * (x - self.mean)
+
+    def remove(self, x: float):
+        """Undo a previous add(x), for sliding windows."""
+        if self.count <= 1:
+            self.count, self.mean, self._m2 = 0, 0.0, 0.0
+            return
+        delta = x - self.mean
+        self.count -= 1
+        self.mean -= delta / self.count
+        self._m2 -= delta * (x - self.mean)
+
+    @property
+    def std(self) -> float:
+        """Sample standard deviation (ddof=1); 0.0 with fewer than two observations."""
+        if self.count < 2:
+            return 0.0
+        return math.sqrt(max(self._m2, 0.0) / (self.count - 1))
+
+
+class _ReturnStats:
+    """Mean and volatility of excess returns, plus the volatility of the negative ones, optionally over a sliding window."""
+
+    def __init__(self, window: int | None = None):
+        self.window = window
+        self.all = RunningStats()
+        self.downside = RunningStats()
+        self._returns: deque[float] = deque()
+
+    def add(self, excess_return: float):
+        self.all.add(excess_return)
+        if excess_return < 0:
+            self.downside.add(excess_return)
+        if self.window is None:
+            return
+        self._returns.append(excess_return)
+        if len(self._returns) > self.window:
+            dropped = self._returns.popleft()
+            self.all.remove(dropped)
+            if dropped < 0:
+                self.downside.remove(dropped)
+
+    def sharpe_ratio(self, periods_per_year: int) -> float:
+        if self.all.std > 1e-12:
+            return math.sqrt(periods_per_year) * self.all.mean / self.all.std
+        return 0.0
+
+    def sortino_ratio(self, periods_per_year: int) -> float:
+        if self.downside.std > 1e-12:
+            return math.sqrt(periods_per_year) * self.all.mean / self.downside.std
+        return float("inf") if self.all.mean > 0 else 0
+
+
+class OnlineMetrics:
+    """
+    Sharpe ratio, Sortino ratio and drawdown of a value series, fed one value at a time.
+
+    Definitions match the batch computation they replace: excess returns over a daily risk-free
+    rate, sample standard deviations, Sortino downside from the negative excess returns only, and
+    drawdown relative to the running peak. With `window`, rolling variants over the last `window`
+    returns are maintained alongside the full-history figures.
+    """
+
+    def __init__(self, risk_free_rate: float = RISK_FREE_RATE, periods_per_year: int = TRADING_DAYS_PER_YEAR, window: int | None = None):
+        """
+        :param risk_free_rate: Annual risk-free rate, spread evenly over `periods_per_year`.
+        :param periods_per_year: Observations per year, used to annualise the ratios.
+        :param window: Number of most recent returns used for the rolling metrics. None disables them.
+        """
+        self.periods_per_year = periods_per_year
+        self.period_risk_free_rate = risk_free_rate / periods_per_year
+        self.window = window
+        self._total = _ReturnStats()
+        self._rolling = _ReturnStats(window) if window else None
+        self._previous_value: float | None = None
+        self._peak = -math.inf
+        self._values = 0
+        self.max_drawdown = 0.0  # percent, <= 0
+        self.max_drawdown_date = None
+        self.drawdown = 0.0  # current, percent
+        # (index, value) pairs with decreasing values: the front is the peak of the rolling window
+        self._window_peaks: deque[tuple[int, float]] = deque()
+
+    @property
+    def num_returns(self) -> int:
+        return self._total.all.count
+
+    def update(self, date, value: float):
+        """Add the value observed at `date`."""
+        if self._previous_value is not None and self._previous_value != 0:
+            excess_return = value / self._previous_value - 1 - self.period_risk_free_rate
+            self._total.add(excess_return)
+            if self._rolling is not None:
+                self._rolling.add(excess_return)
+        self._previous_value = value
+
+        self._peak = max(self._peak, value)
+        self.drawdown = (value - self._peak) / self._peak * 100 if self._peak else 0.0
+        if self.drawdown < self.max_drawdown:
+            self.max_drawdown = self.drawdown
+            self.max_drawdown_date = date
+
+        if self.window:
+            # A window of n returns spans n + 1 values
+            while self._window_peaks and self._window_peaks[-1][1] <= value:
+                self._window_peaks.pop()
+            self._window_peaks.append((self._values, value))
+            while self._window_peaks[0][0] <= self._values - self.window - 1:
+                self._window_peaks.popleft()
+        self._values += 1
+
+    @property
+    def sharpe_ratio(self) -> float:
+        return self._total.sharpe_ratio(self.periods_per_year)
+
+    @property
+    def sortino_ratio(self) -> float:
+        return self._total.sortino_ratio(self.periods_per_year)
+
+    @property
+    def rolling_sharpe_ratio(self) -> float | None:
+        return self._rolling.sharpe_ratio(self.periods_per_year) if self._rolling else None
+
+    @property
+    def rolling_sortino_ratio(self) -> float | None:
+        return self._rolling.sortino_ratio(self.periods_per_year) if self._rolling else None
+
+    @property
+    def rolling_drawdown(self) -> float | None:
+        """Current drawdown, in percent, from the highest value within the rolling window."""
+        if not self._window_peaks:
+            return None
+        peak = self._window_peaks[0][1]
+        return (self._previous_value - peak) / peak * 100 if peak else 0.0
@@ -0,0 +1,94 @@
+"""Dates × tickers price arrays that a backtest loads once and then reads by row index."""
+
+from collections.abc import Callable
+from datetime import date, timedelta
+
+import numpy as np
+import pandas as pd
+
+from src.tools.api import get_price_frame
+
+# Price fields held by the panel
+PANEL_FIELDS = ("open", "close", "volume")
+
+
+class PricePanel:
+    """
+    Open, close and volume for a fixed set of tickers as 2-D float arrays (dates × tickers).
+
+    Rows are the union of all trading days seen for any ticker; a ticker without a bar on a day holds NaN.
+    """
+
+    def __init__(self, dates: np.ndarray, tickers: list[str], fields: dict[str, np.ndarray]):
+        """
+        :param dates: Sorted trading days as datetime64[D].
+        :param tickers: Column order of the field arrays.
+        :param fields: Field name to array of shape (len(dates), len(tickers)).
+        """
+        self.dates = dates
+        self.tickers = list(tickers)
+        self.fields = fields
+
+    @classmethod
+    def load(
+        cls,
+        tickers: list[str],
+        start_date: str,
+        end_date: str,
+        fetch: Callable[[str, str, str], pd.DataFrame] = get_price_frame,
+        on_error: Callable[[str, Exception], None] | None = None,
+    ) -> "PricePanel":
+        """
+        Build a panel from one price frame per ticker.
+        Tickers whose fetch fails are left empty (all NaN) and reported to `on_error`.
+        """
+        series: dict[str, dict[str, pd.Series]] = {field: {} for field in PANEL_FIELDS}
+        for ticker in tickers:
+            try:
+                frame = fetch(ticker, start_date, end_date)
+            except Exception as e:
+                if on_error is not None:
+                    on_error(ticker, e)
+                continue
+            days = pd.Index(frame.index.strftime("%Y-%m-%d"))
+            keep = ~days.duplicated(keep="last")
+            for field in PANEL_FIELDS:
+                series[field][ticker] = pd.Series(frame[field].to_numpy(dtype=np.float64)[keep], index=days[keep])
+
+        index = pd.Index(sorted(set().union(*(s.index for s in series["close"].values()))))
+        fields = {field: pd.DataFrame(series[field], index=index, columns=list(tickers), dtype=np.float64).to_numpy() for field in PANEL_FIELDS}
+        return cls(np.array(index, dtype="datetime64[D]"), tickers, fields)
+
+    def latest(self, field: str, as_of: str, lookback_days: int = 1) -> dict[str, float]:
+        """
+        Return each ticker's most recent value of `field` from the days in [as_of - lookback_days, as_of].
+        Tickers without a value in that window are left out.
+        """
+        window_start = (date.fromisoformat(as_of) - timedelta(days=lookback_days)).isoformat()
+        lo = self.dates.searchsorted(np.datetime64(window_start), side="left")
+        hi = self.dates.searchsorted(np.datetime64(as_of), side="right")
+        values = self.fields[field][lo:hi]
+
+        latest = {}
+        for column, ticker in enumerate(self.tickers):
+            present = values[:, column][~np.isnan(values[:, column])]
+            if len(present):
+                latest[ticker] = float(present[-1])
+        return latest
+
+    def asof(self, field: str, days: list[str], lookback_days: int = 1) -> np.ndarray:
+        """
+        Vectorized `latest` for many days at once: an array of shape (len(days), len(tickers)) holding
+        each ticker's most recent value of `field` within [day - lookback_days, day], or NaN if there is none.
+        """
+        values = self.fields[field]
+        rows = np.arange(len(self.dates))[:, None]
+        # Row of the most recent non-NaN value at or before each row, per ticker (-1 if none yet)
+        last_valid = np.maximum.accumulate(np.where(np.isnan(values), -1, rows), axis=0)
+
+        targets = np.array(days, dtype="datetime64[D]")
+        hi = self.dates.searchsorted(targets, side="right") - 1
+        source = np.where(hi[:, None] >= 0, last_valid[np.maximum(hi, 0)], -1)
+        found = source >= 0
+        recent = self.dates[np.maximum(source, 0)] >= (targets - np.timedelta64(lookback_days, "D"))[:, None]
+        return np.where(found & recent, values[np.maximum(source, 0), np.arange(len(self.tickers))], np.nan)
@@ -0,0 +1,219 @@
+"""Array-backed portfolio state for backtests over large ticker universes."""
+
+import numpy as np
+
+ACTIONS = ("hold", "buy", "sell", "short", "cover")
+HOLD, BUY, SELL, SHORT, COVER = range(len(ACTIONS))
+_ACTION_CODES = {action: code for code, action in enumerate(ACTIONS)}
+
+
+class ArrayPortfolio:
+    """
+    Long/short portfolio with one NumPy array per position field, indexed by ticker id.
+
+    Trade semantics are those of the original dict-based backtester: integer shares, weighted
+    average cost bases, partial fills down to what cash allows, short margin posted from cash and
+    released proportionally on cover. Valuation and exposures are single vector operations, and a
+    day's trades can be applied in one batch.
+    """
+
+    def __init__(self, tickers: list[str], initial_cash: float, margin_requirement: float = 0.0):
+        """
+        :param tickers: Tickers that can be held; their order defines the ticker ids.
+        :param initial_cash: Starting cash.
+        :param margin_requirement: Fraction of short proceeds that must be posted as margin.
+        """
+        self.tickers = list(tickers)
+        self.index = {ticker: i for i, ticker in enumerate(self.tickers)}
+        n = len(self.tickers)
+        self.cash = float(initial_cash)
+        self.margin_used = 0.0
+        self.margin_requirement = margin_requirement
+        self.long = np.zeros(n, dtype=np.int64)
+        self.short = np.zeros(n, dtype=np.int64)
+        self.long_cost_basis = np.zeros(n)
+        self.short_cost_basis = np.zeros(n)
+        self.short_margin_used = np.zeros(n)
+        self.realized_long = np.zeros(n)
+        self.realized_short = np.zeros(n)
+
+    def prices_array(self, prices: dict[str, float]) -> np.ndarray:
+        """Prices ordered by ticker id."""
+        return np.fromiter((prices[ticker] for ticker in self.tickers), dtype=np.float64, count=len(self.tickers))
+
+    def total_value(self, prices: np.ndarray) -> float:
+        """Cash plus the market value of long positions minus that of short positions."""
+        return self.cash + float((self.long - self.short) @ prices)
+
+    def exposures(self, prices: np.ndarray) -> tuple[float, float]:
+        """Long and short market exposure."""
+        return float(self.long @ prices), float(self.short @ prices)
+
+    def execute_trade(self, ticker: str, action: str, quantity: float, current_price: float) -> int:
+        """
+        Execute one trade and return the number of shares actually traded. Buys and shorts are
+        reduced to what the cash allows, sells and covers to the position held.
+        """
+        if quantity <= 0:
+            return 0
+        quantity = int(quantity)  # force integer shares
+        i = self.index[ticker]
+
+        if action == "buy":
+            if quantity * current_price > self.cash:
+                quantity = int(self.cash / current_price)
+            if quantity <= 0:
+                return 0
+            cost = quantity * current_price
+            total_shares = self.long[i] + quantity
+            self.long_cost_basis[i] = (self.long_cost_basis[i] * self.long[i] + cost) / total_shares
+            self.long[i] = total_shares
+            self.cash -= cost
+            return quantity
+
+        if action == "sell":
+            quantity = min(quantity, int(self.long[i]))
+            if quantity <= 0:
+                return 0
+            self.realized_long[i] += (current_price - self.long_cost_basis[i]) * quantity
+            self.long[i] -= quantity
+            self.cash += quantity * current_price
+            if self.long[i] == 0:
+                self.long_cost_basis[i] = 0.0
+            return quantity
+
+        if action == "short":
+            if current_price * quantity * self.margin_requirement > self.cash:
+                quantity = int(self.cash / (current_price * self.margin_requirement)) if self.margin_requirement > 0 else 0
+            if quantity <= 0:
+                return 0
+            proceeds = current_price * quantity
+            margin_required = proceeds * self.margin_requirement
+            total_shares = self.short[i] + quantity
+            self.short_cost_basis[i] = (self.short_cost_basis[i] * self.short[i] + proceeds) / total_shares
+            self.short[i] = total_shares
+            self.short_margin_used[i] += margin_required
+            self.margin_used += margin_required
+            self.cash += proceeds - margin_required
+            return quantity
+
+        if action == "cover":
+            quantity = min(quantity, int(self.short[i]))
+            if quantity <= 0:
+                return 0
+            margin_to_release = quantity / self.short[i] * self.short_margin_used[i]
+            self.realized_short[i] += (self.short_cost_basis[i] - current_price) * quantity
+            self.short[i] -= quantity
+            self.short_margin_used[i] -= margin_to_release
+            self.margin_used -= margin_to_release
+            self.cash += margin_to_release - quantity * current_price
+            if self.short[i] == 0:
+                self.short_cost_basis[i] = 0.0
+                self.short_margin_used[i] = 0.0
+            return quantity
+
+        return 0
+
+    def execute_trades(self, decisions: dict[str, dict], prices: np.ndarray) -> np.ndarray:
+        """
+        Apply one decision ({"action", "quantity"}) per ticker, in ticker order, and return the
+        executed quantities by ticker id. Tickers without a decision hold.
+
+        When every buy and short fits in the cash available at its turn, the whole batch is applied
+        with array operations. Otherwise trades run one by one so that partial fills match the
+        sequential semantics exactly.
+        """
+        n = len(self.tickers)
+        # Fill plain lists first: item assignment on NumPy arrays is slow element by element
+        action_codes = [HOLD] * n
+        requested_quantities = [0] * n
+        for ticker, decision in decisions.items():
+            i = self.index.get(ticker)
+            code = _ACTION_CODES.get(decision.get("action", "hold"))
+            if i is None or code is None:
+                continue
+            quantity = decision.get("quantity", 0) or 0
+            action_codes[i] = code
+            requested_quantities[i] = int(quantity) if quantity > 0 else 0
+        return self.execute_orders(np.array(action_codes, dtype=np.int8), np.array(requested_quantities, dtype=np.int64), prices)
+
+    def execute_orders(self, actions: np.ndarray, requested: np.ndarray, prices: np.ndarray) -> np.ndarray:
+        """
+        Array form of execute_trades: one action code (index into ACTIONS) and one non-negative
+        share quantity per ticker id. Returns the executed quantities by ticker id.
+        """
+        n = len(self.tickers)
+        buy, sell, short, cover = (actions == BUY), (actions == SELL), (actions == SHORT), (actions == COVER)
+        quantity = np.where(buy | short, requested, 0)
+        quantity = np.where(sell, np.minimum(requested, self.long), quantity)
+        quantity = np.where(cover, np.minimum(requested, self.short), quantity)
+
+        notional = quantity * prices
+        held_short = np.where(self.short > 0, self.short, 1)
+        margin_released = np.where(cover, quantity / held_short * self.short_margin_used, 0.0)
+        margin_posted = np.where(short, notional * self.margin_requirement, 0.0)
+        cash_delta = np.where(buy, -notional, 0.0) + np.where(sell, notional, 0.0) + np.where(short, notional, 0.0) - margin_posted + np.where(cover, margin_released - notional, 0.0)
+
+        # Cash available to each trade, after every trade before it in ticker order
+        cash_before = self.cash + np.concatenate(([0.0], np.cumsum(cash_delta)[:-1]))
+        required = np.where(buy, notional, 0.0) + margin_posted
+        if np.any(required > cash_before):
+            executed = np.zeros(n, dtype=np.int64)
+            for i in np.flatnonzero(actions):
+                executed[i] = self.execute_trade(self.tickers[i], ACTIONS[actions[i]], int(requested[i]), float(prices[i]))
+            return executed
+
+        # Fast path: every trade fills in full
+        long_after = self.long + np.where(buy, quantity, 0) - np.where(sell, quantity, 0)
+        short_after = self.short + np.where(short, quantity, 0) - np.where(cover, quantity, 0)
+
+        opened_long = buy & (quantity > 0)
+        self.long_cost_basis = np.where(opened_long, (self.long_cost_basis * self.long + notional) / np.where(opened_long, long_after, 1), self.long_cost_basis)
+        opened_short = short & (quantity > 0)
+        self.short_cost_basis = np.where(opened_short, (self.short_cost_basis * self.short + notional) / np.where(opened_short, short_after, 1), self.short_cost_basis)
+
+        self.realized_long += np.where(sell, (prices - self.long_cost_basis) * quantity, 0.0)
+        self.realized_short += np.where(cover, (self.short_cost_basis - prices) * quantity, 0.0)
+        self.short_margin_used = self.short_margin_used + margin_posted - margin_released
+
+        self.long, self.short = long_after, short_after
+        self.long_cost_basis[self.long == 0] = 0.0
+        closed_short = self.short == 0
+        self.short_cost_basis[closed_short] = 0.0
+        self.short_margin_used[closed_short] = 0.0
+
+        self.margin_used += float(margin_posted.sum() - margin_released.sum())
+        self.cash += float(cash_delta.sum())
+        return quantity
+
+    def position(self, ticker: str) -> dict[str, any]:
+        i = self.index[ticker]
+        return {
+            "long": int(self.long[i]),
+            "short": int(self.short[i]),
+            "long_cost_basis": float(self.long_cost_basis[i]),
+            "short_cost_basis": float(self.short_cost_basis[i]),
+            "short_margin_used": float(self.short_margin_used[i]),
+        }
+
+    def to_dict(self) -> dict[str, any]:
+        """Snapshot in the nested dict layout the agents read, with plain Python numbers."""
+        long, short = self.long.tolist(), self.short.tolist()
+        long_cost_basis, short_cost_basis, short_margin_used = self.long_cost_basis.tolist(), self.short_cost_basis.tolist(), self.short_margin_used.tolist()
+        realized_long, realized_short = self.realized_long.tolist(), self.realized_short.tolist()
+        return {
+            "cash": self.cash,
+            "margin_used": self.margin_used,
+            "margin_requirement": self.margin_requirement,
+            "positions": {
+                ticker: {
+                    "long": long[i],
+                    "short": short[i],
+                    "long_cost_basis": long_cost_basis[i],
+                    "short_cost_basis": short_cost_basis[i],
+                    "short_margin_used": short_margin_used[i],
+                }
+                for i, ticker in enumerate(self.tickers)
+            },
+            "realized_gains": {ticker: {"long": realized_long[i], "short": realized_short[i]} for i, ticker in enumerate(self.tickers)},
+        }
@@ -0,0 +1,164 @@
+"""Structured backtest results, streamed one trading day at a time to pluggable sinks."""
+
+from abc import ABC, abstractmethod
+from collections import deque
+from pathlib import Path
+from typing import NamedTuple
+
+import pyarrow as pa
+import pyarrow.parquet as pq
+
+from src.utils.display import format_backtest_row, print_backtest_results
+
+RESULT_FORMATS = ("parquet", "arrow")
+
+
+class TickerRow(NamedTuple):
+    """A ticker's trade and post-trade position on one trading day."""
+
+    date: str
+    ticker: str
+    action: str
+    quantity: int
+    price: float
+    shares_owned: int  # net shares: long minus short
+    position_value: float
+    bullish_count: int
+    bearish_count: int
+    neutral_count: int
+
+
+class DaySummary(NamedTuple):
+    """The whole portfolio after one trading day's trades."""
+
+    date: str
+    total_value: float
+    return_pct: float
+    cash_balance: float
+    total_position_value: float
+    long_exposure: float
+    short_exposure: float
+    sharpe_ratio: float | None
+    sortino_ratio: float | None
+    max_drawdown: float | None
+
+
+TICKER_ROW_SCHEMA = pa.schema(
+    [
+        ("date", pa.date32()),
+        ("ticker", pa.string()),
+        ("action", pa.string()),
+        ("quantity", pa.int64()),
+        ("price", pa.float64()),
+        ("shares_owned", pa.int64()),
+        ("position_value", pa.float64()),
+        ("bullish_count", pa.int32()),
+        ("bearish_count", pa.int32()),
+        ("neutral_count", pa.int32()),
+    ]
+)
+
+DAY_SUMMARY_SCHEMA = pa.schema(
+    [
+        ("date", pa.date32()),
+        ("total_value", pa.float64()),
+        ("return_pct", pa.float64()),
+        ("cash_balance", pa.float64()),
+        ("total_position_value", pa.float64()),
+        ("long_exposure", pa.float64()),
+        ("short_exposure", pa.float64()),
+        ("sharpe_ratio", pa.float64()),
+        ("sortino_ratio", pa.float64()),
+        ("max_drawdown", pa.float64()),
+    ]
+)
+
+
+class ResultSink(ABC):
+    """Consumer of backtest results. The backtester calls write_day once per trading day and close once at the end."""
+
+    @abstractmethod
+    def write_day(self, rows: list[TickerRow], summary: DaySummary):
+        pass
+
+    def close(self):
+        pass
+
+
+class TerminalSink(ResultSink):
+    """Redraw the results table after every day, showing only the most recent days so memory stays flat."""
+
+    def __init__(self, max_days: int = 20):
+        """
+        :param max_days: Trading days kept on screen.
+        """
+        self._days: deque[list[list]] = deque(maxlen=max_days)
+
+    def write_day(self, rows: list[TickerRow], summary: DaySummary):
+        self._days.append([format_backtest_row(**row._asdict()) for row in rows])
+        print_backtest_results([row for day in self._days for row in day], summary)
+
+
+class ColumnBuffer:
+    """Records buffered column by column and flushed as one record batch once `batch_rows` have accumulated."""
+
+    def __init__(self, schema: pa.Schema, write, batch_rows: int):
+        self.schema = schema
+        self.write = write
+        self.batch_rows = batch_rows
+        self.columns: dict[str, list] = {name: [] for name in schema.names}
+        self.size = 0
+
+    def append(self, record: NamedTuple):
+        for name, value in zip(self.schema.names, record):
+            self.columns[name].append(value)
+        self.size += 1
+        if self.size >= self.batch_rows:
+            self.flush()
+
+    def flush(self):
+        if not self.size:
+            return
+        arrays = []
+        for name, values in self.columns.items():
+            field_type = self.schema.field(name).type
+            # Dates are recorded as YYYY-MM-DD strings
+            arrays.append(pa.array(values, type=pa.string()).cast(field_type) if pa.types.is_date(field_type) else pa.array(values, type=field_type))
+        self.write(pa.RecordBatch.from_arrays(arrays, schema=self.schema))
+        self.columns = {name: [] for name in self.schema.names}
+        self.size = 0
+
+
+class FileSink(ResultSink):
+    """
+    Stream results into `rows.<file_format>` (one row per date and ticker) and `days.<file_format>` (one row per date)
+    under `directory`, as Parquet or Arrow IPC files that pandas, Polars or DuckDB read directly.
+    Records are written in batches of `batch_rows`, so memory use does not grow with the length of the backtest.
+    A resumed backtest replays its checkpointed days first, so the files always cover the whole run.
+    """
+
+    def __init__(self, directory: str | Path, file_format: str = "parquet", batch_rows: int = 10_000):
+        if file_format not in RESULT_FORMATS:
+            raise ValueError(f"Unknown result format {file_format!r}, expected one of {', '.join(RESULT_FORMATS)}")
+        self.directory = Path(directory)
+        self.directory.mkdir(parents=True, exist_ok=True)
+        self._writers = [self._open(self.directory / f"rows.{file_format}", TICKER_ROW_SCHEMA, file_format), self._open(self.directory / f"days.{file_format}", DAY_SUMMARY_SCHEMA, file_format)]
+        self._rows = ColumnBuffer(TICKER_ROW_SCHEMA, self._writers[0].write_batch, batch_rows)
+        self._days = ColumnBuffer(DAY_SUMMARY_SCHEMA, self._writers[1].write_batch, batch_rows)
+
+    @staticmethod
+    def _open(path: Path, schema: pa.Schema, file_format: str):
+        if file_format == "parquet":
+            return pq.ParquetWriter(path, schema)
+        return pa.ipc.new_file(path, schema)
+
+    def write_day(self, rows: list[TickerRow], summary: DaySummary):
+        for row in rows:
+            self._rows.append(row)
+        self._days.append(summary)
+
+    def close(self):
+        self._rows.flush()
+        self._days.flush()
+        for writer in self._writers:
+            writer.close()
@@ -0,0 +1,85 @@
+"""Precomputed analyst signals per (date, ticker) for two-phase backtests."""
+
+import hashlib
+import json
+import threading
+from collections.abc import Callable, Iterable
+from concurrent.futures import ThreadPoolExecutor, as_completed
+from pathlib import Path
+
+DEFAULT_SIGNALS_DIR = ".cache/signals"
+
+
+def signals_fingerprint(selected_analysts: list[str], model_name: str, model_provider: str, lookback_days: int) -> str:
+    """Identify the settings that analyst signals depend on, besides the ticker and date."""
+    settings = {"analysts": sorted(selected_analysts), "model": model_name, "provider": model_provider, "lookback_days": lookback_days}
+    return hashlib.sha256(json.dumps(settings, sort_keys=True).encode()).hexdigest()[:16]
+
+
+class SignalStore:
+    """
+    Analyst signals keyed by (date, ticker), optionally appended to a JSON lines file.
+    Reopening the same file makes its signals available again, so interrupted or repeated runs reuse them.
+    """
+
+    def __init__(self, path: str | Path | None = None):
+        """
+        :param path: JSON lines file to load from and append to. None keeps signals in memory only.
+        """
+        self.path = Path(path) if path else None
+        self._signals: dict[tuple[str, str], dict[str, dict]] = {}
+        self._lock = threading.Lock()
+        if self.path is not None and self.path.exists():
+            with open(self.path, encoding="utf-8") as f:
+                for line in f:
+                    if line.strip():
+                        entry = json.loads(line)
+                        self._signals[(entry["date"], entry["ticker"])] = entry["signals"]
+
+    def __contains__(self, key: tuple[str, str]) -> bool:
+        return key in self._signals
+
+    def get(self, date: str, ticker: str) -> dict[str, dict] | None:
+        """Return the signals of every analyst for the ticker on the date, keyed by agent."""
+        return self._signals.get((date, ticker))
+
+    def put(self, date: str, ticker: str, signals: dict[str, dict]):
+        line = json.dumps({"date": date, "ticker": ticker, "signals": signals}, default=str)
+        with self._lock:
+            self._signals[(date, ticker)] = signals
+            if self.path is not None:
+                self.path.parent.mkdir(parents=True, exist_ok=True)
+                with open(self.path, "a", encoding="utf-8") as f:
+                    f.write(line + "\n")
+
+    def signals_for(self, date: str, tickers: Iterable[str]) -> dict[str, dict]:
+        """Signals for all tickers on the date, keyed by agent and then ticker, as the portfolio manager expects."""
+        merged: dict[str, dict] = {}
+        for ticker in tickers:
+            for agent, signal in (self.get(date, ticker) or {}).items():
+                merged.setdefault(agent, {})[ticker] = signal
+        return merged
+
+
+def precompute_signals(
+    store: SignalStore,
+    dates: Iterable[str],
+    tickers: list[str],
+    compute: Callable[[str, str], dict[str, dict]],
+    workers: int = 8,
+) -> dict[tuple[str, str], Exception]:
+    """
+    Compute the signals of every (date, ticker) missing from `store` on a thread pool.
+    `compute(date, ticker)` returns the ticker's signals keyed by agent. Failures are returned keyed by (date, ticker).
+    """
+    jobs = [(date, ticker) for date in dates for ticker in tickers if (date, ticker) not in store]
+    failures = {}
+    with ThreadPoolExecutor(max_workers=workers) as executor:
+        futures = {executor.submit(compute, date, ticker): (date, ticker) for date, ticker in jobs}
+        for future in as_completed(futures):
+            date, ticker = futures[future]
+            try:
+                store.put(date, ticker, future.result())
+            except Exception as e:
+                failures[(date, ticker)] = e
+    return failures
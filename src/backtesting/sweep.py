@@ -0,0 +1,241 @@
+"""Run a grid of backtest configurations across a process pool, streaming daily results to Parquet."""
+
+import argparse
+import itertools
+import json
+import multiprocessing
+import os
+import sys
+import tempfile
+from collections.abc import Callable
+from concurrent.futures import ProcessPoolExecutor, as_completed
+from datetime import datetime
+from pathlib import Path
+
+import pyarrow as pa
+import pyarrow.parquet as pq
+from dateutil.relativedelta import relativedelta
+
+from src.backtesting.results import ColumnBuffer, DaySummary, ResultSink, TickerRow
+from src.data.cache import CACHE_FILE_NAME, PersistentStore, get_cache
+from src.tools.archive import DATA_MODES
+from src.tools.async_api import prefetch_universe
+from src.tools.client import set_data_mode
+
+DEFAULT_CACHE_DIR = ".cache/financial_data"
+
+REQUIRED_KEYS = ("tickers", "start_date", "end_date", "initial_capital")
+
+# One row per (config, trading day)
+RESULT_SCHEMA = pa.schema(
+    [
+        ("config_id", pa.int32()),
+        ("config", pa.string()),
+        ("date", pa.date32()),
+        ("portfolio_value", pa.float64()),
+        ("return_pct", pa.float64()),
+        ("long_exposure", pa.float64()),
+        ("short_exposure", pa.float64()),
+        ("gross_exposure", pa.float64()),
+        ("net_exposure", pa.float64()),
+        ("long_short_ratio", pa.float64()),
+        ("sharpe_ratio", pa.float64()),
+        ("sortino_ratio", pa.float64()),
+        ("max_drawdown", pa.float64()),
+    ]
+)
+
+
+def expand_grid(base: dict[str, any], grid: dict[str, list]) -> list[dict[str, any]]:
+    """
+    Build one Backtester configuration per combination of the grid values, on top of `base`.
+    A grid value that is a dict sets several parameters at once, e.g. a date window:
+    {"window": [{"start_date": "2024-01-01", "end_date": "2024-06-30"}, ...]}.
+    """
+    configs = []
+    for values in itertools.product(*grid.values()):
+        config = dict(base)
+        for key, value in zip(grid, values):
+            if isinstance(value, dict):
+                config.update(value)
+            else:
+                config[key] = value
+        configs.append(config)
+    return configs
+
+
+class SweepRowSink(ResultSink):
+    """
+    Stream a configuration's result rows, one per trading day with the Backtester's metrics as of that day, to a
+    Parquet file in batches of `batch_rows`, so memory use does not grow with the length of the backtest.
+    """
+
+    def __init__(self, config_id: int, config: dict[str, any], path: str | Path, batch_rows: int = 10_000):
+        self.config_id = config_id
+        self.config_json = json.dumps(config, sort_keys=True)
+        self.path = Path(path)
+        self._writer = pq.ParquetWriter(self.path, RESULT_SCHEMA)
+        self._rows = ColumnBuffer(RESULT_SCHEMA, self._writer.write_batch, batch_rows)
+
+    def write_day(self, rows: list[TickerRow], summary: DaySummary):
+        long_exposure, short_exposure = summary.long_exposure, summary.short_exposure
+        self._rows.append(
+            (
+                self.config_id,
+                self.config_json,
+                summary.date,
+                summary.total_value,
+                summary.return_pct,
+                long_exposure,
+                short_exposure,
+                long_exposure + short_exposure,
+                long_exposure - short_exposure,
+                long_exposure / short_exposure if short_exposure > 1e-9 else float("inf"),
+                summary.sharpe_ratio,
+                summary.sortino_ratio,
+                summary.max_drawdown,
+            )
+        )
+
+    def close(self):
+        self._rows.flush()
+        self._writer.close()
+
+
+def warm_cache(configs: list[dict[str, any]]) -> dict[tuple[str, str], Exception]:
+    """Fetch what every configuration's Backtester.prefetch_data will ask for, once per date window."""
+    windows: dict[tuple[str, str], set[str]] = {}
+    for config in configs:
+        windows.setdefault((config["start_date"], config["end_date"]), set()).update(config["tickers"])
+
+    failures = {}
+    for (start_date, end_date), tickers in sorted(windows.items()):
+        price_start_date = (datetime.strptime(end_date, "%Y-%m-%d") - relativedelta(years=1)).strftime("%Y-%m-%d")
+        failures.update(prefetch_universe(sorted(tickers), start_date=start_date, end_date=end_date, price_start_date=price_start_date))
+    return failures
+
+
+# The worker's read-only view of the shared store, whose held-back writes go to the parent with each result
+_worker_store: PersistentStore | None = None
+
+
+def _init_worker(store_path: str, data_mode: str, archive_dir: str | None):
+    """Point a worker process at the shared warmed store, read-only, and silence its progress output."""
+    global _worker_store
+    _worker_store = PersistentStore(store_path, read_only=True)
+    get_cache().set_store(_worker_store)
+    set_data_mode(data_mode, archive_dir)
+    # Results come back through SweepRowSink; the agents' progress display and log lines would interleave.
+    # Redirect the file descriptor rather than sys.stdout, so output from subprocesses is silenced too.
+    devnull = os.open(os.devnull, os.O_WRONLY)
+    os.dup2(devnull, sys.stdout.fileno())
+    os.close(devnull)
+
+
+def _run_config(config_id: int, config: dict[str, any], agent: Callable | None, parts_dir: str) -> tuple[str, list[tuple[str, str, any]]]:
+    """
+    Run one configuration, streaming its result rows to a Parquet part file in `parts_dir`; return the part's path
+    and the data it fetched beyond the warmed store.
+    """
+    from src.backtester import Backtester
+    from src.main import run_hedge_fund
+
+    sink = SweepRowSink(config_id, config, Path(parts_dir) / f"config_{config_id}.parquet")
+    Backtester(agent=agent or run_hedge_fund, result_sinks=[sink], **config).run_backtest()
+    return str(sink.path), _worker_store.take_writes()
+
+
+def run_sweep(
+    configs: list[dict[str, any]],
+    output: str | Path,
+    workers: int | None = None,
+    cache_dir: str | Path | None = None,
+    data_mode: str = "live",
+    archive_dir: str | None = None,
+    agent: Callable | None = None,
+) -> dict[int, Exception]:
+    """
+    Run every Backtester configuration (keyword arguments without `agent`) in a process pool and
+    write one Parquet row per (config, date) to `output` as configurations finish. Each worker streams
+    its rows to a part file of its own, which is appended to `output` batch by batch and then removed.
+
+    The data all configurations need is fetched once up front into the on-disk cache under
+    `cache_dir` (default FINANCIAL_DATA_CACHE_DIR, then .cache/financial_data); workers then open
+    that store read-only. Whatever else a worker fetches is sent back with its results and merged
+    into the store here, so later configurations find it. Returns the exceptions of failed
+    configurations by config id.
+
+    :param agent: Trading agent for every configuration, default run_hedge_fund. Must be picklable.
+    """
+    for config_id, config in enumerate(configs):
+        missing = [key for key in REQUIRED_KEYS if key not in config]
+        if missing:
+            raise ValueError(f"Config {config_id} is missing {', '.join(missing)}")
+
+    cache_dir = Path(cache_dir or os.environ.get("FINANCIAL_DATA_CACHE_DIR") or DEFAULT_CACHE_DIR)
+    store_path = cache_dir / CACHE_FILE_NAME
+    set_data_mode(data_mode, archive_dir)
+    store = PersistentStore(store_path)
+    get_cache().set_store(store)
+
+    print(f"Warming the data cache for {len(configs)} configurations...")
+    for (ticker, dataset), error in warm_cache(configs).items():
+        print(f"Warning: could not pre-fetch {dataset} for {ticker}: {error}")
+
+    workers = workers or os.cpu_count() or 1
+    print(f"Running {len(configs)} configurations with {workers} workers...")
+    failures: dict[int, Exception] = {}
+    output = Path(output)
+    output.parent.mkdir(parents=True, exist_ok=True)
+    # Spawned workers start clean instead of inheriting the parent's open SQLite connections and HTTP clients
+    context = multiprocessing.get_context("spawn")
+    with (
+        tempfile.TemporaryDirectory(dir=output.parent, prefix=f".{output.name}.") as parts_dir,
+        pq.ParquetWriter(output, RESULT_SCHEMA) as writer,
+        ProcessPoolExecutor(max_workers=workers, mp_context=context, initializer=_init_worker, initargs=(str(store_path), data_mode, archive_dir)) as executor,
+    ):
+        futures = {executor.submit(_run_config, config_id, config, agent, parts_dir): config_id for config_id, config in enumerate(configs)}
+        for done, future in enumerate(as_completed(futures), start=1):
+            config_id = futures[future]
+            try:
+                part, writes = future.result()
+            except Exception as e:
+                failures[config_id] = e
+                print(f"[{done}/{len(configs)}] config {config_id} failed: {e}")
+                continue
+            for dataset, key, entry in writes:
+                get_cache().merge_entry(dataset, key, entry)
+            for batch in pq.ParquetFile(part).iter_batches():
+                writer.write_batch(batch)
+            os.remove(part)
+            print(f"[{done}/{len(configs)}] config {config_id} done")
+
+    print(f"Results written to {output}")
+    return failures
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Run a grid of backtests in parallel")
+    parser.add_argument(
+        "--grid",
+        type=str,
+        required=True,
+        help='JSON file with "base" Backtester arguments and a "grid" of values to sweep, e.g. {"base": {"tickers": ["AAPL"], "initial_capital": 100000}, "grid": {"initial_margin_requirement": [0.0, 0.5], "window": [{"start_date": "2024-01-01", "end_date": "2024-03-31"}]}}',
+    )
+    parser.add_argument("--output", type=str, default="sweep_results.parquet", help="Parquet file for the daily results")
+    parser.add_argument("--workers", type=int, default=None, help="Worker processes (default: number of CPUs)")
+    parser.add_argument("--cache-dir", type=str, default=None, help="Directory of the shared data cache (default: FINANCIAL_DATA_CACHE_DIR, then .cache/financial_data)")
+    parser.add_argument("--data-mode", type=str, choices=DATA_MODES, default="live", help="Financial data source: live API, record live responses, or replay recorded ones")
+    parser.add_argument("--data-dir", type=str, default=None, help="Directory of recorded API responses (default: FINANCIAL_DATASETS_ARCHIVE_DIR, then .cache/api_archive)")
+    args = parser.parse_args()
+
+    with open(args.grid) as f:
+        spec = json.load(f)
+    configs = expand_grid(spec.get("base", {}), spec.get("grid", {}))
+    failures = run_sweep(configs, args.output, workers=args.workers, cache_dir=args.cache_dir, data_mode=args.data_mode, archive_dir=args.data_dir)
+    if failures:
+        sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,40 @@
+import numpy as np
+
+from src.backtesting.allocator import orders_for_targets, signal_scores, target_weights
+from src.backtesting.portfolio import ACTIONS, ArrayPortfolio
+from src.backtesting.signals import SignalStore
+
+
+def test_signal_scores_average_direction_times_confidence():
+    store = SignalStore()
+    store.put("2024-01-02", "AAPL", {"technical_analyst_agent": {"signal": "bullish", "confidence": 80}, "valuation_analyst_agent": {"signal": "bearish", "confidence": 20}})
+    store.put("2024-01-02", "MSFT", {"technical_analyst_agent": {"signal": "neutral", "confidence": 90}})
+
+    scores = signal_scores(store, ["2024-01-02", "2024-01-03"], ["AAPL", "MSFT"])
+
+    assert np.allclose(scores, [[0.3, 0.0], [0.0, 0.0]])
+
+
+def test_target_weights_respect_position_limit_and_gross_exposure():
+    scores = np.array([[1.0, -0.5, 0.05]])
+    weights = target_weights(scores, position_limit=0.2, min_score=0.1)
+    assert np.allclose(weights, [[0.2, -0.1, 0.0]])
+
+    crowded = target_weights(np.ones((1, 8)), position_limit=0.2)
+    assert np.isclose(np.abs(crowded).sum(), 1.0)
+    assert np.allclose(crowded, 0.125)
+
+
+def test_orders_move_positions_towards_targets():
+    portfolio = ArrayPortfolio(["AAPL", "MSFT", "NVDA"], 10_000.0)
+    prices = np.array([100.0, 50.0, 20.0])
+
+    actions, quantities = orders_for_targets(portfolio, np.array([0.2, -0.1, 0.0]), prices)
+    assert [ACTIONS[action] for action in actions] == ["buy", "short", "hold"]
+    assert quantities.tolist() == [20, 20, 0]
+    portfolio.execute_orders(actions, quantities, prices)
+
+    # A long position that flips to short is only closed on the first day
+    actions, quantities = orders_for_targets(portfolio, np.array([-0.2, -0.1, 0.0]), prices)
+    assert [ACTIONS[action] for action in actions] == ["sell", "hold", "hold"]
+    assert quantities.tolist() == [20, 0, 0]
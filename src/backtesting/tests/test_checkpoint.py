@@ -0,0 +1,87 @@
+import pickle
+
+from src.backtesting.checkpoint import BacktestCheckpoint, checkpoint_fingerprint
+from src.backtesting.portfolio import ArrayPortfolio
+from src.backtesting.results import ResultSink
+from src.backtester import Backtester
+
+
+def test_checkpoint_round_trips_state_and_ignores_other_versions(tmp_path):
+    checkpoint = BacktestCheckpoint(tmp_path / "run.pkl")
+    assert checkpoint.load() is None
+
+    portfolio = ArrayPortfolio(["AAPL"], 1_000.0)
+    portfolio.execute_trade("AAPL", "buy", 3, 10.0)
+    checkpoint.save({"last_date": "2024-01-05", "portfolio": portfolio})
+
+    state = checkpoint.load()
+    assert state["last_date"] == "2024-01-05"
+    assert state["portfolio"].to_dict() == portfolio.to_dict()
+    assert list(tmp_path.iterdir()) == [tmp_path / "run.pkl"]
+
+    with open(tmp_path / "run.pkl", "wb") as f:
+        pickle.dump({"version": -1, "last_date": "2024-01-05"}, f)
+    assert checkpoint.load() is None
+
+
+def test_fingerprint_depends_on_every_setting():
+    settings = {"tickers": ["AAPL"], "start_date": "2024-01-01", "margin_requirement": 0.5}
+    assert checkpoint_fingerprint(settings) == checkpoint_fingerprint(dict(reversed(settings.items())))
+    assert checkpoint_fingerprint(settings) != checkpoint_fingerprint({**settings, "margin_requirement": 0.0})
+
+
+class _Panel:
+    def latest(self, field, date, lookback_days=1):
+        return {"AAPL": 100.0}
+
+
+class _Sink(ResultSink):
+    def __init__(self):
+        self.days = []
+
+    def write_day(self, rows, summary):
+        self.days.append((summary.date, [row.ticker for row in rows]))
+
+
+def _backtester(checkpoint_dir, sink, fail_on=None, **settings):
+    def agent(**kwargs):
+        if kwargs["end_date"] == fail_on:
+            raise KeyboardInterrupt
+        return {"decisions": {"AAPL": {"action": "hold", "quantity": 0}}, "analyst_signals": {}}
+
+    backtester = Backtester(agent=agent, tickers=["AAPL"], start_date="2024-01-01", end_date="2024-01-10", initial_capital=1_000.0, checkpoint_dir=str(checkpoint_dir), result_sinks=[sink], **settings)
+    backtester.prefetch_data = lambda: setattr(backtester, "price_panel", _Panel())
+    return backtester
+
+
+def test_rerunning_a_finished_backtest_replays_its_results_to_the_sinks(tmp_path):
+    first = _Sink()
+    _backtester(tmp_path, first).run_backtest()
+    assert len(first.days) == 8
+
+    again = _Sink()
+    _backtester(tmp_path, again).run_backtest()
+    assert again.days == first.days
+
+    # A two-phase run of the same window keeps its own checkpoint
+    assert _backtester(tmp_path, _Sink(), two_phase=True)._checkpoint().path != _backtester(tmp_path, _Sink())._checkpoint().path
+
+
+def test_an_interrupted_backtest_resumes_without_repeating_days(tmp_path):
+    first = _Sink()
+    try:
+        _backtester(tmp_path, first, checkpoint_every=3, fail_on="2024-01-10").run_backtest()
+    except KeyboardInterrupt:
+        pass
+    # Days past the last checkpoint were appended to the side file, but are not part of the checkpoint
+    checkpoint = _backtester(tmp_path, _Sink())._checkpoint()
+    state = checkpoint.load()
+    assert state["last_date"] == "2024-01-08"
+    assert "day_results" not in state
+    assert checkpoint.days_path.stat().st_size > state["days_size"]
+
+    resumed = _Sink()
+    _backtester(tmp_path, resumed).run_backtest()
+    uninterrupted = _Sink()
+    _backtester(tmp_path / "fresh", uninterrupted).run_backtest()
+    assert resumed.days == uninterrupted.days
@@ -0,0 +1,63 @@
+import numpy as np
+import pandas as pd
+import pyarrow.parquet as pq
+
+from src.backtesting.intraday import BarWindow, IntradayBacktester
+
+
+def _momentum(prices_df: pd.DataFrame) -> dict:
+    rising = prices_df["close"].iloc[-1] > prices_df["close"].iloc[0]
+    return {"signal": "bullish" if rising else "bearish", "confidence": 100}
+
+
+def _write_bars(path, tickers: list[str], minutes: int):
+    times = pd.date_range("2024-01-01", periods=minutes, freq="1min")
+    frames = []
+    for k, ticker in enumerate(tickers):
+        close = 100.0 + (1 if k % 2 == 0 else -1) * np.arange(minutes) * 0.1
+        frames.append(pd.DataFrame({"datetime": times, "ticker": ticker, "open": close, "high": close, "low": close, "close": close, "volume": 1.0}))
+    pd.concat(frames).sort_values("datetime", kind="stable").to_parquet(path, index=False)
+
+
+def test_bar_window_keeps_the_most_recent_bars_in_order():
+    window = BarWindow(4)
+    times = np.arange(7, dtype=np.int64) * 60_000
+    values = np.repeat(np.arange(7.0)[:, None], 5, axis=1)
+
+    window.extend(times[:3], values[:3])
+    assert window.frame()["close"].tolist() == [0.0, 1.0, 2.0]
+    window.extend(times[3:6], values[3:6])
+    assert window.frame()["close"].tolist() == [2.0, 3.0, 4.0, 5.0]
+    window.extend(times[6:], values[6:])
+    assert window.frame()["close"].tolist() == [3.0, 4.0, 5.0, 6.0]
+    assert window.frame().index[-1] == pd.Timestamp("1970-01-01 00:06")
+
+
+def test_decides_once_per_period_regardless_of_batch_size(tmp_path):
+    bars = tmp_path / "bars.parquet"
+    _write_bars(bars, ["BTC", "ETH"], minutes=120)
+
+    summaries = []
+    for batch_rows in (7, 10_000):
+        backtester = IntradayBacktester(bars, ["BTC", "ETH"], 10_000.0, cadence="15min", window=10, margin_requirement=0.5, analysts={"momentum": _momentum}, batch_rows=batch_rows, equity_path=tmp_path / f"equity_{batch_rows}.parquet")
+        summaries.append(backtester.run())
+
+    assert summaries[0] == summaries[1]
+    assert summaries[0]["bars"] == 240
+    assert summaries[0]["decisions"] == 8
+    # The rising ticker ends up long and the falling one short, each at the position limit
+    assert backtester.portfolio.long[0] > 0 and backtester.portfolio.short[1] > 0
+    equity = pq.read_table(tmp_path / "equity_7.parquet").to_pandas()
+    assert len(equity) == 8
+    assert equity["trades"].sum() == summaries[0]["trades"]
+
+
+def test_single_ticker_files_need_no_ticker_column(tmp_path):
+    times = pd.date_range("2024-01-01", periods=60, freq="1min")
+    close = np.linspace(100, 110, 60)
+    pd.DataFrame({"timestamp": (times - pd.Timestamp(0)) // pd.Timedelta(milliseconds=1), "open": close, "high": close, "low": close, "close": close, "volume": 1.0}).to_parquet(tmp_path / "btc.parquet", index=False)
+
+    summary = IntradayBacktester(tmp_path / "btc.parquet", ["BTC"], 1_000.0, cadence="10min", window=5, analysts={"momentum": _momentum}, time_column="timestamp").run()
+
+    assert summary["decisions"] == 6
+    assert summary["return_pct"] > 0
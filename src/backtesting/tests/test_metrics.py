@@ -0,0 +1,57 @@
+import numpy as np
+import pandas as pd
+
+from src.backtesting.metrics import RISK_FREE_RATE, TRADING_DAYS_PER_YEAR, OnlineMetrics
+
+
+def _batch_metrics(values: list[float], dates: list) -> tuple[float, float, float]:
+    series = pd.Series(values, index=dates)
+    excess_returns = series.pct_change().dropna() - RISK_FREE_RATE / TRADING_DAYS_PER_YEAR
+    sharpe = np.sqrt(TRADING_DAYS_PER_YEAR) * excess_returns.mean() / excess_returns.std()
+    sortino = np.sqrt(TRADING_DAYS_PER_YEAR) * excess_returns.mean() / excess_returns[excess_returns < 0].std()
+    drawdown = (series - series.cummax()) / series.cummax()
+    return sharpe, sortino, drawdown.min() * 100, drawdown.idxmin()
+
+
+def test_matches_batch_computation():
+    rng = np.random.default_rng(7)
+    values = list(100_000 * np.cumprod(1 + rng.normal(0.0005, 0.01, 250)))
+    dates = list(pd.bdate_range("2024-01-01", periods=len(values)))
+
+    metrics = OnlineMetrics()
+    for date, value in zip(dates, values):
+        metrics.update(date, value)
+
+    sharpe, sortino, max_drawdown, max_drawdown_date = _batch_metrics(values, dates)
+    assert metrics.num_returns == len(values) - 1
+    assert np.isclose(metrics.sharpe_ratio, sharpe)
+    assert np.isclose(metrics.sortino_ratio, sortino)
+    assert np.isclose(metrics.max_drawdown, max_drawdown)
+    assert metrics.max_drawdown_date == max_drawdown_date
+
+
+def test_rolling_window_matches_batch_over_the_last_returns():
+    rng = np.random.default_rng(11)
+    values = list(100 * np.cumprod(1 + rng.normal(0, 0.01, 120)))
+    window = 20
+
+    metrics = OnlineMetrics(window=window)
+    for i, value in enumerate(values):
+        metrics.update(i, value)
+        if i > window:
+            recent = values[i - window : i + 1]
+            sharpe, sortino, _, _ = _batch_metrics(recent, list(range(len(recent))))
+            assert np.isclose(metrics.rolling_sharpe_ratio, sharpe)
+            assert np.isclose(metrics.rolling_sortino_ratio, sortino)
+            assert np.isclose(metrics.rolling_drawdown, (value - max(recent)) / max(recent) * 100)
+
+
+def test_no_losses_gives_infinite_sortino_and_no_drawdown():
+    metrics = OnlineMetrics()
+    for day, value in enumerate([100.0, 101.0, 103.0, 104.0]):
+        metrics.update(day, value)
+
+    assert metrics.sortino_ratio == float("inf")
+    assert metrics.max_drawdown == 0.0
+    assert metrics.max_drawdown_date is None
+    assert metrics.rolling_sharpe_ratio is None
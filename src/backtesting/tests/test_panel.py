@@ -0,0 +1,39 @@
+import pandas as pd
+
+from src.backtesting.panel import PricePanel
+
+
+def _frame(days: list[str], closes: list[float]) -> pd.DataFrame:
+    index = pd.DatetimeIndex(pd.to_datetime([f"{day}T05:00:00Z" for day in days]), name="Date")
+    return pd.DataFrame({"open": closes, "close": closes, "high": closes, "low": closes, "volume": [100] * len(days)}, index=index)
+
+
+def test_latest_falls_back_to_the_previous_day_per_ticker():
+    frames = {
+        "AAPL": _frame(["2024-01-02", "2024-01-03", "2024-01-04"], [10.0, 11.0, 12.0]),
+        "MSFT": _frame(["2024-01-02", "2024-01-03"], [20.0, 21.0]),
+    }
+    errors = []
+    panel = PricePanel.load(["AAPL", "MSFT", "FAIL"], "2024-01-01", "2024-01-05", fetch=lambda ticker, *_: frames[ticker], on_error=lambda ticker, e: errors.append(ticker))
+
+    assert errors == ["FAIL"]
+    assert panel.fields["close"].shape == (3, 3)
+    assert panel.latest("close", "2024-01-03") == {"AAPL": 11.0, "MSFT": 21.0}
+    # MSFT has no bar on the 4th, so its bar from the day before is used
+    assert panel.latest("close", "2024-01-04") == {"AAPL": 12.0, "MSFT": 21.0}
+    assert panel.latest("close", "2024-01-06") == {}
+
+
+def test_asof_matches_latest_for_every_day():
+    frames = {
+        "AAPL": _frame(["2024-01-02", "2024-01-03", "2024-01-05", "2024-01-08"], [10.0, 11.0, 12.0, 13.0]),
+        "MSFT": _frame(["2024-01-03", "2024-01-04"], [20.0, 21.0]),
+    }
+    panel = PricePanel.load(["AAPL", "MSFT"], "2024-01-01", "2024-01-09", fetch=lambda ticker, *_: frames[ticker])
+    days = [day.strftime("%Y-%m-%d") for day in pd.date_range("2024-01-01", "2024-01-09")]
+
+    closes = panel.asof("close", days, lookback_days=1)
+
+    for row, day in zip(closes, days):
+        latest = panel.latest("close", day, lookback_days=1)
+        assert {ticker: value for ticker, value in zip(panel.tickers, row.tolist()) if value == value} == latest
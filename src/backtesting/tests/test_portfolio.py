@@ -0,0 +1,52 @@
+import random
+
+import numpy as np
+
+from src.backtesting.portfolio import ArrayPortfolio
+
+
+def _assert_same_state(a: ArrayPortfolio, b: ArrayPortfolio):
+    assert np.isclose(a.cash, b.cash)
+    assert np.isclose(a.margin_used, b.margin_used)
+    for field in ("long", "short", "long_cost_basis", "short_cost_basis", "short_margin_used", "realized_long", "realized_short"):
+        assert np.allclose(getattr(a, field), getattr(b, field)), field
+
+
+def test_batch_matches_sequential_trades():
+    rng = random.Random(3)
+    tickers = [f"T{i}" for i in range(8)]
+    batch = ArrayPortfolio(tickers, 20_000.0, 0.5)
+    sequential = ArrayPortfolio(tickers, 20_000.0, 0.5)
+
+    for _ in range(30):
+        prices = {ticker: rng.uniform(5, 200) for ticker in tickers}
+        decisions = {ticker: {"action": rng.choice(["buy", "sell", "short", "cover", "hold"]), "quantity": rng.choice([0, 1, 5, 40, 2.5])} for ticker in tickers}
+
+        executed = batch.execute_trades(decisions, batch.prices_array(prices))
+        expected = [sequential.execute_trade(ticker, decisions[ticker]["action"], decisions[ticker]["quantity"], prices[ticker]) for ticker in tickers]
+
+        assert executed.tolist() == expected
+        _assert_same_state(batch, sequential)
+
+
+def test_buys_are_filled_in_ticker_order_until_cash_runs_out():
+    portfolio = ArrayPortfolio(["AAPL", "MSFT"], 1_000.0)
+    prices = portfolio.prices_array({"AAPL": 100.0, "MSFT": 100.0})
+
+    executed = portfolio.execute_trades({"AAPL": {"action": "buy", "quantity": 7}, "MSFT": {"action": "buy", "quantity": 7}}, prices)
+
+    assert executed.tolist() == [7, 3]
+    assert portfolio.cash == 0.0
+    assert portfolio.exposures(prices) == (1_000.0, 0.0)
+
+
+def test_dict_view_uses_plain_numbers():
+    portfolio = ArrayPortfolio(["AAPL"], 1_000.0, 0.5)
+    portfolio.execute_trade("AAPL", "short", 4, 50.0)
+
+    view = portfolio.to_dict()
+
+    assert view["positions"]["AAPL"] == {"long": 0, "short": 4, "long_cost_basis": 0.0, "short_cost_basis": 50.0, "short_margin_used": 100.0}
+    assert type(view["positions"]["AAPL"]["short"]) is int
+    assert view["cash"] == 1_100.0
+    assert portfolio.total_value(portfolio.prices_array({"AAPL": 40.0})) == 940.0
@@ -0,0 +1,66 @@
+import pandas as pd
+import pytest
+
+from src.backtesting.results import DaySummary, FileSink, ResultSink, TerminalSink, TickerRow
+from src.utils.display import format_backtest_row, print_backtest_results
+
+
+def _day(date: str, value: float) -> tuple[list[TickerRow], DaySummary]:
+    rows = [TickerRow(date, ticker, "buy", 2, 10.0, 2, 20.0, 1, 0, 2) for ticker in ("AAPL", "MSFT")]
+    return rows, DaySummary(date, value, value - 100.0, 60.0, value - 60.0, 40.0, 0.0, None, None, -1.5)
+
+
+@pytest.mark.parametrize("file_format", ["parquet", "arrow"])
+def test_file_sink_streams_rows_and_days_in_batches(tmp_path, file_format):
+    sink = FileSink(tmp_path, file_format, batch_rows=3)
+    for date, value in [("2024-01-02", 100.0), ("2024-01-03", 101.0), ("2024-01-04", 99.5)]:
+        sink.write_day(*_day(date, value))
+    sink.close()
+
+    read = pd.read_parquet if file_format == "parquet" else pd.read_feather
+    rows = read(tmp_path / f"rows.{file_format}")
+    days = read(tmp_path / f"days.{file_format}")
+
+    assert len(rows) == 6
+    assert rows["ticker"].tolist() == ["AAPL", "MSFT"] * 3
+    assert rows["quantity"].sum() == 12
+    assert days["total_value"].tolist() == [100.0, 101.0, 99.5]
+    assert str(days["date"].iloc[-1]) == "2024-01-04"
+    assert days["sharpe_ratio"].isna().all()
+
+
+def test_file_sink_rejects_unknown_formats(tmp_path):
+    with pytest.raises(ValueError):
+        FileSink(tmp_path, "csv")
+
+
+def test_terminal_sink_keeps_only_recent_days(monkeypatch):
+    shown = []
+    monkeypatch.setattr("src.backtesting.results.print_backtest_results", lambda rows, summary: shown.append((len(rows), summary.date)))
+    sink = TerminalSink(max_days=2)
+
+    for date in ["2024-01-02", "2024-01-03", "2024-01-04"]:
+        sink.write_day(*_day(date, 100.0))
+
+    assert shown == [(2, "2024-01-02"), (4, "2024-01-03"), (4, "2024-01-04")]
+
+
+def test_result_sinks_must_implement_write_day():
+    class Incomplete(ResultSink):
+        pass
+
+    with pytest.raises(TypeError):
+        Incomplete()
+
+
+def test_legacy_summary_rows_are_still_printed(monkeypatch, capsys):
+    monkeypatch.setattr("os.system", lambda command: 0)
+    rows = [
+        format_backtest_row("2024-01-02", "AAPL", "buy", 2, 10.0, 2, 20.0, 1, 0, 2),
+        format_backtest_row("2024-01-02", "", "", 0, 0, 0, 0, 0, 0, 0, is_summary=True, total_value=100.0, return_pct=1.5, cash_balance=80.0, total_position_value=20.0, sharpe_ratio=1.2, sortino_ratio=None, max_drawdown=-3.0),
+    ]
+    print_backtest_results(rows)
+
+    out = capsys.readouterr().out
+    assert "Total Value: " in out and "$100.00" in out and "Sharpe Ratio" in out
+    assert out.count("PORTFOLIO SUMMARY") == 1
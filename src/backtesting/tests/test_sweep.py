@@ -0,0 +1,40 @@
+import json
+
+import pandas as pd
+import pyarrow.parquet as pq
+
+from src.backtesting.results import DaySummary
+from src.backtesting.sweep import SweepRowSink, expand_grid
+
+
+def test_expand_grid_combines_values_and_merges_dict_values():
+    configs = expand_grid(
+        {"tickers": ["AAPL"], "initial_capital": 1000.0},
+        {
+            "initial_margin_requirement": [0.0, 0.5],
+            "window": [{"start_date": "2024-01-01", "end_date": "2024-01-31"}, {"start_date": "2024-02-01", "end_date": "2024-02-29"}],
+        },
+    )
+
+    assert len(configs) == 4
+    assert configs[1] == {"tickers": ["AAPL"], "initial_capital": 1000.0, "initial_margin_requirement": 0.0, "start_date": "2024-02-01", "end_date": "2024-02-29"}
+    assert all("window" not in config for config in configs)
+
+
+def test_sweep_rows_carry_the_backtesters_metrics_as_of_each_day(tmp_path):
+    config = {"tickers": ["AAPL"], "initial_capital": 100.0}
+    sink = SweepRowSink(3, config, tmp_path / "part.parquet", batch_rows=3)
+    dates = pd.bdate_range("2024-01-01", periods=4)
+    metrics = [(None, None, None), (None, None, None), (1.5, 2.0, -10.0), (1.2, 1.8, -10.0)]
+    for date, value, short, (sharpe, sortino, drawdown) in zip(dates, [100.0, 110.0, 99.0, 105.0], [0.0, 0.0, 0.0, 50.0], metrics):
+        sink.write_day([], DaySummary(date.strftime("%Y-%m-%d"), value, (value / 100.0 - 1) * 100, 0.0, value, value, short, sharpe, sortino, drawdown))
+
+    sink.close()
+
+    rows = pq.read_table(tmp_path / "part.parquet").to_pylist()
+    assert [row["date"] for row in rows] == [date.date() for date in dates]
+    assert [(row["sharpe_ratio"], row["sortino_ratio"], row["max_drawdown"]) for row in rows] == metrics
+    assert round(rows[3]["return_pct"], 9) == 5.0
+    assert rows[0]["long_short_ratio"] == float("inf") and rows[3]["long_short_ratio"] == 2.1
+    assert rows[3]["gross_exposure"] == 155.0 and rows[3]["net_exposure"] == 55.0
+    assert json.loads(rows[3]["config"]) == config
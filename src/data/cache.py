@@ -1,12 +1,268 @@
+import json
+import os
+import sqlite3
+import threading
+import time
+from bisect import bisect_left, bisect_right
+from collections.abc import Callable
+from datetime import date, timedelta
+from pathlib import Path
+
+import numpy as np
+import pandas as pd
+
+from src.data.stats import get_stats
+
+# Time-to-live per dataset in seconds. ``None`` means entries never expire: prices, filings and news
+# are only persisted for completed days (see Cache._set), while metrics and line items keep changing.
+DEFAULT_TTLS: dict[str, float | None] = {
+    "prices": None,
+    "financial_metrics": 24 * 60 * 60,
+    "line_items": 24 * 60 * 60,
+    "insider_trades": None,
+    "company_news": None,
+}
+
+# Field that identifies a row, and dates the rows of series stored by date range, per dataset
+KEY_FIELDS = {
+    "prices": "time",
+    "financial_metrics": "report_period",
+    "line_items": "report_period",
+    "insider_trades": "filing_date",  # Could also use transaction_date if preferred
+    "company_news": "date",
+}
+
+DEFAULT_MAX_BYTES = 1024 * 1024 * 1024  # 1 GiB
+
+# Seconds a fetched range that reaches today counts as covering today, after which today is fetched again
+OPEN_DAY_TTL = 5 * 60
+
+# Name of the SQLite file inside a cache directory
+CACHE_FILE_NAME = "api_cache.sqlite"
+
+# Numeric price fields held as columns and returned by get_price_frame
+PRICE_COLUMNS = {"open": np.float64, "close": np.float64, "high": np.float64, "low": np.float64, "volume": np.int64}
+
+
+class PersistentStore:
+    """SQLite-backed store for cached API responses with per-dataset TTLs and LRU eviction."""
+
+    def __init__(
+        self,
+        path: str | Path,
+        max_bytes: int = DEFAULT_MAX_BYTES,
+        ttls: dict[str, float | None] | None = None,
+        read_only: bool = False,
+    ):
+        """
+        :param path: Location of the SQLite database file.
+        :param max_bytes: Byte budget for stored payloads. Least recently used entries are evicted beyond it.
+        :param ttls: Per-dataset TTL overrides in seconds (see DEFAULT_TTLS).
+        :param read_only: Open an existing store without ever writing to it, so many processes can share it.
+            Writes are held back for take_writes, so a single writer can apply them, and expired entries are
+            skipped but kept.
+        """
+        self.path = Path(path)
+        self.max_bytes = max_bytes
+        self.ttls = {**DEFAULT_TTLS, **(ttls or {})}
+        self.read_only = read_only
+        self._lock = threading.Lock()
+        self._held_writes: dict[tuple[str, str], any] = {}
+        if read_only:
+            self._conn = sqlite3.connect(f"{self.path.resolve().as_uri()}?mode=ro", uri=True, check_same_thread=False, isolation_level=None)
+            return
+
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        self._conn = sqlite3.connect(self.path, check_same_thread=False, isolation_level=None)
+        self._conn.execute("PRAGMA journal_mode=WAL")
+        self._conn.execute(
+            """
+            CREATE TABLE IF NOT EXISTS entries (
+                dataset TEXT NOT NULL,
+                key TEXT NOT NULL,
+                data TEXT NOT NULL,
+                size INTEGER NOT NULL,
+                created_at REAL NOT NULL,
+                accessed_at REAL NOT NULL,
+                PRIMARY KEY (dataset, key)
+            )
+            """
+        )
+        self._conn.execute("CREATE INDEX IF NOT EXISTS entries_accessed_at ON entries (accessed_at)")
+
+    def get(self, dataset: str, key: str) -> any:
+        """Return the stored payload, or None if it is missing or has expired."""
+        now = time.time()
+        with self._lock:
+            row = self._conn.execute("SELECT data, created_at FROM entries WHERE dataset = ? AND key = ?", (dataset, key)).fetchone()
+            if row is None:
+                return None
+
+            data, created_at = row
+            ttl = self.ttls.get(dataset)
+            if ttl is not None and now - created_at > ttl:
+                if not self.read_only:
+                    self._conn.execute("DELETE FROM entries WHERE dataset = ? AND key = ?", (dataset, key))
+                return None
+
+            if not self.read_only:
+                self._conn.execute("UPDATE entries SET accessed_at = ? WHERE dataset = ? AND key = ?", (now, dataset, key))
+        return json.loads(data)
+
+    def set(self, dataset: str, key: str, data: any):
+        """Store a payload, replacing any previous value, and evict entries beyond the byte budget."""
+        if self.read_only:
+            with self._lock:
+                self._held_writes[(dataset, key)] = data
+            return
+        payload = json.dumps(data)
+        now = time.time()
+        with self._lock:
+            self._conn.execute(
+                "INSERT OR REPLACE INTO entries (dataset, key, data, size, created_at, accessed_at) VALUES (?, ?, ?, ?, ?, ?)",
+                (dataset, key, payload, len(payload), now, now),
+            )
+            self._evict()
+        get_stats().record_written(dataset, len(payload))
+
+    def take_writes(self) -> list[tuple[str, str, any]]:
+        """Return and forget the (dataset, key, payload) writes a read-only store held back."""
+        with self._lock:
+            writes = [(dataset, key, data) for (dataset, key), data in self._held_writes.items()]
+            self._held_writes.clear()
+        return writes
+
+    def total_bytes(self) -> int:
+        """Total size of all stored payloads."""
+        with self._lock:
+            return self._conn.execute("SELECT COALESCE(SUM(size), 0) FROM entries").fetchone()[0]
+
+    def dataset_bytes(self) -> dict[str, int]:
+        """Size of the stored payloads of each dataset."""
+        with self._lock:
+            return dict(self._conn.execute("SELECT dataset, SUM(size) FROM entries GROUP BY dataset").fetchall())
+
+    def clear(self, dataset: str | None = None):
+        """Remove every entry, or only the entries of one dataset."""
+        if self.read_only:
+            return
+        with self._lock:
+            if dataset is None:
+                self._conn.execute("DELETE FROM entries")
+            else:
+                self._conn.execute("DELETE FROM entries WHERE dataset = ?", (dataset,))
+
+    def _evict(self):
+        """Drop least recently used entries until the store fits in its byte budget. Caller holds the lock."""
+        total = self._conn.execute("SELECT COALESCE(SUM(size), 0) FROM entries").fetchone()[0]
+        if total <= self.max_bytes:
+            return
+
+        for dataset, key, size in self._conn.execute("SELECT dataset, key, size FROM entries ORDER BY accessed_at ASC").fetchall():
+            if total <= self.max_bytes:
+                break
+            self._conn.execute("DELETE FROM entries WHERE dataset = ? AND key = ?", (dataset, key))
+            total -= size
+            get_stats().record_evictions(dataset)
+
+
+def _next_day(day: str) -> str:
+    return (date.fromisoformat(day) + timedelta(days=1)).isoformat()
+
+
+def _previous_day(day: str) -> str:
+    return (date.fromisoformat(day) - timedelta(days=1)).isoformat()
+
+
+def last_completed_day() -> str:
+    """The most recent day whose prices, filings and news can no longer change."""
+    return _previous_day(date.today().isoformat())
+
+
+def clip_ranges(ranges: list[tuple[str, str]], last_day: str) -> list[tuple[str, str]]:
+    """Cut sorted, disjoint date ranges off after `last_day`."""
+    return [(start, min(end, last_day)) for start, end in ranges if start <= last_day]
+
+
+def _open_day_expired(meta: dict) -> bool:
+    """Whether the entry's coverage of a day that was still open when fetched, if any, has gone stale."""
+    open_day = meta.get("open_day")
+    return open_day is not None and (open_day != date.today().isoformat() or time.time() - meta["open_day_fetched_at"] > OPEN_DAY_TTL)
+
+
+def _covered_ranges(meta: dict) -> list[tuple[str, str]]:
+    """The entry's fetched date ranges, less the day that was still open once its coverage has gone stale."""
+    ranges = [tuple(r) for r in meta.get("ranges", [])]
+    if _open_day_expired(meta):
+        ranges = clip_ranges(ranges, _previous_day(meta["open_day"]))
+    return ranges
+
+
+def _dedupe_rows(rows: list[dict]) -> list[dict]:
+    """Drop exact duplicate rows, e.g. from overlapping pages, keeping the first occurrence."""
+    return list({json.dumps(row, sort_keys=True): row for row in rows}.values())
+
+
+def merge_ranges(ranges: list[tuple[str, str]]) -> list[tuple[str, str]]:
+    """Merge overlapping or adjacent inclusive date ranges (YYYY-MM-DD) into a sorted, disjoint list."""
+    merged: list[tuple[str, str]] = []
+    for start, end in sorted(ranges):
+        if merged and start <= _next_day(merged[-1][1]):
+            merged[-1] = (merged[-1][0], max(merged[-1][1], end))
+        else:
+            merged.append((start, end))
+    return merged
+
+
+def missing_ranges(covered: list[tuple[str, str]], start: str, end: str) -> list[tuple[str, str]]:
+    """Return the parts of the inclusive range [start, end] that are not in the sorted, disjoint `covered` ranges."""
+    gaps = []
+    cursor = start
+    for covered_start, covered_end in covered:
+        if covered_end < cursor:
+            continue
+        if covered_start > end:
+            break
+        if covered_start > cursor:
+            gaps.append((cursor, _previous_day(covered_start)))
+        cursor = max(cursor, _next_day(covered_end))
+        if cursor > end:
+            return gaps
+    if cursor <= end:
+        gaps.append((cursor, end))
+    return gaps
+
+
 class Cache:
-    """In-memory cache for API responses."""
+    """In-memory cache for API responses, optionally backed by a persistent on-disk store."""
 
-    def __init__(self):
+    def __init__(self, store: PersistentStore | None = None, store_factory: Callable[[], PersistentStore | None] | None = None):
+        """
+        :param store: Persistent tier to read through and write through to.
+        :param store_factory: Builds the persistent tier on first use, so configuration loaded after import is honoured.
+        """
+        self._store = store
+        self._store_factory = store_factory
+        self._store_lock = threading.Lock()
+        # Guards the in-memory tier: _set is a read-modify-write, and callers run on many threads
+        self._lock = threading.RLock()
         self._prices_cache: dict[str, list[dict[str, any]]] = {}
         self._financial_metrics_cache: dict[str, list[dict[str, any]]] = {}
         self._line_items_cache: dict[str, list[dict[str, any]]] = {}
         self._insider_trades_cache: dict[str, list[dict[str, any]]] = {}
         self._company_news_cache: dict[str, list[dict[str, any]]] = {}
+        self._datasets = {
+            "prices": self._prices_cache,
+            "financial_metrics": self._financial_metrics_cache,
+            "line_items": self._line_items_cache,
+            "insider_trades": self._insider_trades_cache,
+            "company_news": self._company_news_cache,
+        }
+        # Per-entry bookkeeping: "ranges" holds the date ranges already fetched for series stored per ticker,
+        # "fields" holds the line items already fetched for a line item query
+        self._meta: dict[str, dict[str, dict[str, list]]] = {dataset: {} for dataset in self._datasets}
+        # Read-only column arrays per ticker, built from the cached price rows on first frame lookup
+        self._price_columns: dict[str, dict[str, any]] = {}
 
     def _merge_data(self, existing: list[dict] | None, new_data: list[dict], key_field: str) -> list[dict]:
         """Merge existing and new data, avoiding duplicates based on a key field."""
@@ -21,49 +277,271 @@ class Cache:
         merged.extend([item for item in new_data if item[key_field] not in existing_keys])
         return merged
 
+    def _merge_fields(self, existing: list[dict] | None, new_data: list[dict], key_field: str) -> list[dict]:
+        """Merge existing and new data, combining the fields of items that share a key field."""
+        merged = {item[key_field]: dict(item) for item in existing or []}
+        for item in new_data:
+            merged.setdefault(item[key_field], {}).update(item)
+        return list(merged.values())
+
+    def _get_store(self) -> PersistentStore | None:
+        """Return the persistent tier, building it on first use."""
+        if self._store_factory is not None:
+            with self._store_lock:
+                if self._store_factory is not None:
+                    self._store = self._store_factory()
+                    self._store_factory = None
+        return self._store
+
+    def set_store(self, store: PersistentStore | None):
+        """Replace the persistent tier, or drop it with None. Entries already in memory are kept."""
+        with self._store_lock:
+            self._store = store
+            self._store_factory = None
+
+    def _get(self, dataset: str, key: str) -> list[dict[str, any]] | None:
+        """Look up the in-memory tier first, then fall back to the persistent store."""
+        memory = self._datasets[dataset]
+        with self._lock:
+            if key in memory:
+                return memory[key]
+
+            store = self._get_store()
+            if store is None:
+                return None
+
+            # Rows and their bookkeeping are persisted as one entry so they expire and get evicted together
+            entry = store.get(dataset, key)
+            if entry is None:
+                return None
+            memory[key] = entry.pop("rows")
+            self._meta[dataset][key] = entry
+            return memory[key]
+
+    def _set(
+        self,
+        dataset: str,
+        key: str,
+        data: list[dict[str, any]],
+        key_field: str,
+        covered: tuple[str, str] | None = None,
+        fields: list[str] | None = None,
+        persist: bool = True,
+    ):
+        """
+        Merge new data into both tiers.
+        `covered` is the date range the data was fetched for: it replaces previously cached rows in that range
+        and is recorded as fetched. `fields` records the line items the data was fetched with.
+        `persist=False` keeps the data in memory only.
+        """
+        # Merging and writing both tiers under one lock, so concurrent merges for a key never drop rows
+        with self._lock:
+            existing = self._get(dataset, key)
+            meta = dict(self._meta[dataset].get(key, {}))
+            if fields is not None:
+                merged = self._merge_fields(existing, data, key_field=key_field)
+                meta["fields"] = sorted(set(meta.get("fields", [])) | set(fields))
+            elif covered is not None:
+                start, end = covered
+                kept = [item for item in existing or [] if not start <= item[key_field][:10] <= end]
+                merged = sorted(kept + _dedupe_rows(data), key=lambda item: item[key_field])
+                meta["ranges"] = merge_ranges([*_covered_ranges(meta), covered])
+                if _open_day_expired(meta):
+                    del meta["open_day"], meta["open_day_fetched_at"]
+                # Today's rows may still change: its coverage holds in memory for OPEN_DAY_TTL only
+                today = date.today().isoformat()
+                if end >= today:
+                    meta["open_day"], meta["open_day_fetched_at"] = today, time.time()
+            else:
+                merged = self._merge_data(existing, data, key_field=key_field)
+                # Series served by date range must stay sorted for _get_range's bisect
+                if dataset == "prices" or "ranges" in meta:
+                    merged = sorted(merged, key=lambda item: item[key_field])
+
+            self._datasets[dataset][key] = merged
+            self._meta[dataset][key] = meta
+            if dataset == "prices":
+                self._price_columns.pop(key, None)
+            store = self._get_store()
+            if store is not None and persist:
+                # Today's bars, filings and news may still change: persist coverage only up to the last
+                # completed day, so the next process re-fetches just the tail instead of the whole window
+                persisted = {name: value for name, value in meta.items() if name not in ("open_day", "open_day_fetched_at")}
+                if "ranges" in persisted:
+                    persisted["ranges"] = clip_ranges(persisted["ranges"], last_completed_day())
+                store.set(dataset, key, {"rows": merged, **persisted})
+
+    def merge_entry(self, dataset: str, key: str, entry: dict[str, any]):
+        """
+        Merge an entry as another cache persisted it, e.g. a write held back by a read-only store, into both tiers.
+        Its rows replace cached rows only within the date ranges it covers, and its ranges and line items are
+        added to those already recorded, so entries other processes fetched for the same key are kept.
+        """
+        key_field = KEY_FIELDS[dataset]
+        rows = entry["rows"]
+        if "fields" in entry:
+            self._set(dataset, key, rows, key_field, fields=entry["fields"])
+        elif entry.get("ranges"):
+            with self._lock:
+                for start, end in entry["ranges"]:
+                    self._set(dataset, key, [row for row in rows if start <= row[key_field][:10] <= end], key_field, covered=(start, end))
+        else:
+            self._set(dataset, key, rows, key_field)
+
+    def stored_bytes(self) -> dict[str, int]:
+        """Bytes held per dataset: by the persistent tier if there is one, else as JSON in memory."""
+        store = self._get_store()
+        if store is not None:
+            return store.dataset_bytes()
+        with self._lock:
+            return {dataset: sum(len(json.dumps(rows)) for rows in memory.values()) for dataset, memory in self._datasets.items() if memory}
+
+    def get_missing_ranges(self, dataset: str, key: str, start_date: str, end_date: str) -> list[tuple[str, str]]:
+        """Return the sub-ranges of [start_date, end_date] that have not been fetched yet for this key."""
+        with self._lock:
+            self._get(dataset, key)
+            ranges = _covered_ranges(self._meta[dataset].get(key, {}))
+        return missing_ranges(ranges, start_date, end_date)
+
+    def _get_range(self, dataset: str, key: str, key_field: str, start_date: str, end_date: str) -> list[dict[str, any]]:
+        """
+        Slice a series to the rows whose `key_field` date falls within [start_date, end_date].
+        _set keeps prices and every series with recorded date ranges sorted by `key_field`.
+        """
+        rows = self._get(dataset, key) or []
+        lo = bisect_left(rows, start_date, key=lambda item: item[key_field][:10])
+        hi = bisect_right(rows, end_date, key=lambda item: item[key_field][:10])
+        return rows[lo:hi]
+
     def get_prices(self, ticker: str) -> list[dict[str, any]] | None:
         """Get cached price data if available."""
-        return self._prices_cache.get(ticker)
+        return self._get("prices", ticker)
+
+    def set_prices(self, ticker: str, data: list[dict[str, any]], start_date: str | None = None, end_date: str | None = None):
+        """Append new price data to cache, recording [start_date, end_date] as covered when given."""
+        covered = (start_date, end_date) if start_date and end_date else None
+        self._set("prices", ticker, data, key_field=KEY_FIELDS["prices"], covered=covered)
+
+    def get_missing_price_ranges(self, ticker: str, start_date: str, end_date: str) -> list[tuple[str, str]]:
+        """Return the date ranges within [start_date, end_date] whose prices are not cached yet."""
+        return self.get_missing_ranges("prices", ticker, start_date, end_date)
+
+    def get_price_range(self, ticker: str, start_date: str, end_date: str) -> list[dict[str, any]]:
+        """Get cached prices between start_date and end_date (inclusive), sorted by time."""
+        return self._get_range("prices", ticker, "time", start_date, end_date)
+
+    def _get_price_columns(self, ticker: str) -> dict[str, any] | None:
+        """Return the ticker's prices as read-only column arrays, converting the cached rows once."""
+        with self._lock:
+            columns = self._price_columns.get(ticker)
+            rows = self._get("prices", ticker)
+        if columns is not None:
+            return columns
+        if not rows:
+            return None
+
+        times = [row["time"] for row in rows]
+        columns = {
+            "day": np.array([time[:10] for time in times], dtype="datetime64[D]"),
+            "index": pd.DatetimeIndex(pd.to_datetime(times), name="Date"),
+        }
+        for column, dtype in PRICE_COLUMNS.items():
+            columns[column] = np.array([row[column] for row in rows], dtype=dtype)
+            columns[column].flags.writeable = False
+        with self._lock:
+            # Rows merged in meanwhile invalidate these columns; the next lookup rebuilds them
+            if self._prices_cache.get(ticker) is rows:
+                self._price_columns[ticker] = columns
+        return columns
+
+    def get_price_frame(self, ticker: str, start_date: str, end_date: str) -> pd.DataFrame:
+        """
+        Get cached prices between start_date and end_date (inclusive) as a DataFrame indexed by Date.
+        Columns are zero-copy, read-only views of the cached arrays; adding new columns to the frame is fine.
+        """
+        columns = self._get_price_columns(ticker)
+        if columns is None:
+            return pd.DataFrame({column: np.array([], dtype=dtype) for column, dtype in PRICE_COLUMNS.items()}, index=pd.DatetimeIndex([], name="Date"))
 
-    def set_prices(self, ticker: str, data: list[dict[str, any]]):
-        """Append new price data to cache."""
-        self._prices_cache[ticker] = self._merge_data(self._prices_cache.get(ticker), data, key_field="time")
+        lo = columns["day"].searchsorted(np.datetime64(start_date), side="left")
+        hi = columns["day"].searchsorted(np.datetime64(end_date), side="right")
+        return pd.DataFrame({column: columns[column][lo:hi] for column in PRICE_COLUMNS}, index=columns["index"][lo:hi], copy=False)
 
     def get_financial_metrics(self, ticker: str) -> list[dict[str, any]]:
         """Get cached financial metrics if available."""
-        return self._financial_metrics_cache.get(ticker)
+        return self._get("financial_metrics", ticker)
 
     def set_financial_metrics(self, ticker: str, data: list[dict[str, any]]):
         """Append new financial metrics to cache."""
-        self._financial_metrics_cache[ticker] = self._merge_data(self._financial_metrics_cache.get(ticker), data, key_field="report_period")
+        self._set("financial_metrics", ticker, data, key_field=KEY_FIELDS["financial_metrics"])
 
     def get_line_items(self, ticker: str) -> list[dict[str, any]] | None:
         """Get cached line items if available."""
-        return self._line_items_cache.get(ticker)
+        return self._get("line_items", ticker)
 
-    def set_line_items(self, ticker: str, data: list[dict[str, any]]):
-        """Append new line items to cache."""
-        self._line_items_cache[ticker] = self._merge_data(self._line_items_cache.get(ticker), data, key_field="report_period")
+    def set_line_items(self, ticker: str, data: list[dict[str, any]], line_items: list[str] | None = None):
+        """
+        Append new line items to cache. When `line_items` is given, fields are merged per report period
+        and the line items are recorded as fetched, even if the API returned no value for them.
+        """
+        self._set("line_items", ticker, data, key_field=KEY_FIELDS["line_items"], fields=line_items)
+
+    def get_missing_line_items(self, ticker: str, line_items: list[str]) -> list[str]:
+        """Return the requested line items that have not been fetched yet."""
+        with self._lock:
+            self._get("line_items", ticker)
+            fetched = set(self._meta["line_items"].get(ticker, {}).get("fields", []))
+        return [item for item in line_items if item not in fetched]
 
     def get_insider_trades(self, ticker: str) -> list[dict[str, any]] | None:
         """Get cached insider trades if available."""
-        return self._insider_trades_cache.get(ticker)
+        return self._get("insider_trades", ticker)
+
+    def set_insider_trades(self, ticker: str, data: list[dict[str, any]], start_date: str | None = None, end_date: str | None = None, persist: bool = True):
+        """Append new insider trades to cache, recording [start_date, end_date] as covered when given."""
+        covered = (start_date, end_date) if start_date and end_date else None
+        self._set("insider_trades", ticker, data, key_field=KEY_FIELDS["insider_trades"], covered=covered, persist=persist)
 
-    def set_insider_trades(self, ticker: str, data: list[dict[str, any]]):
-        """Append new insider trades to cache."""
-        self._insider_trades_cache[ticker] = self._merge_data(self._insider_trades_cache.get(ticker), data, key_field="filing_date")  # Could also use transaction_date if preferred
+    def get_missing_insider_trade_ranges(self, ticker: str, start_date: str, end_date: str) -> list[tuple[str, str]]:
+        """Return the filing date ranges within [start_date, end_date] whose insider trades are not cached yet."""
+        return self.get_missing_ranges("insider_trades", ticker, start_date, end_date)
+
+    def get_insider_trade_range(self, ticker: str, start_date: str, end_date: str) -> list[dict[str, any]]:
+        """Get cached insider trades filed between start_date and end_date (inclusive), oldest first."""
+        return self._get_range("insider_trades", ticker, "filing_date", start_date, end_date)
 
     def get_company_news(self, ticker: str) -> list[dict[str, any]] | None:
         """Get cached company news if available."""
-        return self._company_news_cache.get(ticker)
+        return self._get("company_news", ticker)
+
+    def set_company_news(self, ticker: str, data: list[dict[str, any]], start_date: str | None = None, end_date: str | None = None, persist: bool = True):
+        """Append new company news to cache, recording [start_date, end_date] as covered when given."""
+        covered = (start_date, end_date) if start_date and end_date else None
+        self._set("company_news", ticker, data, key_field=KEY_FIELDS["company_news"], covered=covered, persist=persist)
+
+    def get_missing_company_news_ranges(self, ticker: str, start_date: str, end_date: str) -> list[tuple[str, str]]:
+        """Return the date ranges within [start_date, end_date] whose company news is not cached yet."""
+        return self.get_missing_ranges("company_news", ticker, start_date, end_date)
+
+    def get_company_news_range(self, ticker: str, start_date: str, end_date: str) -> list[dict[str, any]]:
+        """Get cached company news published between start_date and end_date (inclusive), oldest first."""
+        return self._get_range("company_news", ticker, "date", start_date, end_date)
+
+
+def _create_store_from_env() -> PersistentStore | None:
+    """Create the persistent tier when FINANCIAL_DATA_CACHE_DIR is set."""
+    cache_dir = os.environ.get("FINANCIAL_DATA_CACHE_DIR")
+    if not cache_dir:
+        return None
 
-    def set_company_news(self, ticker: str, data: list[dict[str, any]]):
-        """Append new company news to cache."""
-        self._company_news_cache[ticker] = self._merge_data(self._company_news_cache.get(ticker), data, key_field="date")
+    max_mb = os.environ.get("FINANCIAL_DATA_CACHE_MAX_MB")
+    max_bytes = int(float(max_mb) * 1024 * 1024) if max_mb else DEFAULT_MAX_BYTES
+    return PersistentStore(Path(cache_dir) / CACHE_FILE_NAME, max_bytes=max_bytes)
 
 
 # Global cache instance
-_cache = Cache()
+_cache = Cache(store_factory=_create_store_from_env)
+get_stats().set_size_source("data_cache", _cache.stored_bytes)
 
 
 def get_cache() -> Cache:
@@ -0,0 +1,166 @@
+"""Counters and latency histograms for the financial data cache and the API client."""
+
+import math
+import threading
+import time
+from collections import defaultdict, deque
+from collections.abc import Callable
+
+# Upstream latencies kept per (dataset, ticker) for percentile estimates
+LATENCY_SAMPLES = 1024
+
+# Dataset served by each Financial Datasets API endpoint
+ENDPOINT_DATASETS = {
+    "/prices/": "prices",
+    "/financial-metrics/": "financial_metrics",
+    "/financials/search/line-items": "line_items",
+    "/insider-trades/": "insider_trades",
+    "/news/": "company_news",
+    "/company/facts/": "company_facts",
+}
+
+
+def _percentile(sorted_values: list[float], q: float) -> float:
+    """Nearest-rank percentile of an already sorted list."""
+    index = min(len(sorted_values) - 1, max(0, math.ceil(q / 100 * len(sorted_values)) - 1))
+    return sorted_values[index]
+
+
+class _Counters:
+    def __init__(self):
+        self.hits = 0
+        self.misses = 0
+        self.requests = 0
+        self.retries = 0
+        self.errors = 0
+        self.bytes_written = 0
+        self.evictions = 0
+        self.latencies: deque[float] = deque(maxlen=LATENCY_SAMPLES)
+
+    def summary(self) -> dict[str, any]:
+        lookups = self.hits + self.misses
+        latencies = sorted(self.latencies)
+        latency_ms = None
+        if latencies:
+            latency_ms = {
+                "p50": _percentile(latencies, 50) * 1000,
+                "p90": _percentile(latencies, 90) * 1000,
+                "p99": _percentile(latencies, 99) * 1000,
+                "max": latencies[-1] * 1000,
+                "mean": sum(latencies) / len(latencies) * 1000,
+            }
+        return {
+            "hits": self.hits,
+            "misses": self.misses,
+            "hit_rate": self.hits / lookups if lookups else None,
+            "requests": self.requests,
+            "retries": self.retries,
+            "errors": self.errors,
+            "bytes_written": self.bytes_written,
+            "bytes_stored": 0,
+            "evictions": self.evictions,
+            "latency_ms": latency_ms,
+        }
+
+
+class DataStats:
+    """
+    Thread-safe counters for cache lookups, persisted bytes, evictions and upstream requests,
+    kept per dataset and per (dataset, ticker). The bytes each dataset currently holds are read
+    from the size sources when a snapshot is taken.
+    """
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._size_sources: dict[str, Callable[[], dict[str, int]]] = {}
+        self.reset()
+
+    def reset(self):
+        with self._lock:
+            self._datasets: dict[str, _Counters] = defaultdict(_Counters)
+            self._tickers: dict[tuple[str, str], _Counters] = defaultdict(_Counters)
+            self._started_at = time.time()
+
+    def _counters(self, dataset: str, ticker: str | None) -> list[_Counters]:
+        counters = [self._datasets[dataset]]
+        if ticker:
+            counters.append(self._tickers[(dataset, ticker)])
+        return counters
+
+    def record_lookup(self, dataset: str, ticker: str | None, hit: bool):
+        """Record whether a fetcher could answer from the cache without calling the API."""
+        with self._lock:
+            for counters in self._counters(dataset, ticker):
+                if hit:
+                    counters.hits += 1
+                else:
+                    counters.misses += 1
+
+    def record_request(self, dataset: str, ticker: str | None, seconds: float, attempts: int = 1, failed: bool = False):
+        """Record one upstream request, including the time spent on its retries."""
+        with self._lock:
+            for counters in self._counters(dataset, ticker):
+                counters.requests += 1
+                counters.retries += attempts - 1
+                counters.errors += int(failed)
+                counters.latencies.append(seconds)
+
+    def record_written(self, dataset: str, num_bytes: int):
+        """Record bytes written to the persistent tier, counting every rewrite of an entry."""
+        with self._lock:
+            self._datasets[dataset].bytes_written += num_bytes
+
+    def set_size_source(self, name: str, source: Callable[[], dict[str, int]] | None):
+        """Report the bytes held per dataset, as returned by `source`, as bytes stored; None removes the source."""
+        with self._lock:
+            if source is None:
+                self._size_sources.pop(name, None)
+            else:
+                self._size_sources[name] = source
+
+    def record_evictions(self, dataset: str, count: int = 1):
+        """Record entries dropped from the persistent tier to stay within its byte budget."""
+        with self._lock:
+            self._datasets[dataset].evictions += count
+
+    def snapshot(self) -> dict[str, any]:
+        """Return all counters as plain data: totals per dataset and per dataset for every ticker."""
+        with self._lock:
+            sources = list(self._size_sources.values())
+        # Sources may query a store, so they are read without holding the lock
+        sizes: dict[str, int] = defaultdict(int)
+        for source in sources:
+            for dataset, num_bytes in source().items():
+                sizes[dataset] += num_bytes
+
+        with self._lock:
+            tickers: dict[str, dict[str, any]] = {}
+            for (dataset, ticker), counters in sorted(self._tickers.items()):
+                tickers.setdefault(ticker, {})[dataset] = counters.summary()
+            datasets = {dataset: counters.summary() for dataset, counters in self._datasets.items()}
+            for dataset, num_bytes in sizes.items():
+                datasets.setdefault(dataset, _Counters().summary())["bytes_stored"] = num_bytes
+            return {
+                "since": self._started_at,
+                "datasets": dict(sorted(datasets.items())),
+                "tickers": tickers,
+            }
+
+
+def request_labels(path: str, params: dict | None = None, json: dict | None = None) -> tuple[str, str | None]:
+    """Map an API request to the (dataset, ticker) it is accounted under."""
+    dataset = ENDPOINT_DATASETS.get(path, path)
+    if params and params.get("ticker"):
+        return dataset, params["ticker"]
+    if json and json.get("tickers"):
+        return dataset, ",".join(json["tickers"])
+    return dataset, None
+
+
+# Global stats instance
+_stats = DataStats()
+
+
+def get_stats() -> DataStats:
+    """Get the global data stats instance."""
+    return _stats
@@ -0,0 +1,184 @@
+"""
+tests/test_cache.py
+
+Covers the date-range bookkeeping and the persistent tier of `Cache`.
+"""
+
+import time
+from concurrent.futures import ThreadPoolExecutor
+from datetime import date
+
+import src.data.cache as cache_module
+
+from src.data.cache import Cache, PersistentStore, last_completed_day, merge_ranges, missing_ranges
+
+
+def test_merge_ranges_joins_overlapping_and_adjacent_days():
+    ranges = [("2024-01-04", "2024-01-05"), ("2024-01-01", "2024-01-03"), ("2024-01-10", "2024-01-11")]
+    assert merge_ranges(ranges) == [("2024-01-01", "2024-01-05"), ("2024-01-10", "2024-01-11")]
+
+
+def test_missing_ranges_returns_only_gaps():
+    covered = [("2024-01-05", "2024-01-10"), ("2024-01-20", "2024-01-25")]
+    assert missing_ranges(covered, "2024-01-01", "2024-01-30") == [
+        ("2024-01-01", "2024-01-04"),
+        ("2024-01-11", "2024-01-19"),
+        ("2024-01-26", "2024-01-30"),
+    ]
+    assert missing_ranges(covered, "2024-01-06", "2024-01-09") == []
+
+
+def test_price_range_is_served_from_cached_superset(tmp_path):
+    store = PersistentStore(tmp_path / "cache.sqlite")
+    cache = Cache(store=store)
+    rows = [{"time": f"2024-01-{day:02d}T05:00:00Z", "close": day} for day in (2, 3, 4, 5)]
+    cache.set_prices("AAPL", rows, start_date="2024-01-01", end_date="2024-01-07")
+
+    # A fresh cache reads rows and coverage back from disk
+    reloaded = Cache(store=store)
+    assert reloaded.get_missing_price_ranges("AAPL", "2024-01-03", "2024-01-10") == [("2024-01-08", "2024-01-10")]
+    assert [row["close"] for row in reloaded.get_price_range("AAPL", "2024-01-03", "2024-01-04")] == [3, 4]
+
+
+def test_persistent_store_evicts_least_recently_used(tmp_path):
+    store = PersistentStore(tmp_path / "cache.sqlite", max_bytes=100)
+    store.set("prices", "old", ["x" * 40])
+    store.set("prices", "new", ["y" * 40])
+    store.get("prices", "old")
+    store.set("prices", "newest", ["z" * 40])
+
+    assert store.get("prices", "new") is None
+    assert store.get("prices", "old") is not None
+    assert store.total_bytes() <= 100
+
+
+def test_line_items_merge_fields_per_report_period():
+    cache = Cache()
+    cache.set_line_items("AAPL_ttm_2024-06-01_10", [{"report_period": "2024", "revenue": 1}], line_items=["revenue", "capex"])
+    cache.set_line_items("AAPL_ttm_2024-06-01_10", [{"report_period": "2024", "net_income": 2}], line_items=["net_income"])
+
+    assert cache.get_line_items("AAPL_ttm_2024-06-01_10") == [{"report_period": "2024", "revenue": 1, "net_income": 2}]
+    # capex was requested before, so it counts as fetched even though the API returned no value
+    assert cache.get_missing_line_items("AAPL_ttm_2024-06-01_10", ["revenue", "capex", "debt"]) == ["debt"]
+
+
+def test_price_frame_slices_cached_columns_and_refreshes_on_new_rows():
+    cache = Cache()
+    rows = [{"time": f"2024-01-{day:02d}T05:00:00Z", "open": day, "close": day, "high": day, "low": day, "volume": 100 * day} for day in (2, 3, 4)]
+    cache.set_prices("AAPL", rows, start_date="2024-01-01", end_date="2024-01-04")
+
+    frame = cache.get_price_frame("AAPL", "2024-01-03", "2024-01-10")
+    assert frame["close"].tolist() == [3.0, 4.0]
+    assert frame["volume"].tolist() == [300, 400]
+    assert frame.index.name == "Date"
+    assert not frame["close"].to_numpy().flags.writeable
+
+    cache.set_prices("AAPL", [{**rows[0], "time": "2024-01-05T05:00:00Z", "close": 5}], start_date="2024-01-05", end_date="2024-01-05")
+    assert cache.get_price_frame("AAPL", "2024-01-03", "2024-01-10")["close"].tolist() == [3.0, 4.0, 5.0]
+    assert cache.get_price_frame("MSFT", "2024-01-01", "2024-01-10").empty
+
+
+def test_refresh_only_fetches_the_tail_after_the_last_completed_day(tmp_path):
+    store = PersistentStore(tmp_path / "cache.sqlite")
+    today = date.today().isoformat()
+    yesterday = last_completed_day()
+    news = [{"date": yesterday, "title": "old"}, {"date": today, "title": "early"}]
+    Cache(store=store).set_company_news("AAPL", news, start_date="2024-01-01", end_date=today)
+
+    # Today may still change, so a new process only re-fetches today
+    reloaded = Cache(store=store)
+    assert reloaded.get_missing_company_news_ranges("AAPL", "2024-01-01", today) == [(today, today)]
+
+    # Re-fetched rows replace the cached rows of that range instead of being appended to them
+    reloaded.set_company_news("AAPL", [{"date": today, "title": "early"}, {"date": today, "title": "late"}], start_date=today, end_date=today)
+    assert [item["title"] for item in reloaded.get_company_news_range("AAPL", "2024-01-01", today)] == ["old", "early", "late"]
+
+
+def test_today_is_fetched_again_in_memory_once_its_coverage_expires(monkeypatch):
+    cache = Cache()
+    today = date.today().isoformat()
+    yesterday = last_completed_day()
+    cache.set_prices("AAPL", [], start_date="2024-01-01", end_date=today)
+    assert cache.get_missing_price_ranges("AAPL", "2024-01-01", today) == []
+
+    now = time.time()
+    monkeypatch.setattr(cache_module.time, "time", lambda: now + cache_module.OPEN_DAY_TTL + 1)
+    assert cache.get_missing_price_ranges("AAPL", "2024-01-01", today) == [(today, today)]
+    assert cache.get_missing_price_ranges("AAPL", "2024-01-01", yesterday) == []
+
+    cache.set_prices("AAPL", [], start_date=today, end_date=today)
+    assert cache.get_missing_price_ranges("AAPL", "2024-01-01", today) == []
+
+
+def test_read_only_store_serves_entries_without_writing(tmp_path):
+    writer = PersistentStore(tmp_path / "cache.sqlite")
+    writer.set("prices", "AAPL", {"rows": [{"time": "2024-01-02T05:00:00Z", "close": 1.0}], "ranges": [["2024-01-01", "2024-01-02"]]})
+
+    reader = PersistentStore(tmp_path / "cache.sqlite", read_only=True)
+    cache = Cache(store=reader)
+    assert cache.get_missing_price_ranges("AAPL", "2024-01-01", "2024-01-02") == []
+
+    # Writes stay in memory and never reach the shared file
+    cache.set_prices("MSFT", [{"time": "2024-01-02T05:00:00Z", "close": 2.0}], start_date="2024-01-01", end_date="2024-01-02")
+    reader.clear()
+    assert writer.get("prices", "MSFT") is None
+    assert writer.get("prices", "AAPL") is not None
+
+    # ...until the single writer applies them
+    for dataset, key, data in reader.take_writes():
+        writer.set(dataset, key, data)
+    assert reader.take_writes() == []
+    assert Cache(store=reader).get_missing_price_ranges("MSFT", "2024-01-01", "2024-01-02") == []
+
+
+def test_entries_from_read_only_stores_are_merged_not_replaced(tmp_path):
+    writer = PersistentStore(tmp_path / "cache.sqlite")
+    Cache(store=writer).set_prices("AAPL", [{"time": "2024-01-02T05:00:00Z", "close": 1.0}], start_date="2024-01-01", end_date="2024-01-02")
+    Cache(store=writer).set_line_items("AAPL", [{"report_period": "2024-03-31", "revenue": 1.0}], line_items=["revenue"])
+
+    # Two workers fetch different ranges and line items for the same keys
+    writes = []
+    for day, item in [("2024-01-03", "net_income"), ("2024-01-04", "free_cash_flow")]:
+        reader = PersistentStore(tmp_path / "cache.sqlite", read_only=True)
+        worker = Cache(store=reader)
+        worker.set_prices("AAPL", [{"time": f"{day}T05:00:00Z", "close": 2.0}], start_date=day, end_date=day)
+        worker.set_line_items("AAPL", [{"report_period": "2024-03-31", item: 2.0}], line_items=[item])
+        writes.extend(reader.take_writes())
+
+    parent = Cache(store=writer)
+    for dataset, key, entry in writes:
+        parent.merge_entry(dataset, key, entry)
+
+    merged = Cache(store=writer)
+    assert merged.get_missing_price_ranges("AAPL", "2024-01-01", "2024-01-04") == []
+    assert [row["time"][:10] for row in merged.get_price_range("AAPL", "2024-01-01", "2024-01-04")] == ["2024-01-02", "2024-01-03", "2024-01-04"]
+    assert merged.get_missing_line_items("AAPL", ["revenue", "net_income", "free_cash_flow"]) == []
+    assert merged.get_line_items("AAPL") == [{"report_period": "2024-03-31", "revenue": 1.0, "net_income": 2.0, "free_cash_flow": 2.0}]
+
+
+def test_concurrent_merges_keep_every_field():
+    cache = Cache()
+    rows = [{"report_period": "2024-03-31"}, {"report_period": "2023-12-31"}]
+    fields = [f"field_{i}" for i in range(32)]
+
+    def merge(field):
+        cache.set_line_items("AAPL", [{**row, field: 1} for row in rows], line_items=[field])
+
+    with ThreadPoolExecutor(max_workers=8) as executor:
+        list(executor.map(merge, fields))
+
+    assert cache.get_missing_line_items("AAPL", fields) == []
+    assert all(all(row[field] == 1 for field in fields) for row in cache.get_line_items("AAPL"))
+
+
+def test_rows_merged_without_a_range_keep_the_series_sorted():
+    def bar(day):
+        return {"time": f"2024-01-{day:02d}T05:00:00Z", "open": day, "close": day, "high": day, "low": day, "volume": 100}
+
+    cache = Cache()
+    cache.set_prices("AAPL", [bar(5)], start_date="2024-01-05", end_date="2024-01-05")
+    cache.set_prices("AAPL", [bar(9), bar(2)])
+
+    assert [row["close"] for row in cache.get_prices("AAPL")] == [2, 5, 9]
+    assert [row["close"] for row in cache.get_price_range("AAPL", "2024-01-01", "2024-01-06")] == [2, 5]
+    assert cache.get_price_frame("AAPL", "2024-01-03", "2024-01-10")["close"].tolist() == [5.0, 9.0]
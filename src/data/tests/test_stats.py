@@ -0,0 +1,56 @@
+"""
+tests/test_stats.py
+
+Covers the counters and latency percentiles of `DataStats`.
+"""
+
+from src.data.cache import Cache, PersistentStore
+from src.data.stats import DataStats, request_labels
+
+
+def test_snapshot_aggregates_per_dataset_and_ticker():
+    stats = DataStats()
+    stats.record_lookup("prices", "AAPL", hit=False)
+    stats.record_lookup("prices", "AAPL", hit=True)
+    stats.record_lookup("prices", "MSFT", hit=True)
+    for ms in range(1, 101):
+        stats.record_request("prices", "AAPL", ms / 1000)
+    stats.record_request("prices", "AAPL", 0.5, attempts=3, failed=True)
+    stats.record_evictions("prices", 2)
+
+    snapshot = stats.snapshot()
+    prices = snapshot["datasets"]["prices"]
+    assert (prices["hits"], prices["misses"]) == (2, 1)
+    assert (prices["requests"], prices["retries"], prices["errors"], prices["evictions"]) == (101, 2, 1, 2)
+    assert prices["latency_ms"]["max"] == 500
+    assert prices["latency_ms"]["p50"] == 51
+    assert snapshot["tickers"]["MSFT"]["prices"]["hit_rate"] == 1.0
+
+
+def test_request_labels_map_endpoints_to_datasets():
+    assert request_labels("/prices/", params={"ticker": "AAPL"}) == ("prices", "AAPL")
+    assert request_labels("/financials/search/line-items", json={"tickers": ["AAPL"]}) == ("line_items", "AAPL")
+
+
+def test_stored_bytes_are_what_the_cache_holds_not_what_was_written(tmp_path):
+    store = PersistentStore(tmp_path / "cache.sqlite")
+    cache = Cache(store=store)
+    stats = DataStats()
+    stats.set_size_source("cache", cache.stored_bytes)
+    stats.record_written("prices", 100)
+    stats.record_written("prices", 100)
+
+    for close in range(3):
+        cache.set_prices("AAPL", [{"time": "2024-01-02T00:00:00Z", "close": close}], start_date="2024-01-02", end_date="2024-01-02")
+
+    prices = stats.snapshot()["datasets"]["prices"]
+    assert prices["bytes_written"] == 200
+    assert prices["bytes_stored"] == store.total_bytes() > 0
+
+    # Without a persistent tier, the rows held in memory are counted
+    stats.set_size_source("cache", Cache().stored_bytes)
+    assert stats.snapshot()["datasets"]["prices"]["bytes_stored"] == 0
+    memory_only = Cache()
+    memory_only.set_prices("AAPL", [{"time": "2024-01-02T00:00:00Z", "close": 1}])
+    stats.set_size_source("cache", memory_only.stored_bytes)
+    assert stats.snapshot()["datasets"]["prices"]["bytes_stored"] > 0
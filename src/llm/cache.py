@@ -0,0 +1,106 @@
+"""Opt-in cache of LLM responses keyed by the exact request, shared across agents, runs and users."""
+
+import hashlib
+import json
+import os
+import threading
+from pathlib import Path
+
+from pydantic import BaseModel
+
+from src.data.cache import PersistentStore
+from src.data.stats import get_stats
+
+# Dataset the responses are stored and counted under
+LLM_CACHE_DATASET = "llm_responses"
+
+DEFAULT_TTL = 7 * 24 * 60 * 60  # a week
+DEFAULT_MAX_BYTES = 256 * 1024 * 1024  # 256 MiB
+
+
+def prompt_messages(prompt: any) -> list[dict[str, any]] | str:
+    """The prompt as plain data: the type and content of each message, or the prompt itself as a string."""
+    if hasattr(prompt, "to_messages"):
+        return [{"type": message.type, "content": message.content} for message in prompt.to_messages()]
+    return prompt if isinstance(prompt, str) else str(prompt)
+
+
+def response_key(prompt: any, model_name: str, model_provider: str, temperature: float | None, pydantic_model: type[BaseModel]) -> str:
+    """
+    Hash of everything that determines a response: the prompt messages, model, provider, temperature (None for the
+    provider's default) and output schema.
+    """
+    payload = {
+        "prompt": prompt_messages(prompt),
+        "model": model_name,
+        "provider": str(getattr(model_provider, "value", model_provider)),
+        "temperature": temperature,
+        "schema": pydantic_model.model_json_schema(),
+    }
+    return hashlib.sha256(json.dumps(payload, sort_keys=True, default=str).encode()).hexdigest()
+
+
+class ResponseCache:
+    """
+    Structured LLM outputs in a SQLite file, expiring after `ttl` seconds and evicted least recently used
+    beyond `max_bytes`. Hits and misses are counted in the data stats under LLM_CACHE_DATASET.
+    """
+
+    def __init__(self, path: str | Path, ttl: float | None = DEFAULT_TTL, max_bytes: int = DEFAULT_MAX_BYTES, bypass: bool = False):
+        """
+        :param path: Location of the SQLite database file.
+        :param ttl: Seconds a response stays valid. None keeps responses until they are evicted.
+        :param max_bytes: Byte budget for stored responses.
+        :param bypass: Never answer from the cache, but still store fresh responses, e.g. to refresh it.
+        """
+        self.store = PersistentStore(path, max_bytes=max_bytes, ttls={LLM_CACHE_DATASET: ttl})
+        self.bypass = bypass
+
+    def get(self, key: str, pydantic_model: type[BaseModel]) -> BaseModel | None:
+        if self.bypass:
+            return None
+        data = self.store.get(LLM_CACHE_DATASET, key)
+        get_stats().record_lookup(LLM_CACHE_DATASET, None, hit=data is not None)
+        return pydantic_model.model_validate(data) if data is not None else None
+
+    def set(self, key: str, response: BaseModel):
+        self.store.set(LLM_CACHE_DATASET, key, response.model_dump(mode="json"))
+
+    def clear(self):
+        self.store.clear(LLM_CACHE_DATASET)
+
+
+_cache: ResponseCache | None = None
+_configured = False
+_cache_lock = threading.Lock()
+
+
+def set_response_cache(path: str | Path | None, bypass: bool = False):
+    """Cache LLM responses in the file at `path`, or disable the cache with None."""
+    global _cache, _configured
+    with _cache_lock:
+        _cache = ResponseCache(path, bypass=bypass) if path else None
+        _configured = True
+
+
+def get_response_cache() -> ResponseCache | None:
+    """
+    Get the global response cache; unless set_response_cache was called, it is configured from
+    LLM_RESPONSE_CACHE, with LLM_RESPONSE_CACHE_BYPASS=1 to bypass it.
+    """
+    global _cache, _configured
+    if not _configured:
+        with _cache_lock:
+            if not _configured:
+                path = os.environ.get("LLM_RESPONSE_CACHE")
+                _cache = ResponseCache(path, bypass=os.environ.get("LLM_RESPONSE_CACHE_BYPASS") == "1") if path else None
+                _configured = True
+    return _cache
+
+
+def _stored_bytes() -> dict[str, int]:
+    cache = get_response_cache()
+    return cache.store.dataset_bytes() if cache is not None else {}
+
+
+get_stats().set_size_source("llm_responses", _stored_bytes)
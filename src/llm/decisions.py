@@ -0,0 +1,145 @@
+"""
+Persistent store of the signals each analyst produced, so repeated runs over the same tickers and dates skip
+the analyst entirely. Unlike the response cache in src/llm/cache.py, which answers single LLM requests by
+their exact content, the store is looked up before an analyst runs, by agent, ticker, date window, model and
+the agent's prompt version. Only windows that ended before today are stored: today's data may still change.
+"""
+
+import functools
+import json
+import os
+import sqlite3
+import threading
+import time
+from collections.abc import Callable
+from datetime import date
+from pathlib import Path
+
+from langchain_core.messages import HumanMessage
+
+from src.graph.state import AgentState
+from src.utils.llm import get_agent_model_config, track_failed_tickers
+
+
+class DecisionStore:
+    """
+    SQLite table of analyst signals keyed by agent, ticker, date window, model and prompt version.
+
+    The key covers the analyst's code and prompts only through its PROMPT_VERSION, so bump that after changing them.
+    """
+
+    def __init__(self, path: str | Path):
+        """
+        :param path: Location of the SQLite database file.
+        """
+        self.path = Path(path)
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        self._lock = threading.Lock()
+        self._conn = sqlite3.connect(self.path, check_same_thread=False, isolation_level=None)
+        self._conn.execute("PRAGMA journal_mode=WAL")
+        columns = [row[1] for row in self._conn.execute("PRAGMA table_info(signals)")]
+        if columns and "prompt_version" not in columns:
+            # Signals stored without a prompt version cannot be told apart from stale ones
+            self._conn.execute("DROP TABLE signals")
+        self._conn.execute(
+            """
+            CREATE TABLE IF NOT EXISTS signals (
+                agent TEXT NOT NULL,
+                ticker TEXT NOT NULL,
+                start_date TEXT NOT NULL,
+                end_date TEXT NOT NULL,
+                model_name TEXT NOT NULL,
+                model_provider TEXT NOT NULL,
+                prompt_version INTEGER NOT NULL,
+                signal TEXT NOT NULL,
+                created_at REAL NOT NULL,
+                PRIMARY KEY (agent, ticker, start_date, end_date, model_name, model_provider, prompt_version)
+            )
+            """
+        )
+
+    def get(self, key: tuple) -> dict | None:
+        """Return the stored signal for a key from decision_key, or None."""
+        with self._lock:
+            row = self._conn.execute(
+                "SELECT signal FROM signals WHERE agent = ? AND ticker = ? AND start_date = ? AND end_date = ? AND model_name = ? AND model_provider = ? AND prompt_version = ?",
+                key,
+            ).fetchone()
+        return json.loads(row[0]) if row else None
+
+    def set(self, key: tuple, signal: dict):
+        with self._lock:
+            self._conn.execute("INSERT OR REPLACE INTO signals VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?)", (*key, json.dumps(signal), time.time()))
+
+    def clear(self, agent: str | None = None):
+        """Remove every stored signal, or only those of one agent."""
+        with self._lock:
+            if agent is None:
+                self._conn.execute("DELETE FROM signals")
+            else:
+                self._conn.execute("DELETE FROM signals WHERE agent = ?", (agent,))
+
+
+def decision_key(agent_name: str, ticker: str, state: dict, model_name: str, model_provider: str, prompt_version: int) -> tuple:
+    data = state.get("data", {})
+    return (agent_name, ticker, data.get("start_date") or "", data.get("end_date") or "", model_name, str(model_provider), prompt_version)
+
+
+def with_decision_store(agent_name: str, agent: Callable[[AgentState], dict], prompt_version: int) -> Callable[[AgentState], dict]:
+    """
+    Wrap an analyst node so that tickers with a stored signal for this window, model and prompt version skip the
+    analyst, which then runs only for the others. New signals are stored, except those of tickers whose LLM call
+    failed, and none for windows ending today or later, whose data may still change.
+    """
+
+    @functools.wraps(agent)
+    def node(state: AgentState) -> dict:
+        store = get_decision_store()
+        if store is None or not state["data"].get("end_date") or state["data"]["end_date"] >= date.today().isoformat():
+            return agent(state)
+
+        data = state["data"]
+        model_name, model_provider = get_agent_model_config(state, agent_name)
+        keys = {ticker: decision_key(agent_name, ticker, state, model_name, model_provider, prompt_version) for ticker in data["tickers"]}
+        signals = {ticker: signal for ticker, key in keys.items() if (signal := store.get(key)) is not None}
+
+        missing = [ticker for ticker in data["tickers"] if ticker not in signals]
+        if missing:
+            with track_failed_tickers() as failed:
+                result = agent({**state, "data": {**data, "tickers": missing}})
+            new_signals = result["data"]["analyst_signals"].get(agent_name, {})
+            for ticker in missing:
+                if ticker in new_signals and ticker not in failed:
+                    store.set(keys[ticker], new_signals[ticker])
+            signals.update(new_signals)
+
+        signals = {ticker: signals[ticker] for ticker in data["tickers"] if ticker in signals}
+        data["analyst_signals"][agent_name] = signals
+        return {"messages": [HumanMessage(content=json.dumps(signals), name=agent_name)], "data": data}
+
+    return node
+
+
+_store: DecisionStore | None = None
+_configured = False
+_store_lock = threading.Lock()
+
+
+def set_decision_store(path: str | Path | None):
+    """Use the store at `path` for analyst signals, or disable the store with None."""
+    global _store, _configured
+    with _store_lock:
+        _store = DecisionStore(path) if path else None
+        _configured = True
+
+
+def get_decision_store() -> DecisionStore | None:
+    """Get the global decision store; configured from AGENT_DECISION_STORE unless set_decision_store was called."""
+    global _store, _configured
+    if not _configured:
+        with _store_lock:
+            if not _configured:
+                path = os.environ.get("AGENT_DECISION_STORE")
+                _store = DecisionStore(path) if path else None
+                _configured = True
+    return _store
@@ -1,5 +1,8 @@
+import asyncio
 import json
 import os
+import threading
+import weakref
 from enum import Enum
 from pathlib import Path
 
@@ -98,7 +101,8 @@ def get_model_info(model_name: str, model_provider: str) -> LLMModel | None:
     return next((model for model in all_models if model.model_name == model_name and model.provider == model_provider), None)
 
 
-def get_model(model_name: str, model_provider: ModelProvider) -> ChatOpenAI | ChatGroq | ChatOllama | None:
+def create_model(model_name: str, model_provider: ModelProvider) -> ChatOpenAI | ChatGroq | ChatOllama | None:
+    """Construct a new chat model client. Prefer get_model, which reuses clients and their connection pools."""
     if model_provider == ModelProvider.GROQ:
         api_key = os.getenv("GROQ_API_KEY")
         if not api_key:
@@ -142,3 +146,99 @@ def get_model(model_name: str, model_provider: ModelProvider) -> ChatOpenAI | Ch
             model=model_name,
             base_url=base_url,
         )
+
+
+# Environment variables holding each provider's API key and, where configurable, its base URL
+_API_KEY_ENV = {
+    ModelProvider.GROQ: "GROQ_API_KEY",
+    ModelProvider.OPENAI: "OPENAI_API_KEY",
+    ModelProvider.ANTHROPIC: "ANTHROPIC_API_KEY",
+    ModelProvider.DEEPSEEK: "DEEPSEEK_API_KEY",
+    ModelProvider.GEMINI: "GOOGLE_API_KEY",
+}
+
+
+def _client_key(model_name: str, model_provider: ModelProvider | str) -> tuple:
+    """Identify a client by everything it is constructed from, so a changed key or endpoint gets a new one."""
+    provider = getattr(model_provider, "value", model_provider)
+    if provider == ModelProvider.OLLAMA:
+        base_url = os.getenv("OLLAMA_BASE_URL", f"http://{os.getenv('OLLAMA_HOST', 'localhost')}:11434")
+    else:
+        base_url = os.getenv("OPENAI_API_BASE") if provider == ModelProvider.OPENAI else None
+    api_key_env = next((env for known, env in _API_KEY_ENV.items() if known == provider), None)
+    return (provider, model_name, base_url, os.getenv(api_key_env) if api_key_env else None)
+
+
+class ModelRegistry:
+    """
+    Chat model clients shared across calls, agents and threads, keyed by provider, model, base URL and API key.
+    Each client keeps its HTTP connection pool, and structured-output runnables are built once per output schema.
+
+    A client's async connection pool belongs to the event loop that first used it, so clients requested from
+    inside a running event loop are kept per loop; synchronous callers share one client per key.
+    """
+
+    def __init__(self, factory=create_model):
+        """
+        :param factory: Builds a client from (model_name, model_provider) on first use.
+        """
+        self._factory = factory
+        self._models: dict[tuple, any] = {}
+        self._structured: dict[tuple, any] = {}
+        self._loop_models: weakref.WeakKeyDictionary[asyncio.AbstractEventLoop, tuple[dict, dict]] = weakref.WeakKeyDictionary()
+        self._lock = threading.Lock()
+
+    def _caches(self) -> tuple[dict[tuple, any], dict[tuple, any]]:
+        """The (clients, structured runnables) of the running event loop, or the shared ones outside any loop."""
+        try:
+            loop = asyncio.get_running_loop()
+        except RuntimeError:
+            return self._models, self._structured
+        caches = self._loop_models.get(loop)
+        if caches is None:
+            with self._lock:
+                caches = self._loop_models.setdefault(loop, ({}, {}))
+        return caches
+
+    def get(self, model_name: str, model_provider: ModelProvider | str):
+        models, _ = self._caches()
+        key = _client_key(model_name, model_provider)
+        model = models.get(key)
+        if model is None:
+            with self._lock:
+                model = models.get(key)
+                if model is None:
+                    model = models[key] = self._factory(model_name, model_provider)
+        return model
+
+    def get_structured(self, model_name: str, model_provider: ModelProvider | str, pydantic_model: type[BaseModel]):
+        """The client wrapped to return `pydantic_model` in JSON mode, or the plain client for models without JSON mode."""
+        _, structured = self._caches()
+        key = (*_client_key(model_name, model_provider), pydantic_model)
+        runnable = structured.get(key)
+        if runnable is None:
+            llm = self.get(model_name, model_provider)
+            model_info = get_model_info(model_name, model_provider)
+            if not (model_info and not model_info.has_json_mode()):
+                llm = llm.with_structured_output(pydantic_model, method="json_mode")
+            with self._lock:
+                runnable = structured.setdefault(key, llm)
+        return runnable
+
+    def clear(self):
+        with self._lock:
+            self._models.clear()
+            self._structured.clear()
+            self._loop_models.clear()
+
+
+_registry = ModelRegistry()
+
+
+def get_model_registry() -> ModelRegistry:
+    return _registry
+
+
+def get_model(model_name: str, model_provider: ModelProvider) -> ChatOpenAI | ChatGroq | ChatOllama | None:
+    """Shared chat model client for the model, created on first use."""
+    return _registry.get(model_name, model_provider)
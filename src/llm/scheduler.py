@@ -0,0 +1,253 @@
+"""Per-provider and per-model limits on concurrent LLM requests, requests per minute and tokens per minute."""
+
+import asyncio
+import json
+import math
+import os
+import threading
+import time
+from collections import OrderedDict, deque
+from collections.abc import Awaitable, Callable
+from typing import TypeVar
+
+from src.tools.client import parse_retry_after
+
+T = TypeVar("T")
+
+# Limits apply over a sliding window of this many seconds
+WINDOW_SECONDS = 60.0
+
+# Pause after a rate-limit error that carries no Retry-After header
+DEFAULT_RATE_LIMIT_PAUSE = 10.0
+
+# Limits per provider, or per "provider/model". Requests/tokens per minute depend on the account tier,
+# so only concurrency is limited by default; override with set_llm_scheduler or LLM_RATE_LIMITS.
+DEFAULT_LIMITS: dict[str, dict[str, int | None]] = {
+    "Anthropic": {"concurrency": 8},
+    "DeepSeek": {"concurrency": 8},
+    "Gemini": {"concurrency": 8},
+    "Groq": {"concurrency": 8},
+    "OpenAI": {"concurrency": 16},
+    "Ollama": {"concurrency": 2},
+}
+
+
+class _Limiter:
+    """Concurrency, requests-per-minute and tokens-per-minute budget of one provider or model."""
+
+    def __init__(self, concurrency: int | None = None, requests_per_minute: int | None = None, tokens_per_minute: int | None = None):
+        self.concurrency = concurrency
+        self.requests_per_minute = requests_per_minute
+        self.tokens_per_minute = tokens_per_minute
+        self.active = 0
+        self.paused_until = 0.0
+        self._started: deque[tuple[float, int]] = deque()  # (start time, tokens) within the window
+        self._window_tokens = 0
+
+    def _expire(self, now: float):
+        while self._started and self._started[0][0] <= now - WINDOW_SECONDS:
+            self._window_tokens -= self._started.popleft()[1]
+
+    def wait_time(self, tokens: int, now: float) -> float:
+        """Seconds until a request of `tokens` fits the rate limits; 0 if it can start now, inf while all slots are busy."""
+        self._expire(now)
+        if self.concurrency is not None and self.active >= self.concurrency:
+            return math.inf
+        wait = max(0.0, self.paused_until - now)
+        if self.requests_per_minute is not None and len(self._started) >= self.requests_per_minute:
+            wait = max(wait, self._started[len(self._started) - self.requests_per_minute][0] + WINDOW_SECONDS - now)
+        # A request larger than the whole budget still runs once the window is empty
+        if self.tokens_per_minute is not None and self._started and self._window_tokens + tokens > self.tokens_per_minute:
+            excess = self._window_tokens + tokens - self.tokens_per_minute
+            for started_at, started_tokens in self._started:
+                excess -= started_tokens
+                if excess <= 0:
+                    break
+            wait = max(wait, started_at + WINDOW_SECONDS - now)
+        return wait
+
+    def acquire(self, tokens: int, now: float):
+        self.active += 1
+        self._started.append((now, tokens))
+        self._window_tokens += tokens
+
+    def release(self):
+        self.active -= 1
+
+
+class _Request:
+    __slots__ = ("agent", "limiters", "tokens", "grant")
+
+    def __init__(self, agent: str, limiters: list[_Limiter], tokens: int, grant: Callable[[], None]):
+        self.agent = agent
+        self.limiters = limiters
+        self.tokens = tokens
+        self.grant = grant
+
+
+class LLMScheduler:
+    """
+    Admits LLM requests within the limits of their provider and model, queueing the rest. Each agent has its own
+    FIFO queue and the queues are served round-robin, so one agent submitting many prompts at once does not
+    starve the others. Thread-safe, and usable from any number of event loops and threads at once.
+    """
+
+    def __init__(self, limits: dict[str, dict[str, int | None]] | None = None, clock: Callable[[], float] = time.monotonic):
+        """
+        :param limits: Keyword arguments of each limiter ("concurrency", "requests_per_minute", "tokens_per_minute"),
+            keyed by provider or by "provider/model", case-insensitively. A request must fit both. Defaults to DEFAULT_LIMITS.
+        :param clock: Monotonic time source in seconds.
+        """
+        self.limits = {key.lower(): value for key, value in (DEFAULT_LIMITS if limits is None else limits).items()}
+        self.clock = clock
+        self._limiters: dict[str, _Limiter] = {}
+        self._queues: OrderedDict[str, deque[_Request]] = OrderedDict()
+        self._lock = threading.Lock()
+        self._timer: threading.Timer | None = None
+        self._timer_at = math.inf
+
+    def _limiters_for(self, provider: str, model: str) -> list[_Limiter]:
+        limiters = []
+        for key in (provider.lower(), f"{provider}/{model}".lower()):
+            if key in self.limits:
+                if key not in self._limiters:
+                    self._limiters[key] = _Limiter(**self.limits[key])
+                limiters.append(self._limiters[key])
+        return limiters
+
+    def _submit(self, provider: str, model: str, agent: str, tokens: int, grant: Callable[[], None]) -> _Request:
+        with self._lock:
+            request = _Request(agent or "", self._limiters_for(str(getattr(provider, "value", provider)), model), tokens, grant)
+            self._queues.setdefault(request.agent, deque()).append(request)
+        self._dispatch()
+        return request
+
+    def _withdraw(self, request: _Request) -> bool:
+        """Drop a request that is still queued; False if it has already been admitted."""
+        with self._lock:
+            queue = self._queues.get(request.agent)
+            if queue is None or request not in queue:
+                return False
+            queue.remove(request)
+            if not queue:
+                del self._queues[request.agent]
+            return True
+
+    def _release(self, request: _Request):
+        with self._lock:
+            for limiter in request.limiters:
+                limiter.release()
+        self._dispatch()
+
+    def _dispatch(self):
+        """Admit every queued request that fits, serving the agents round-robin, and wake up again when the next one will."""
+        with self._lock:
+            now = self.clock()
+            next_wake = math.inf
+            admitted = True
+            while admitted:
+                admitted = False
+                next_wake = math.inf
+                for agent, queue in self._queues.items():
+                    request = queue[0]
+                    wait = max((limiter.wait_time(request.tokens, now) for limiter in request.limiters), default=0.0)
+                    if wait > 0:
+                        next_wake = min(next_wake, wait)
+                        continue
+                    for limiter in request.limiters:
+                        limiter.acquire(request.tokens, now)
+                    queue.popleft()
+                    # The agent just served goes to the back of the line
+                    if queue:
+                        self._queues.move_to_end(agent)
+                    else:
+                        del self._queues[agent]
+                    request.grant()
+                    admitted = True
+                    break
+            if next_wake < math.inf and now + next_wake < self._timer_at:
+                if self._timer is not None:
+                    self._timer.cancel()
+                self._timer_at = now + next_wake
+                self._timer = threading.Timer(next_wake, self._on_timer)
+                self._timer.daemon = True
+                self._timer.start()
+
+    def _on_timer(self):
+        with self._lock:
+            self._timer, self._timer_at = None, math.inf
+        self._dispatch()
+
+    def _pause_if_rate_limited(self, request: _Request, error: Exception):
+        """Hold back the provider or model after a rate-limit error, for as long as the response asks."""
+        response = getattr(error, "response", None)
+        if type(error).__name__ != "RateLimitError" and getattr(response, "status_code", None) != 429:
+            return
+        headers = getattr(response, "headers", None) or {}
+        delay = parse_retry_after(headers.get("retry-after"))
+        if delay is None:
+            delay = DEFAULT_RATE_LIMIT_PAUSE
+        with self._lock:
+            for limiter in request.limiters:
+                limiter.paused_until = max(limiter.paused_until, self.clock() + delay)
+
+    async def run(self, provider: str, model: str, agent: str, tokens: int, call: Callable[[], Awaitable[T]]) -> T:
+        """Wait for a slot for a request of about `tokens` tokens, then await `call()`."""
+        loop = asyncio.get_running_loop()
+        admitted = loop.create_future()
+
+        def grant():
+            loop.call_soon_threadsafe(lambda: admitted.done() or admitted.set_result(None))
+
+        request = self._submit(provider, model, agent, tokens, grant)
+        try:
+            await admitted
+        except asyncio.CancelledError:
+            if not self._withdraw(request):
+                self._release(request)
+            raise
+        try:
+            return await call()
+        except Exception as e:
+            self._pause_if_rate_limited(request, e)
+            raise
+        finally:
+            self._release(request)
+
+    def run_sync(self, provider: str, model: str, agent: str, tokens: int, call: Callable[[], T]) -> T:
+        """Blocking version of run."""
+        admitted = threading.Event()
+        request = self._submit(provider, model, agent, tokens, admitted.set)
+        admitted.wait()
+        try:
+            return call()
+        except Exception as e:
+            self._pause_if_rate_limited(request, e)
+            raise
+        finally:
+            self._release(request)
+
+
+_scheduler: LLMScheduler | None = None
+_scheduler_lock = threading.Lock()
+
+
+def set_llm_scheduler(scheduler: LLMScheduler | None):
+    """Replace the global scheduler; None restores the default on next use."""
+    global _scheduler
+    with _scheduler_lock:
+        _scheduler = scheduler
+
+
+def get_llm_scheduler() -> LLMScheduler:
+    """
+    Get the global scheduler. Unless set_llm_scheduler was called, its limits are DEFAULT_LIMITS updated with
+    LLM_RATE_LIMITS, a JSON object such as {"OpenAI": {"concurrency": 8, "requests_per_minute": 500}}.
+    """
+    global _scheduler
+    if _scheduler is None:
+        with _scheduler_lock:
+            if _scheduler is None:
+                limits = {**DEFAULT_LIMITS, **json.loads(os.environ.get("LLM_RATE_LIMITS") or "{}")}
+                _scheduler = LLMScheduler(limits)
+    return _scheduler
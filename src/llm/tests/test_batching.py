@@ -0,0 +1,118 @@
+import threading
+import time
+
+from langchain_core.prompts import ChatPromptTemplate
+from pydantic import BaseModel
+
+import src.utils.llm as llm_utils
+from src.llm.scheduler import LLMScheduler
+
+
+class Signal(BaseModel):
+    signal: str
+    confidence: float
+
+
+TEMPLATE = ChatPromptTemplate.from_messages([("system", "You are a long persona prompt."), ("human", "Analysis Data for {ticker}: {data}")])
+TICKERS = ["AAPL", "MSFT", "NVDA", "TSLA", "AMZN"]
+
+
+class _BatchLLM:
+    """Answers batched prompts with valid signals for every ticker but TSLA, and single-ticker prompts directly."""
+
+    temperature = 0.0
+
+    def __init__(self):
+        self.prompts = []
+
+    def invoke(self, prompt):
+        self.prompts.append(prompt)
+        text = prompt.messages[-1].content
+        if '"signals"' in text:
+            tickers = [ticker for ticker in TICKERS if f"=== {ticker} ===" in text]
+            return llm_utils.BatchedOutputs(signals={ticker: {"signal": "bullish", "confidence": 70.0} if ticker != "TSLA" else {"signal": "bullish"} for ticker in tickers})
+        return Signal(signal="bearish", confidence=10.0)
+
+
+def _use(monkeypatch, llm):
+    class _Registry:
+        def get(self, model_name, model_provider):
+            return llm
+
+        def get_structured(self, model_name, model_provider, pydantic_model):
+            return llm
+
+    monkeypatch.setattr(llm_utils, "get_model_registry", lambda: _Registry())
+    monkeypatch.setattr(llm_utils, "get_response_cache", lambda: None)
+    monkeypatch.setattr(llm_utils, "get_llm_scheduler", lambda: LLMScheduler())
+
+
+def test_batch_prompt_sends_the_system_prompt_once():
+    prompt = llm_utils.batch_prompt({ticker: TEMPLATE.invoke({"ticker": ticker, "data": "{}"}) for ticker in TICKERS[:3]})
+    assert [message.type for message in prompt.messages] == ["system", "human"]
+    assert prompt.messages[0].content == "You are a long persona prompt."
+    assert all(f"=== {ticker} ===\nAnalysis Data for {ticker}" in prompt.messages[1].content for ticker in TICKERS[:3])
+
+
+def test_batched_outputs_are_validated_per_ticker_with_single_ticker_fallback(monkeypatch):
+    llm = _BatchLLM()
+    _use(monkeypatch, llm)
+    prompts = {ticker: TEMPLATE.invoke({"ticker": ticker, "data": "{}"}) for ticker in TICKERS}
+
+    outputs = llm_utils.call_llm_per_ticker(prompts, Signal, agent_name="warren_buffett_agent", batch_size=2)
+
+    assert list(outputs) == TICKERS
+    # TSLA's batched signal is invalid and AMZN is alone in its batch, so both get their own request
+    assert {ticker: output.signal for ticker, output in outputs.items()} == {"AAPL": "bullish", "MSFT": "bullish", "NVDA": "bullish", "TSLA": "bearish", "AMZN": "bearish"}
+    assert len(llm.prompts) == 4
+
+
+def test_batching_is_off_by_default(monkeypatch):
+    llm = _BatchLLM()
+    _use(monkeypatch, llm)
+    monkeypatch.delenv("LLM_BATCH_SIZE", raising=False)
+    prompts = {ticker: TEMPLATE.invoke({"ticker": ticker, "data": "{}"}) for ticker in TICKERS}
+
+    outputs = llm_utils.call_llm_per_ticker(prompts, Signal)
+    assert [output.signal for output in outputs.values()] == ["bearish"] * 5
+    assert sorted(prompt.to_string() for prompt in llm.prompts) == sorted(prompt.to_string() for prompt in prompts.values())
+
+    monkeypatch.setenv("LLM_BATCH_SIZE", "5")
+    assert llm_utils.get_llm_batch_size() == 5
+
+
+def test_agents_on_separate_threads_share_the_client(monkeypatch):
+    class _SharedLLM:
+        """A sync client shared by every agent; TSLA's calls fail."""
+
+        temperature = 0.0
+
+        def invoke(self, prompt):
+            time.sleep(0.2)
+            if "TSLA" in prompt.to_string():
+                raise RuntimeError("rate limited")
+            return Signal(signal="bullish", confidence=50.0)
+
+    _use(monkeypatch, _SharedLLM())
+    prompts = {ticker: TEMPLATE.invoke({"ticker": ticker, "data": "{}"}) for ticker in TICKERS}
+    results = {}
+
+    def agent(agent_name):
+        with llm_utils.track_failed_tickers() as failed:
+            outputs = llm_utils.call_llm_per_ticker(prompts, Signal, agent_name, default_factory=lambda: Signal(signal="neutral", confidence=0.0), batch_size=1)
+        results[agent_name] = ({ticker: output.signal for ticker, output in outputs.items()}, failed)
+
+    threads = [threading.Thread(target=agent, args=(agent_name,)) for agent_name in ("warren_buffett_agent", "ben_graham_agent")]
+    started = time.perf_counter()
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join(timeout=5)
+    elapsed = time.perf_counter() - started
+
+    assert not any(thread.is_alive() for thread in threads)
+    for signals, failed in results.values():
+        assert signals == {"AAPL": "bullish", "MSFT": "bullish", "NVDA": "bullish", "TSLA": "neutral", "AMZN": "bullish"}
+        # Failures are reported to each agent's own tracker
+        assert failed == {"TSLA"}
+    assert elapsed < 2.0  # both agents' requests in flight together, retries included
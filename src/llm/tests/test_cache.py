@@ -0,0 +1,76 @@
+from langchain_core.prompts import ChatPromptTemplate
+from pydantic import BaseModel
+
+import src.utils.llm as llm_utils
+from src.data.stats import get_stats
+from src.llm.cache import LLM_CACHE_DATASET, ResponseCache, response_key
+
+
+class Signal(BaseModel):
+    signal: str
+    confidence: float
+
+
+class _FakeLLM:
+    temperature = 0.0
+
+    def __init__(self):
+        self.calls = 0
+
+    def invoke(self, prompt):
+        self.calls += 1
+        return Signal(signal="bullish", confidence=80.0)
+
+
+class _FakeRegistry:
+    def __init__(self, llm):
+        self.llm = llm
+
+    def get(self, model_name, model_provider):
+        return self.llm
+
+    def get_structured(self, model_name, model_provider, pydantic_model):
+        return self.llm
+
+
+TEMPLATE = ChatPromptTemplate.from_messages([("system", "Analyst"), ("human", "Data: {data}")])
+
+
+def test_key_covers_prompt_model_provider_temperature_and_schema():
+    class Other(BaseModel):
+        signal: str
+
+    prompt = TEMPLATE.invoke({"data": "a"})
+    key = response_key(prompt, "gpt-4o", "OpenAI", 0.0, Signal)
+    assert key == response_key(TEMPLATE.invoke({"data": "a"}), "gpt-4o", "OpenAI", 0.0, Signal)
+    assert len({key, response_key(TEMPLATE.invoke({"data": "b"}), "gpt-4o", "OpenAI", 0.0, Signal), response_key(prompt, "gpt-4o-mini", "OpenAI", 0.0, Signal), response_key(prompt, "gpt-4o", "Groq", 0.0, Signal), response_key(prompt, "gpt-4o", "OpenAI", 0.7, Signal), response_key(prompt, "gpt-4o", "OpenAI", 0.0, Other)}) == 6
+
+
+def test_cache_expires_counts_and_bypasses(tmp_path):
+    get_stats().reset()
+    cache = ResponseCache(tmp_path / "llm.sqlite")
+    assert cache.get("k", Signal) is None
+    cache.set("k", Signal(signal="bearish", confidence=40.0))
+    assert cache.get("k", Signal) == Signal(signal="bearish", confidence=40.0)
+
+    counters = get_stats().snapshot()["datasets"][LLM_CACHE_DATASET]
+    assert (counters["hits"], counters["misses"]) == (1, 1)
+
+    assert ResponseCache(tmp_path / "llm.sqlite", bypass=True).get("k", Signal) is None
+    assert ResponseCache(tmp_path / "llm.sqlite", ttl=-1).get("k", Signal) is None
+
+
+def test_call_llm_answers_repeated_requests_from_the_cache(tmp_path, monkeypatch):
+    fake = _FakeLLM()
+    monkeypatch.setattr(llm_utils, "get_model_registry", lambda: _FakeRegistry(fake))
+    cache = ResponseCache(tmp_path / "llm.sqlite")
+    monkeypatch.setattr(llm_utils, "get_response_cache", lambda: cache)
+
+    prompt = TEMPLATE.invoke({"data": "a"})
+    first = llm_utils.call_llm(prompt, Signal, agent_name="warren_buffett_agent")
+    second = llm_utils.call_llm(prompt, Signal, agent_name="charlie_munger_agent")
+    assert first == second and fake.calls == 1
+
+    llm_utils.call_llm(prompt, Signal, use_cache=False)
+    llm_utils.call_llm(TEMPLATE.invoke({"data": "b"}), Signal)
+    assert fake.calls == 3
@@ -0,0 +1,89 @@
+from datetime import date
+
+from pydantic import BaseModel
+
+import src.llm.decisions as decisions
+import src.utils.llm as llm_utils
+from src.llm.decisions import DecisionStore, decision_key, with_decision_store
+from src.llm.scheduler import LLMScheduler
+
+
+class Signal(BaseModel):
+    signal: str
+
+
+class _FailingLLM:
+    """Answers every prompt but TSLA's."""
+
+    temperature = 0.0
+
+    def invoke(self, prompt):
+        if "TSLA" in prompt:
+            raise RuntimeError("rate limited")
+        return Signal(signal="bullish")
+
+
+def test_store_round_trips_signals_by_key(tmp_path):
+    store = DecisionStore(tmp_path / "decisions.sqlite")
+    state = {"data": {"start_date": "2024-01-01", "end_date": "2024-02-01"}}
+    key = decision_key("warren_buffett_agent", "AAPL", state, "gpt-4o", "OpenAI", 1)
+    assert store.get(key) is None
+
+    store.set(key, {"signal": "bullish", "confidence": 70.0})
+    assert DecisionStore(tmp_path / "decisions.sqlite").get(key) == {"signal": "bullish", "confidence": 70.0}
+    assert store.get(decision_key("warren_buffett_agent", "AAPL", state, "gpt-4o-mini", "OpenAI", 1)) is None
+    # A new prompt version does not reuse the signals of the previous one
+    assert store.get(decision_key("warren_buffett_agent", "AAPL", state, "gpt-4o", "OpenAI", 2)) is None
+
+
+def test_stored_tickers_skip_the_agent_and_failed_ones_are_not_stored(tmp_path, monkeypatch):
+    store = DecisionStore(tmp_path / "decisions.sqlite")
+    monkeypatch.setattr(decisions, "get_decision_store", lambda: store)
+    llm = _FailingLLM()
+    monkeypatch.setattr(llm_utils, "get_model_registry", lambda: type("Registry", (), {"get_structured": lambda self, *args: llm})())
+    monkeypatch.setattr(llm_utils, "get_response_cache", lambda: None)
+    monkeypatch.setattr(llm_utils, "get_llm_scheduler", lambda: LLMScheduler())
+    runs = []
+
+    def agent(state):
+        runs.append(state["data"]["tickers"])
+        signals = {ticker: llm_utils.call_llm(ticker, Signal, "warren_buffett_agent", state, ticker=ticker).model_dump() for ticker in state["data"]["tickers"]}
+        state["data"]["analyst_signals"]["warren_buffett_agent"] = signals
+        return {"messages": [], "data": state["data"]}
+
+    def state():
+        return {"data": {"tickers": ["AAPL", "TSLA", "MSFT"], "start_date": "2024-01-01", "end_date": "2024-02-01", "analyst_signals": {}}, "metadata": {"model_name": "gpt-4o", "model_provider": "OpenAI"}}
+
+    store.set(decision_key("warren_buffett_agent", "MSFT", state(), "gpt-4o", "OpenAI", 1), {"signal": "bearish"})
+    node = with_decision_store("warren_buffett_agent", agent, 1)
+
+    result = node(state())
+    assert runs == [["AAPL", "TSLA"]]
+    signals = result["data"]["analyst_signals"]["warren_buffett_agent"]
+    assert list(signals) == ["AAPL", "TSLA", "MSFT"]
+    assert signals["MSFT"] == {"signal": "bearish"}
+
+    # TSLA fell back to a default signal, so only it runs again
+    node(state())
+    assert runs == [["AAPL", "TSLA"], ["TSLA"]]
+
+
+def test_windows_ending_today_are_not_stored(tmp_path, monkeypatch):
+    store = DecisionStore(tmp_path / "decisions.sqlite")
+    monkeypatch.setattr(decisions, "get_decision_store", lambda: store)
+    runs = []
+
+    def agent(state):
+        runs.append(state["data"]["tickers"])
+        state["data"]["analyst_signals"]["warren_buffett_agent"] = {"AAPL": {"signal": "bullish"}}
+        return {"messages": [], "data": state["data"]}
+
+    def state():
+        return {"data": {"tickers": ["AAPL"], "start_date": "2024-01-01", "end_date": date.today().isoformat(), "analyst_signals": {}}, "metadata": {"model_name": "gpt-4o", "model_provider": "OpenAI"}}
+
+    node = with_decision_store("warren_buffett_agent", agent, 1)
+    node(state())
+    node(state())
+    # Today's data may still change, so the analyst runs every time
+    assert runs == [["AAPL"], ["AAPL"]]
+    assert store.get(decision_key("warren_buffett_agent", "AAPL", state(), "gpt-4o", "OpenAI", 1)) is None
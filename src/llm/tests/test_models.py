@@ -0,0 +1,72 @@
+import asyncio
+from concurrent.futures import ThreadPoolExecutor
+
+from pydantic import BaseModel
+
+from src.llm.models import ModelProvider, ModelRegistry
+
+
+class Signal(BaseModel):
+    signal: str
+
+
+class _FakeModel:
+    def __init__(self, model_name: str):
+        self.model_name = model_name
+        self.wrapped = 0
+
+    def with_structured_output(self, schema, method):
+        self.wrapped += 1
+        return (self, schema, method)
+
+
+def test_registry_builds_each_client_once_across_threads(monkeypatch):
+    monkeypatch.setenv("OPENAI_API_KEY", "key")
+    built = []
+    registry = ModelRegistry(factory=lambda model_name, provider: built.append(model_name) or _FakeModel(model_name))
+
+    with ThreadPoolExecutor(max_workers=8) as executor:
+        models = list(executor.map(lambda _: registry.get("gpt-4o", ModelProvider.OPENAI), range(32)))
+
+    assert built == ["gpt-4o"]
+    assert all(model is models[0] for model in models)
+    assert registry.get("gpt-4o", "OpenAI") is models[0]
+    assert registry.get("gpt-4o-mini", ModelProvider.OPENAI) is not models[0]
+
+
+def test_new_client_when_the_endpoint_or_key_changes(monkeypatch):
+    monkeypatch.setenv("OPENAI_API_KEY", "key")
+    registry = ModelRegistry(factory=lambda model_name, provider: _FakeModel(model_name))
+    first = registry.get("gpt-4o", ModelProvider.OPENAI)
+
+    monkeypatch.setenv("OPENAI_API_BASE", "http://proxy")
+    assert registry.get("gpt-4o", ModelProvider.OPENAI) is not first
+    monkeypatch.delenv("OPENAI_API_BASE")
+    assert registry.get("gpt-4o", ModelProvider.OPENAI) is first
+    monkeypatch.setenv("OPENAI_API_KEY", "rotated")
+    assert registry.get("gpt-4o", ModelProvider.OPENAI) is not first
+
+
+def test_structured_runnables_are_built_once_per_schema(monkeypatch):
+    monkeypatch.setenv("OPENAI_API_KEY", "key")
+    registry = ModelRegistry(factory=lambda model_name, provider: _FakeModel(model_name))
+
+    runnable = registry.get_structured("gpt-4o", ModelProvider.OPENAI, Signal)
+    assert registry.get_structured("gpt-4o", ModelProvider.OPENAI, Signal) is runnable
+    assert runnable[1:] == (Signal, "json_mode")
+    assert registry.get("gpt-4o", ModelProvider.OPENAI).wrapped == 1
+
+
+def test_clients_used_from_an_event_loop_are_kept_per_loop(monkeypatch):
+    monkeypatch.setenv("OPENAI_API_KEY", "key")
+    registry = ModelRegistry(factory=lambda model_name, provider: _FakeModel(model_name))
+
+    async def get_twice():
+        return registry.get_structured("gpt-4o", ModelProvider.OPENAI, Signal), registry.get_structured("gpt-4o", ModelProvider.OPENAI, Signal)
+
+    first, again = asyncio.run(get_twice())
+    second, _ = asyncio.run(get_twice())
+    assert first is again
+    assert first[0] is not second[0]
+    # Synchronous callers share a client of their own
+    assert registry.get("gpt-4o", ModelProvider.OPENAI) not in (first[0], second[0])
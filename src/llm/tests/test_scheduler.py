@@ -0,0 +1,130 @@
+import asyncio
+import threading
+import time
+
+import pytest
+from langchain_core.prompts import ChatPromptTemplate
+from pydantic import BaseModel
+
+import src.utils.llm as llm_utils
+from src.llm.scheduler import DEFAULT_RATE_LIMIT_PAUSE, LLMScheduler, _Limiter
+
+
+class Signal(BaseModel):
+    signal: str
+    confidence: float
+
+
+TEMPLATE = ChatPromptTemplate.from_messages([("system", "Analyst"), ("human", "Ticker: {ticker}")])
+
+
+def test_limiter_waits_for_the_request_and_token_windows():
+    limiter = _Limiter(requests_per_minute=2, tokens_per_minute=1000)
+    limiter.acquire(400, now=0.0)
+    limiter.acquire(400, now=10.0)
+    assert limiter.wait_time(100, now=20.0) == 40.0  # two requests in the last minute
+    assert limiter.wait_time(100, now=60.0) == 0.0  # the first one left the window
+
+    limiter = _Limiter(tokens_per_minute=1000)
+    limiter.acquire(600, now=0.0)
+    limiter.acquire(300, now=30.0)
+    assert limiter.wait_time(200, now=40.0) == 20.0
+    assert limiter.wait_time(100, now=40.0) == 0.0
+
+
+def test_concurrency_is_capped_per_provider_and_model():
+    scheduler = LLMScheduler({"OpenAI": {"concurrency": 4}, "OpenAI/gpt-4o": {"concurrency": 2}})
+    active = peak = 0
+    lock = threading.Lock()
+
+    async def call():
+        nonlocal active, peak
+        with lock:
+            active += 1
+            peak = max(peak, active)
+        await asyncio.sleep(0.01)
+        with lock:
+            active -= 1
+        return "ok"
+
+    async def run_all():
+        return await asyncio.gather(*(scheduler.run("OPENAI", "gpt-4o", "agent", 10, call) for _ in range(10)))
+
+    assert asyncio.run(run_all()) == ["ok"] * 10
+    assert peak == 2
+
+
+def test_agents_are_served_round_robin():
+    scheduler = LLMScheduler({"OpenAI": {"concurrency": 1}})
+    order = []
+    gate = threading.Event()
+
+    # Hold the only slot while both agents queue their requests
+    holder = threading.Thread(target=scheduler.run_sync, args=("OpenAI", "gpt-4o", "first", 10, gate.wait))
+    holder.start()
+    time.sleep(0.05)
+    threads = [threading.Thread(target=scheduler.run_sync, args=("OpenAI", "gpt-4o", agent, 10, lambda agent=agent: order.append(agent))) for agent in ["busy"] * 3 + ["quiet"]]
+    for thread in threads:
+        thread.start()
+        time.sleep(0.01)
+    gate.set()
+    for thread in [holder, *threads]:
+        thread.join()
+
+    assert order == ["busy", "quiet", "busy", "busy"]
+
+
+@pytest.mark.parametrize(("retry_after", "paused_until"), [("30", 130.0), ("0", 100.0), (None, 100.0 + DEFAULT_RATE_LIMIT_PAUSE)])
+def test_rate_limit_errors_pause_the_provider(retry_after, paused_until):
+    class RateLimitError(Exception):
+        response = type("Response", (), {"status_code": 429, "headers": {"retry-after": retry_after} if retry_after is not None else {}})()
+
+    now = [100.0]
+    scheduler = LLMScheduler({"Groq": {"concurrency": 4}}, clock=lambda: now[0])
+
+    def fail():
+        raise RateLimitError()
+
+    try:
+        scheduler.run_sync("Groq", "llama", "agent", 10, fail)
+    except RateLimitError:
+        pass
+    assert scheduler._limiters["groq"].paused_until == paused_until
+
+
+def test_call_llm_many_runs_the_prompts_concurrently_on_a_bounded_pool(monkeypatch):
+    lock = threading.Lock()
+    in_flight, peak = [0], [0]
+
+    class _SlowLLM:
+        temperature = 0.0
+
+        def invoke(self, prompt):
+            with lock:
+                in_flight[0] += 1
+                peak[0] = max(peak[0], in_flight[0])
+            time.sleep(0.2)
+            with lock:
+                in_flight[0] -= 1
+            return Signal(signal="bullish", confidence=float(len(prompt.to_string())))
+
+    class _Registry:
+        def get(self, model_name, model_provider):
+            return _SlowLLM()
+
+        def get_structured(self, model_name, model_provider, pydantic_model):
+            return _SlowLLM()
+
+    monkeypatch.setattr(llm_utils, "get_model_registry", lambda: _Registry())
+    monkeypatch.setattr(llm_utils, "get_response_cache", lambda: None)
+    monkeypatch.setattr(llm_utils, "get_llm_scheduler", lambda: LLMScheduler())
+    monkeypatch.setenv("AGENT_TICKER_WORKERS", "8")
+
+    tickers = [f"T{i}" for i in range(20)]
+    started = time.perf_counter()
+    results = llm_utils.call_llm_many([{"prompt": TEMPLATE.invoke({"ticker": ticker}), "pydantic_model": Signal, "agent_name": "warren_buffett_agent", "ticker": ticker} for ticker in tickers])
+    elapsed = time.perf_counter() - started
+
+    assert [result.confidence for result in results] == [float(len(TEMPLATE.invoke({"ticker": ticker}).to_string())) for ticker in tickers]
+    assert elapsed < 1.0  # three rounds of 8 concurrent calls, not twenty sequential ones
+    assert peak[0] == 8
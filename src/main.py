@@ -1,5 +1,6 @@
 import argparse
 import json
+import os
 import sys
 from datetime import datetime
 
@@ -13,9 +14,14 @@ from langgraph.graph import END, StateGraph
 from src.agents.portfolio_manager import portfolio_management_agent
 from src.agents.risk_manager import risk_management_agent
 from src.graph.state import AgentState
+from src.llm.cache import set_response_cache
+from src.llm.decisions import set_decision_store
 from src.llm.models import LLM_ORDER, OLLAMA_LLM_ORDER, ModelProvider, get_model_info
+from src.tools.archive import DATA_MODES, DEFAULT_ARCHIVE_DIR
+from src.tools.client import set_data_mode
 from src.utils.analysts import ANALYST_ORDER, get_analyst_nodes
 from src.utils.display import print_trading_output
+from src.utils.llm import set_llm_batch_size
 from src.utils.ollama import ensure_ollama_and_model
 from src.utils.progress import progress
 from src.utils.visualize import save_graph_as_png
@@ -51,15 +57,22 @@ def run_hedge_fund(
     selected_analysts: list[str] | None = None,
     model_name: str = "gpt-4o",
     model_provider: str = "OpenAI",
+    analyst_signals: dict[str, dict] | None = None,
 ):
+    """
+    Run the analysts, risk manager and portfolio manager for the tickers and return their decisions.
+    With precomputed `analyst_signals` (see run_analysts), the analysts are skipped.
+    """
     if selected_analysts is None:
         selected_analysts = []
     # Start progress tracking
     progress.start()
 
     try:
+        if analyst_signals is not None:
+            agent = create_workflow([]).compile()
         # Create a new workflow if analysts are customized
-        if selected_analysts:
+        elif selected_analysts:
             workflow = create_workflow(selected_analysts)
             agent = workflow.compile()
         else:
@@ -77,7 +90,7 @@ def run_hedge_fund(
                     "portfolio": portfolio,
                     "start_date": start_date,
                     "end_date": end_date,
-                    "analyst_signals": {},
+                    "analyst_signals": dict(analyst_signals or {}),
                 },
                 "metadata": {
                     "show_reasoning": show_reasoning,
@@ -96,13 +109,51 @@ def run_hedge_fund(
         progress.stop()
 
 
+def run_analysts(
+    tickers: list[str],
+    start_date: str,
+    end_date: str,
+    selected_analysts: list[str] | None = None,
+    model_name: str = "gpt-4o",
+    model_provider: str = "OpenAI",
+    show_reasoning: bool = False,
+) -> dict[str, dict]:
+    """
+    Run only the analysts and return their signals keyed by agent, then ticker.
+    Analysts do not depend on the portfolio, so this is safe to call concurrently for different windows.
+    Progress tracking is left to the caller.
+    """
+    workflow = create_workflow(selected_analysts or None, include_decisions=False)
+    final_state = workflow.compile().invoke(
+        {
+            "messages": [HumanMessage(content="Analyze the provided tickers.")],
+            "data": {
+                "tickers": tickers,
+                "portfolio": {},
+                "start_date": start_date,
+                "end_date": end_date,
+                "analyst_signals": {},
+            },
+            "metadata": {
+                "show_reasoning": show_reasoning,
+                "model_name": model_name,
+                "model_provider": model_provider,
+            },
+        },
+    )
+    return final_state["data"]["analyst_signals"]
+
+
 def start(state: AgentState):
     """Initialize the workflow with the input message."""
     return state
 
 
-def create_workflow(selected_analysts=None):
-    """Create the workflow with selected analysts."""
+def create_workflow(selected_analysts=None, include_decisions=True):
+    """
+    Create the workflow with selected analysts.
+    An empty list runs no analysts; include_decisions=False stops after the analysts.
+    """
     workflow = StateGraph(AgentState)
     workflow.add_node("start_node", start)
 
@@ -118,6 +169,12 @@ def create_workflow(selected_analysts=None):
         workflow.add_node(node_name, node_func)
         workflow.add_edge("start_node", node_name)
 
+    if not include_decisions:
+        for analyst_key in selected_analysts:
+            workflow.add_edge(analyst_nodes[analyst_key][0], END)
+        workflow.set_entry_point("start_node")
+        return workflow
+
     # Always add risk and portfolio management
     workflow.add_node("risk_management_agent", risk_management_agent)
     workflow.add_node("portfolio_manager", portfolio_management_agent)
@@ -126,6 +183,8 @@ def create_workflow(selected_analysts=None):
     for analyst_key in selected_analysts:
         node_name = analyst_nodes[analyst_key][0]
         workflow.add_edge(node_name, "risk_management_agent")
+    if not selected_analysts:
+        workflow.add_edge("start_node", "risk_management_agent")
 
     workflow.add_edge("risk_management_agent", "portfolio_manager")
     workflow.add_edge("portfolio_manager", END)
@@ -163,8 +222,39 @@ if __name__ == "__main__":
     parser.add_argument("--show-reasoning", action="store_true", help="Show reasoning from each agent")
     parser.add_argument("--show-agent-graph", action="store_true", help="Show the agent graph")
     parser.add_argument("--ollama", action="store_true", help="Use Ollama for local LLM inference")
+    parser.add_argument(
+        "--data-mode",
+        choices=DATA_MODES,
+        default="live",
+        help="live: call the financial data API; record: also save every response to the archive; replay: answer only from the archive and fail on a miss",
+    )
+    parser.add_argument("--data-dir", type=str, help=f"Archive directory for --data-mode record/replay (default: {DEFAULT_ARCHIVE_DIR})")
+
+    parser.add_argument(
+        "--decision-store",
+        type=str,
+        default=os.environ.get("AGENT_DECISION_STORE"),
+        help="SQLite file that stores analyst signals per ticker, date window, model and prompt version for windows ended before today; later runs reuse them instead of running the analyst",
+    )
+    parser.add_argument(
+        "--llm-cache",
+        type=str,
+        default=os.environ.get("LLM_RESPONSE_CACHE"),
+        help="SQLite file that caches LLM responses by exact prompt, model and schema, shared by every agent and run",
+    )
+    parser.add_argument("--llm-cache-bypass", action="store_true", help="Do not answer from --llm-cache, only refresh it with new responses")
+    parser.add_argument(
+        "--llm-batch-size",
+        type=int,
+        default=None,
+        help="Tickers per LLM request in the investor persona agents; above 1, their prompts share one request (default: LLM_BATCH_SIZE or 1)",
+    )
 
     args = parser.parse_args()
+    set_data_mode(args.data_mode, args.data_dir)
+    set_decision_store(args.decision_store)
+    set_response_cache(args.llm_cache, bypass=args.llm_cache_bypass or os.environ.get("LLM_RESPONSE_CACHE_BYPASS") == "1")
+    set_llm_batch_size(args.llm_batch_size)
 
     # Parse tickers from comma-separated string
     tickers = [ticker.strip() for ticker in args.tickers.split(",")]
@@ -1,57 +1,79 @@
 import datetime
-import os
 
 import pandas as pd
-import requests
 
-from src.data.cache import get_cache
 from src.data.models import (
     CompanyFactsResponse,
     CompanyNews,
-    CompanyNewsResponse,
     FinancialMetrics,
-    FinancialMetricsResponse,
     InsiderTrade,
-    InsiderTradeResponse,
     LineItem,
-    LineItemResponse,
     Price,
-    PriceResponse,
+)
+from src.tools.client import get_client
+from src.tools.endpoints import (
+    cache,
+    cached_line_items,
+    canonical_requests,
+    company_news_params,
+    filings_cache_key,
+    financial_metrics_cache_key,
+    financial_metrics_params,
+    in_flight,
+    insider_trades_params,
+    line_items_body,
+    line_items_cache_key,
+    line_items_coalescer,
+    next_page_end_date,
+    parse_company_news,
+    parse_financial_metrics,
+    parse_insider_trades,
+    parse_line_items,
+    parse_prices,
+    prices_params,
+    stats,
+    store_company_news,
+    store_financial_metrics,
+    store_insider_trades,
+    store_line_items,
+    store_prices,
 )
 
-# Global cache instance
-_cache = get_cache()
+# Global API client instance
+_client = get_client()
 
 
 def get_prices(ticker: str, start_date: str, end_date: str) -> list[Price]:
-    """Fetch price data from cache or API."""
-    # Create a cache key that includes all parameters to ensure exact matches
-    cache_key = f"{ticker}_{start_date}_{end_date}"
+    """Fetch price data from cache or API, only requesting the date ranges that are not cached yet."""
+    _fetch_missing_prices(ticker, start_date, end_date)
+    return [Price(**price) for price in cache.get_price_range(ticker, start_date, end_date)]
 
-    # Check cache first - simple exact match
-    if cached_data := _cache.get_prices(cache_key):
-        return [Price(**price) for price in cached_data]
 
-    # If not in cache, fetch from API
-    headers = {}
-    if api_key := os.environ.get("FINANCIAL_DATASETS_API_KEY"):
-        headers["X-API-KEY"] = api_key
+def get_price_frame(ticker: str, start_date: str, end_date: str) -> pd.DataFrame:
+    """
+    Fetch price data as a DataFrame indexed by Date with open, close, high, low and volume columns.
+    Cache hits are sliced from per-ticker column arrays without building Price objects.
+    """
+    _fetch_missing_prices(ticker, start_date, end_date)
+    return cache.get_price_frame(ticker, start_date, end_date)
 
-    url = f"https://api.financialdatasets.ai/prices/?ticker={ticker}&interval=day&interval_multiplier=1&start_date={start_date}&end_date={end_date}"
-    response = requests.get(url, headers=headers)
-    if response.status_code != 200:
-        raise Exception(f"Error fetching data: {ticker} - {response.status_code} - {response.text}")
 
-    # Parse response with Pydantic model
-    price_response = PriceResponse(**response.json())
-    prices = price_response.prices
+def _fetch_missing_prices(ticker: str, start_date: str, end_date: str):
+    def fetch(gaps: list[tuple[str, str]]):
+        for gap_start, gap_end in gaps:
+            response = _client.get("/prices/", params=prices_params(ticker, gap_start, gap_end))
+            store_prices(ticker, gap_start, gap_end, parse_prices(ticker, response))
 
-    if not prices:
-        return []
+    if canonical_requests():
+        in_flight.do(("prices", ticker, start_date, end_date), lambda: fetch([(start_date, end_date)]))
+        return
 
-    # Cache the results using the comprehensive cache key
-    _cache.set_prices(cache_key, [p.model_dump() for p in prices])
-    return prices
+    # One price fetch per ticker at a time; callers that waited re-check what is still missing
+    gaps = cache.get_missing_price_ranges(ticker, start_date, end_date)
+    stats.record_lookup("prices", ticker, hit=not gaps)
+    while gaps:
+        in_flight.do(("prices", ticker), lambda gaps=gaps: fetch(gaps))
+        gaps = cache.get_missing_price_ranges(ticker, start_date, end_date)
 
 
 def get_financial_metrics(
@@ -62,32 +84,20 @@ def get_financial_metrics(
 ) -> list[FinancialMetrics]:
     """Fetch financial metrics from cache or API."""
     # Create a cache key that includes all parameters to ensure exact matches
-    cache_key = f"{ticker}_{period}_{end_date}_{limit}"
+    cache_key = financial_metrics_cache_key(ticker, end_date, period, limit)
 
     # Check cache first - simple exact match
-    if cached_data := _cache.get_financial_metrics(cache_key):
+    cached_data = cache.get_financial_metrics(cache_key)
+    stats.record_lookup("financial_metrics", ticker, hit=bool(cached_data))
+    if cached_data and not canonical_requests():
         return [FinancialMetrics(**metric) for metric in cached_data]
 
     # If not in cache, fetch from API
-    headers = {}
-    if api_key := os.environ.get("FINANCIAL_DATASETS_API_KEY"):
-        headers["X-API-KEY"] = api_key
+    def fetch():
+        response = _client.get("/financial-metrics/", params=financial_metrics_params(ticker, end_date, period, limit))
+        return store_financial_metrics(cache_key, parse_financial_metrics(ticker, response))
 
-    url = f"https://api.financialdatasets.ai/financial-metrics/?ticker={ticker}&report_period_lte={end_date}&limit={limit}&period={period}"
-    response = requests.get(url, headers=headers)
-    if response.status_code != 200:
-        raise Exception(f"Error fetching data: {ticker} - {response.status_code} - {response.text}")
-
-    # Parse response with Pydantic model
-    metrics_response = FinancialMetricsResponse(**response.json())
-    financial_metrics = metrics_response.financial_metrics
-
-    if not financial_metrics:
-        return []
-
-    # Cache the results as dicts using the comprehensive cache key
-    _cache.set_financial_metrics(cache_key, [m.model_dump() for m in financial_metrics])
-    return financial_metrics
+    return in_flight.do(("financial_metrics", cache_key), fetch)
 
 
 def search_line_items(
@@ -97,32 +107,29 @@ def search_line_items(
     period: str = "ttm",
     limit: int = 10,
 ) -> list[LineItem]:
-    """Fetch line items from API."""
-    # If not in cache or insufficient data, fetch from API
-    headers = {}
-    if api_key := os.environ.get("FINANCIAL_DATASETS_API_KEY"):
-        headers["X-API-KEY"] = api_key
-
-    url = "https://api.financialdatasets.ai/financials/search/line-items"
-
-    body = {
-        "tickers": [ticker],
-        "line_items": line_items,
-        "end_date": end_date,
-        "period": period,
-        "limit": limit,
-    }
-    response = requests.post(url, headers=headers, json=body)
-    if response.status_code != 200:
-        raise Exception(f"Error fetching data: {ticker} - {response.status_code} - {response.text}")
-    data = response.json()
-    response_model = LineItemResponse(**data)
-    search_results = response_model.search_results
-    if not search_results:
-        return []
+    """
+    Fetch line items from cache or API.
+
+    Results are cached per (ticker, period, end_date, limit) query, with the fields of each report
+    period merged across requests, so a request only fetches the line items that are not cached yet.
+    Concurrent requests for the same query wait for line items that are already being fetched instead of
+    fetching them again.
+    """
+    cache_key = line_items_cache_key(ticker, end_date, period, limit)
+
+    def fetch(fields: list[str]):
+        response = _client.post("/financials/search/line-items", json=line_items_body(ticker, fields, end_date, period, limit))
+        store_line_items(cache_key, fields, parse_line_items(ticker, response))
 
-    # Cache the results
-    return search_results[:limit]
+    if canonical_requests():
+        fetch(list(line_items))
+        return cached_line_items(cache_key, line_items, limit)
+
+    missing = cache.get_missing_line_items(cache_key, line_items)
+    stats.record_lookup("line_items", ticker, hit=not missing)
+    if missing:
+        line_items_coalescer.request(cache_key, missing, fetch)
+    return cached_line_items(cache_key, line_items, limit)
 
 
 def get_insider_trades(
@@ -131,57 +138,57 @@ def get_insider_trades(
     start_date: str | None = None,
     limit: int = 1000,
 ) -> list[InsiderTrade]:
-    """Fetch insider trades from cache or API."""
-    # Create a cache key that includes all parameters to ensure exact matches
-    cache_key = f"{ticker}_{start_date or 'none'}_{end_date}_{limit}"
+    """
+    Fetch insider trades from cache or API, newest first.
+    With a start_date, trades are cached per ticker and only filing dates not cached yet are requested.
+    """
+    if start_date:
+        _fetch_missing_insider_trades(ticker, start_date, end_date, limit)
+        return [InsiderTrade(**trade) for trade in reversed(cache.get_insider_trade_range(ticker, start_date, end_date))]
+
+    # Without a start_date the result is the latest `limit` trades, so cache it under the exact query
+    cache_key = filings_cache_key(ticker, end_date, start_date, limit)
 
     # Check cache first - simple exact match
-    if cached_data := _cache.get_insider_trades(cache_key):
+    cached_data = cache.get_insider_trades(cache_key)
+    stats.record_lookup("insider_trades", ticker, hit=bool(cached_data))
+    if cached_data and not canonical_requests():
         return [InsiderTrade(**trade) for trade in cached_data]
 
     # If not in cache, fetch from API
-    headers = {}
-    if api_key := os.environ.get("FINANCIAL_DATASETS_API_KEY"):
-        headers["X-API-KEY"] = api_key
+    def fetch():
+        return store_insider_trades(cache_key, end_date, _fetch_insider_trades(ticker, end_date, start_date, limit))
 
-    all_trades = []
-    current_end_date = end_date
-
-    while True:
-        url = f"https://api.financialdatasets.ai/insider-trades/?ticker={ticker}&filing_date_lte={current_end_date}"
-        if start_date:
-            url += f"&filing_date_gte={start_date}"
-        url += f"&limit={limit}"
+    return in_flight.do(("insider_trades", cache_key), fetch)
 
-        response = requests.get(url, headers=headers)
-        if response.status_code != 200:
-            raise Exception(f"Error fetching data: {ticker} - {response.status_code} - {response.text}")
 
-        data = response.json()
-        response_model = InsiderTradeResponse(**data)
-        insider_trades = response_model.insider_trades
+def _fetch_missing_insider_trades(ticker: str, start_date: str, end_date: str, limit: int):
+    def fetch(gaps: list[tuple[str, str]]):
+        for gap_start, gap_end in gaps:
+            trades = _fetch_insider_trades(ticker, gap_end, gap_start, limit)
+            cache.set_insider_trades(ticker, [trade.model_dump() for trade in trades], start_date=gap_start, end_date=gap_end)
 
-        if not insider_trades:
-            break
-
-        all_trades.extend(insider_trades)
+    if canonical_requests():
+        in_flight.do(("insider_trades", ticker, start_date, end_date), lambda: fetch([(start_date, end_date)]))
+        return
 
-        # Only continue pagination if we have a start_date and got a full page
-        if not start_date or len(insider_trades) < limit:
-            break
+    gaps = cache.get_missing_insider_trade_ranges(ticker, start_date, end_date)
+    stats.record_lookup("insider_trades", ticker, hit=not gaps)
+    while gaps:
+        in_flight.do(("insider_trades", ticker), lambda gaps=gaps: fetch(gaps))
+        gaps = cache.get_missing_insider_trade_ranges(ticker, start_date, end_date)
 
-        # Update end_date to the oldest filing date from current batch for next iteration
-        current_end_date = min(trade.filing_date for trade in insider_trades).split("T")[0]
 
-        # If we've reached or passed the start_date, we can stop
-        if current_end_date <= start_date:
-            break
+def _fetch_insider_trades(ticker: str, end_date: str, start_date: str | None, limit: int) -> list[InsiderTrade]:
+    all_trades = []
+    current_end_date = end_date
 
-    if not all_trades:
-        return []
+    while current_end_date:
+        response = _client.get("/insider-trades/", params=insider_trades_params(ticker, current_end_date, start_date, limit))
+        insider_trades = parse_insider_trades(ticker, response)
+        all_trades.extend(insider_trades)
+        current_end_date = next_page_end_date([trade.filing_date for trade in insider_trades], start_date, limit)
 
-    # Cache the results using the comprehensive cache key
-    _cache.set_insider_trades(cache_key, [trade.model_dump() for trade in all_trades])
     return all_trades
 
 
@@ -191,57 +198,57 @@ def get_company_news(
     start_date: str | None = None,
     limit: int = 1000,
 ) -> list[CompanyNews]:
-    """Fetch company news from cache or API."""
-    # Create a cache key that includes all parameters to ensure exact matches
-    cache_key = f"{ticker}_{start_date or 'none'}_{end_date}_{limit}"
+    """
+    Fetch company news from cache or API, newest first.
+    With a start_date, news is cached per ticker and only dates not cached yet are requested.
+    """
+    if start_date:
+        _fetch_missing_company_news(ticker, start_date, end_date, limit)
+        return [CompanyNews(**news) for news in reversed(cache.get_company_news_range(ticker, start_date, end_date))]
+
+    # Without a start_date the result is the latest `limit` articles, so cache it under the exact query
+    cache_key = filings_cache_key(ticker, end_date, start_date, limit)
 
     # Check cache first - simple exact match
-    if cached_data := _cache.get_company_news(cache_key):
+    cached_data = cache.get_company_news(cache_key)
+    stats.record_lookup("company_news", ticker, hit=bool(cached_data))
+    if cached_data and not canonical_requests():
         return [CompanyNews(**news) for news in cached_data]
 
     # If not in cache, fetch from API
-    headers = {}
-    if api_key := os.environ.get("FINANCIAL_DATASETS_API_KEY"):
-        headers["X-API-KEY"] = api_key
+    def fetch():
+        return store_company_news(cache_key, end_date, _fetch_company_news(ticker, end_date, start_date, limit))
 
-    all_news = []
-    current_end_date = end_date
-
-    while True:
-        url = f"https://api.financialdatasets.ai/news/?ticker={ticker}&end_date={current_end_date}"
-        if start_date:
-            url += f"&start_date={start_date}"
-        url += f"&limit={limit}"
+    return in_flight.do(("company_news", cache_key), fetch)
 
-        response = requests.get(url, headers=headers)
-        if response.status_code != 200:
-            raise Exception(f"Error fetching data: {ticker} - {response.status_code} - {response.text}")
 
-        data = response.json()
-        response_model = CompanyNewsResponse(**data)
-        company_news = response_model.news
+def _fetch_missing_company_news(ticker: str, start_date: str, end_date: str, limit: int):
+    def fetch(gaps: list[tuple[str, str]]):
+        for gap_start, gap_end in gaps:
+            company_news = _fetch_company_news(ticker, gap_end, gap_start, limit)
+            cache.set_company_news(ticker, [news.model_dump() for news in company_news], start_date=gap_start, end_date=gap_end)
 
-        if not company_news:
-            break
+    if canonical_requests():
+        in_flight.do(("company_news", ticker, start_date, end_date), lambda: fetch([(start_date, end_date)]))
+        return
 
-        all_news.extend(company_news)
+    gaps = cache.get_missing_company_news_ranges(ticker, start_date, end_date)
+    stats.record_lookup("company_news", ticker, hit=not gaps)
+    while gaps:
+        in_flight.do(("company_news", ticker), lambda gaps=gaps: fetch(gaps))
+        gaps = cache.get_missing_company_news_ranges(ticker, start_date, end_date)
 
-        # Only continue pagination if we have a start_date and got a full page
-        if not start_date or len(company_news) < limit:
-            break
 
-        # Update end_date to the oldest date from current batch for next iteration
-        current_end_date = min(news.date for news in company_news).split("T")[0]
-
-        # If we've reached or passed the start_date, we can stop
-        if current_end_date <= start_date:
-            break
+def _fetch_company_news(ticker: str, end_date: str, start_date: str | None, limit: int) -> list[CompanyNews]:
+    all_news = []
+    current_end_date = end_date
 
-    if not all_news:
-        return []
+    while current_end_date:
+        response = _client.get("/news/", params=company_news_params(ticker, current_end_date, start_date, limit))
+        company_news = parse_company_news(ticker, response)
+        all_news.extend(company_news)
+        current_end_date = next_page_end_date([news.date for news in company_news], start_date, limit)
 
-    # Cache the results using the comprehensive cache key
-    _cache.set_company_news(cache_key, [news.model_dump() for news in all_news])
     return all_news
 
 
@@ -253,19 +260,7 @@ def get_market_cap(
     # Check if end_date is today
     if end_date == datetime.datetime.now().strftime("%Y-%m-%d"):
         # Get the market cap from company facts API
-        headers = {}
-        if api_key := os.environ.get("FINANCIAL_DATASETS_API_KEY"):
-            headers["X-API-KEY"] = api_key
-
-        url = f"https://api.financialdatasets.ai/company/facts/?ticker={ticker}"
-        response = requests.get(url, headers=headers)
-        if response.status_code != 200:
-            print(f"Error fetching company facts: {ticker} - {response.status_code}")
-            return None
-
-        data = response.json()
-        response_model = CompanyFactsResponse(**data)
-        return response_model.company_facts.market_cap
+        return in_flight.do(("company_facts", ticker), lambda: _fetch_current_market_cap(ticker))
 
     financial_metrics = get_financial_metrics(ticker, end_date)
     if not financial_metrics:
@@ -279,6 +274,17 @@ def get_market_cap(
     return market_cap
 
 
+def _fetch_current_market_cap(ticker: str) -> float | None:
+    response = _client.get("/company/facts/", params={"ticker": ticker})
+    if response.status_code != 200:
+        print(f"Error fetching company facts: {ticker} - {response.status_code}")
+        return None
+
+    data = response.json()
+    response_model = CompanyFactsResponse(**data)
+    return response_model.company_facts.market_cap
+
+
 def prices_to_df(prices: list[Price]) -> pd.DataFrame:
     """Convert prices to a DataFrame."""
     df = pd.DataFrame([p.model_dump() for p in prices])
@@ -291,7 +297,7 @@ def prices_to_df(prices: list[Price]) -> pd.DataFrame:
     return df
 
 
-# Update the get_price_data function to use the new functions
 def get_price_data(ticker: str, start_date: str, end_date: str) -> pd.DataFrame:
+    """Price rows as a DataFrame that keeps the raw `time` column; get_price_frame is the faster, numeric-only view."""
     prices = get_prices(ticker, start_date, end_date)
     return prices_to_df(prices)
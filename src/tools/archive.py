@@ -0,0 +1,84 @@
+"""On-disk archive of Financial Datasets API responses for recording and replaying runs."""
+
+import gzip
+import hashlib
+import json
+import os
+import tempfile
+from pathlib import Path
+
+import httpx
+
+DATA_MODES = ("live", "record", "replay")
+
+DEFAULT_ARCHIVE_DIR = ".cache/api_archive"
+
+
+class ArchiveMissError(Exception):
+    """Raised in replay mode when a request has no recorded response."""
+
+
+class ResponseArchive:
+    """
+    Stores one gzip-compressed JSON file per request, named by a hash of the method, URL and body.
+
+    Request headers are not part of the key, so archives do not depend on (or contain) the API key
+    and can be shared between machines. Matching is exact, so in the record and replay modes the
+    fetchers make requests that do not depend on the cache or on timing (see canonical_requests in
+    src/tools/endpoints.py).
+    """
+
+    def __init__(self, path: str | Path = DEFAULT_ARCHIVE_DIR):
+        """
+        :param path: Directory holding the archived responses. Created on first write.
+        """
+        self.path = Path(path)
+
+    @staticmethod
+    def request_key(request: httpx.Request) -> str:
+        digest = hashlib.sha256()
+        digest.update(request.method.encode())
+        digest.update(b"\0")
+        digest.update(str(request.url).encode())
+        digest.update(b"\0")
+        digest.update(request.content)
+        return digest.hexdigest()
+
+    def _file(self, key: str) -> Path:
+        return self.path / key[:2] / f"{key}.json.gz"
+
+    def load(self, request: httpx.Request) -> httpx.Response | None:
+        """Return the recorded response for `request`, or None if it was never recorded."""
+        file = self._file(self.request_key(request))
+        try:
+            with gzip.open(file, "rt", encoding="utf-8") as f:
+                entry = json.load(f)
+        except FileNotFoundError:
+            return None
+        return httpx.Response(
+            entry["status_code"],
+            headers=entry["headers"],
+            content=entry["content"].encode("utf-8"),
+            request=request,
+        )
+
+    def save(self, request: httpx.Request, response: httpx.Response):
+        """Record `response` as the answer to `request`, replacing any previous recording."""
+        file = self._file(self.request_key(request))
+        file.parent.mkdir(parents=True, exist_ok=True)
+        entry = {
+            "method": request.method,
+            "url": str(request.url),
+            "status_code": response.status_code,
+            "headers": {"content-type": response.headers.get("content-type", "application/json")},
+            "content": response.text,
+        }
+        # Write to a temporary file first so concurrent readers never see a partial entry
+        fd, tmp = tempfile.mkstemp(dir=file.parent, suffix=".tmp")
+        try:
+            with os.fdopen(fd, "wb") as raw, gzip.GzipFile(fileobj=raw, mode="wb") as f:
+                f.write(json.dumps(entry).encode("utf-8"))
+            os.replace(tmp, file)
+        except BaseException:
+            os.unlink(tmp)
+            raise
@@ -0,0 +1,268 @@
+"""Asyncio counterparts of the fetchers in src/tools/api.py, sharing the same cache."""
+
+import asyncio
+from collections.abc import Iterable
+from concurrent.futures import ThreadPoolExecutor
+
+from src.data.models import CompanyNews, FinancialMetrics, InsiderTrade, LineItem, Price
+from src.tools.client import get_async_client
+from src.tools.endpoints import (
+    cache,
+    cached_line_items,
+    canonical_requests,
+    company_news_params,
+    filings_cache_key,
+    financial_metrics_cache_key,
+    financial_metrics_params,
+    in_flight,
+    insider_trades_params,
+    line_items_body,
+    line_items_cache_key,
+    line_items_coalescer,
+    next_page_end_date,
+    parse_company_news,
+    parse_financial_metrics,
+    parse_insider_trades,
+    parse_line_items,
+    parse_prices,
+    prices_params,
+    stats,
+    store_company_news,
+    store_financial_metrics,
+    store_insider_trades,
+    store_line_items,
+    store_prices,
+)
+
+# Datasets fetched by prefetch_universe when none are specified
+DEFAULT_PREFETCH_DATASETS = ("prices", "financial_metrics", "insider_trades", "company_news")
+
+
+async def aget_prices(ticker: str, start_date: str, end_date: str) -> list[Price]:
+    """Async version of get_prices."""
+    client = get_async_client()
+
+    async def fetch(gaps: list[tuple[str, str]]):
+        responses = await asyncio.gather(*(client.get("/prices/", params=prices_params(ticker, gap_start, gap_end)) for gap_start, gap_end in gaps))
+        for (gap_start, gap_end), response in zip(gaps, responses, strict=True):
+            store_prices(ticker, gap_start, gap_end, parse_prices(ticker, response))
+
+    if canonical_requests():
+        await in_flight.ado(("prices", ticker, start_date, end_date), lambda: fetch([(start_date, end_date)]))
+        return [Price(**price) for price in cache.get_price_range(ticker, start_date, end_date)]
+
+    gaps = cache.get_missing_price_ranges(ticker, start_date, end_date)
+    stats.record_lookup("prices", ticker, hit=not gaps)
+    while gaps:
+        await in_flight.ado(("prices", ticker), lambda gaps=gaps: fetch(gaps))
+        gaps = cache.get_missing_price_ranges(ticker, start_date, end_date)
+
+    return [Price(**price) for price in cache.get_price_range(ticker, start_date, end_date)]
+
+
+async def aget_financial_metrics(
+    ticker: str,
+    end_date: str,
+    period: str = "ttm",
+    limit: int = 10,
+) -> list[FinancialMetrics]:
+    """Async version of get_financial_metrics."""
+    cache_key = financial_metrics_cache_key(ticker, end_date, period, limit)
+    cached_data = cache.get_financial_metrics(cache_key)
+    stats.record_lookup("financial_metrics", ticker, hit=bool(cached_data))
+    if cached_data and not canonical_requests():
+        return [FinancialMetrics(**metric) for metric in cached_data]
+
+    async def fetch():
+        response = await get_async_client().get("/financial-metrics/", params=financial_metrics_params(ticker, end_date, period, limit))
+        return store_financial_metrics(cache_key, parse_financial_metrics(ticker, response))
+
+    return await in_flight.ado(("financial_metrics", cache_key), fetch)
+
+
+async def asearch_line_items(
+    ticker: str,
+    line_items: list[str],
+    end_date: str,
+    period: str = "ttm",
+    limit: int = 10,
+) -> list[LineItem]:
+    """Async version of search_line_items. Shares its cache and its coalescer, so sync and async callers share fetches."""
+    cache_key = line_items_cache_key(ticker, end_date, period, limit)
+
+    async def fetch(fields: list[str]):
+        response = await get_async_client().post("/financials/search/line-items", json=line_items_body(ticker, fields, end_date, period, limit))
+        store_line_items(cache_key, fields, parse_line_items(ticker, response))
+
+    if canonical_requests():
+        await fetch(list(line_items))
+        return cached_line_items(cache_key, line_items, limit)
+
+    missing = cache.get_missing_line_items(cache_key, line_items)
+    stats.record_lookup("line_items", ticker, hit=not missing)
+    if missing:
+        await line_items_coalescer.arequest(cache_key, missing, fetch)
+    return cached_line_items(cache_key, line_items, limit)
+
+
+async def aget_insider_trades(
+    ticker: str,
+    end_date: str,
+    start_date: str | None = None,
+    limit: int = 1000,
+) -> list[InsiderTrade]:
+    """Async version of get_insider_trades."""
+    if start_date:
+
+        async def fetch_gaps(gaps: list[tuple[str, str]]):
+            results = await asyncio.gather(*(_afetch_insider_trades(ticker, gap_end, gap_start, limit) for gap_start, gap_end in gaps))
+            for (gap_start, gap_end), trades in zip(gaps, results, strict=True):
+                cache.set_insider_trades(ticker, [trade.model_dump() for trade in trades], start_date=gap_start, end_date=gap_end)
+
+        if canonical_requests():
+            await in_flight.ado(("insider_trades", ticker, start_date, end_date), lambda: fetch_gaps([(start_date, end_date)]))
+        else:
+            gaps = cache.get_missing_insider_trade_ranges(ticker, start_date, end_date)
+            stats.record_lookup("insider_trades", ticker, hit=not gaps)
+            while gaps:
+                await in_flight.ado(("insider_trades", ticker), lambda gaps=gaps: fetch_gaps(gaps))
+                gaps = cache.get_missing_insider_trade_ranges(ticker, start_date, end_date)
+        return [InsiderTrade(**trade) for trade in reversed(cache.get_insider_trade_range(ticker, start_date, end_date))]
+
+    cache_key = filings_cache_key(ticker, end_date, start_date, limit)
+    cached_data = cache.get_insider_trades(cache_key)
+    stats.record_lookup("insider_trades", ticker, hit=bool(cached_data))
+    if cached_data and not canonical_requests():
+        return [InsiderTrade(**trade) for trade in cached_data]
+
+    async def fetch():
+        return store_insider_trades(cache_key, end_date, await _afetch_insider_trades(ticker, end_date, start_date, limit))
+
+    return await in_flight.ado(("insider_trades", cache_key), fetch)
+
+
+async def _afetch_insider_trades(ticker: str, end_date: str, start_date: str | None, limit: int) -> list[InsiderTrade]:
+    client = get_async_client()
+    all_trades = []
+    current_end_date = end_date
+    while current_end_date:
+        response = await client.get("/insider-trades/", params=insider_trades_params(ticker, current_end_date, start_date, limit))
+        insider_trades = parse_insider_trades(ticker, response)
+        all_trades.extend(insider_trades)
+        current_end_date = next_page_end_date([trade.filing_date for trade in insider_trades], start_date, limit)
+    return all_trades
+
+
+async def aget_company_news(
+    ticker: str,
+    end_date: str,
+    start_date: str | None = None,
+    limit: int = 1000,
+) -> list[CompanyNews]:
+    """Async version of get_company_news."""
+    if start_date:
+
+        async def fetch_gaps(gaps: list[tuple[str, str]]):
+            results = await asyncio.gather(*(_afetch_company_news(ticker, gap_end, gap_start, limit) for gap_start, gap_end in gaps))
+            for (gap_start, gap_end), company_news in zip(gaps, results, strict=True):
+                cache.set_company_news(ticker, [news.model_dump() for news in company_news], start_date=gap_start, end_date=gap_end)
+
+        if canonical_requests():
+            await in_flight.ado(("company_news", ticker, start_date, end_date), lambda: fetch_gaps([(start_date, end_date)]))
+        else:
+            gaps = cache.get_missing_company_news_ranges(ticker, start_date, end_date)
+            stats.record_lookup("company_news", ticker, hit=not gaps)
+            while gaps:
+                await in_flight.ado(("company_news", ticker), lambda gaps=gaps: fetch_gaps(gaps))
+                gaps = cache.get_missing_company_news_ranges(ticker, start_date, end_date)
+        return [CompanyNews(**news) for news in reversed(cache.get_company_news_range(ticker, start_date, end_date))]
+
+    cache_key = filings_cache_key(ticker, end_date, start_date, limit)
+    cached_data = cache.get_company_news(cache_key)
+    stats.record_lookup("company_news", ticker, hit=bool(cached_data))
+    if cached_data and not canonical_requests():
+        return [CompanyNews(**news) for news in cached_data]
+
+    async def fetch():
+        return store_company_news(cache_key, end_date, await _afetch_company_news(ticker, end_date, start_date, limit))
+
+    return await in_flight.ado(("company_news", cache_key), fetch)
+
+
+async def _afetch_company_news(ticker: str, end_date: str, start_date: str | None, limit: int) -> list[CompanyNews]:
+    client = get_async_client()
+    all_news = []
+    current_end_date = end_date
+    while current_end_date:
+        response = await client.get("/news/", params=company_news_params(ticker, current_end_date, start_date, limit))
+        company_news = parse_company_news(ticker, response)
+        all_news.extend(company_news)
+        current_end_date = next_page_end_date([news.date for news in company_news], start_date, limit)
+    return all_news
+
+
+async def aprefetch_universe(
+    tickers: list[str],
+    start_date: str,
+    end_date: str,
+    datasets: Iterable[str] = DEFAULT_PREFETCH_DATASETS,
+    price_start_date: str | None = None,
+    max_concurrency: int = 16,
+) -> dict[tuple[str, str], Exception]:
+    """
+    Fetch every (ticker, dataset) pair concurrently into the shared cache.
+
+    Arguments match what the agents and backtester later request: prices cover
+    [price_start_date or start_date, end_date], financial metrics are the 10 latest TTM
+    reports up to end_date, and insider trades and news cover [start_date, end_date].
+    Failures do not abort the prefetch; they are returned keyed by (ticker, dataset) so the
+    synchronous fetchers can retry them on demand.
+    """
+    fetchers = {
+        "prices": lambda ticker: aget_prices(ticker, price_start_date or start_date, end_date),
+        "financial_metrics": lambda ticker: aget_financial_metrics(ticker, end_date, limit=10),
+        "insider_trades": lambda ticker: aget_insider_trades(ticker, end_date, start_date=start_date, limit=1000),
+        "company_news": lambda ticker: aget_company_news(ticker, end_date, start_date=start_date, limit=1000),
+    }
+    # A generator would be exhausted by the check below
+    datasets = tuple(datasets)
+    unknown = set(datasets) - fetchers.keys()
+    if unknown:
+        raise ValueError(f"Unknown datasets for prefetch: {sorted(unknown)}")
+
+    semaphore = asyncio.Semaphore(max_concurrency)
+
+    async def fetch(ticker: str, dataset: str):
+        async with semaphore:
+            await fetchers[dataset](ticker)
+
+    jobs = [(ticker, dataset) for ticker in tickers for dataset in datasets]
+    results = await asyncio.gather(*(fetch(ticker, dataset) for ticker, dataset in jobs), return_exceptions=True)
+    return {job: result for job, result in zip(jobs, results, strict=True) if isinstance(result, Exception)}
+
+
+def prefetch_universe(
+    tickers: list[str],
+    start_date: str,
+    end_date: str,
+    datasets: Iterable[str] = DEFAULT_PREFETCH_DATASETS,
+    price_start_date: str | None = None,
+    max_concurrency: int = 16,
+) -> dict[tuple[str, str], Exception]:
+    """
+    Blocking wrapper around aprefetch_universe for synchronous callers. When the calling thread already
+    runs an event loop, the prefetch runs on its own loop in a worker thread.
+    """
+
+    async def run():
+        try:
+            return await aprefetch_universe(tickers, start_date, end_date, tuple(datasets), price_start_date, max_concurrency)
+        finally:
+            await get_async_client().aclose()
+
+    try:
+        asyncio.get_running_loop()
+    except RuntimeError:
+        return asyncio.run(run())
+    with ThreadPoolExecutor(max_workers=1) as executor:
+        return executor.submit(asyncio.run, run()).result()
@@ -0,0 +1,353 @@
+"""Shared HTTP client for the Financial Datasets API."""
+
+import asyncio
+import os
+import random
+import threading
+import time
+import weakref
+from datetime import UTC, datetime
+from email.utils import parsedate_to_datetime
+
+import httpx
+
+from src.data.stats import get_stats, request_labels
+from src.tools.archive import DATA_MODES, DEFAULT_ARCHIVE_DIR, ArchiveMissError, ResponseArchive
+
+BASE_URL = "https://api.financialdatasets.ai"
+
+# Status codes that are worth retrying: rate limiting and transient server errors
+RETRY_STATUS_CODES = {429, 500, 502, 503, 504}
+
+
+def _env_float(name: str, default: float) -> float:
+    value = os.environ.get(name)
+    return float(value) if value else default
+
+
+def _env_int(name: str, default: int) -> int:
+    value = os.environ.get(name)
+    return int(value) if value else default
+
+
+def parse_retry_after(value: str | None) -> float | None:
+    """Parse a Retry-After header given either as delay seconds or as an HTTP date."""
+    if not value:
+        return None
+    try:
+        return max(0.0, float(value))
+    except ValueError:
+        pass
+    try:
+        retry_at = parsedate_to_datetime(value)
+    except (TypeError, ValueError):
+        return None
+    if retry_at.tzinfo is None:
+        retry_at = retry_at.replace(tzinfo=UTC)
+    return max(0.0, (retry_at - datetime.now(UTC)).total_seconds())
+
+
+class _BaseClient:
+    """Settings, headers and backoff policy shared by the sync and async clients."""
+
+    def __init__(
+        self,
+        base_url: str = BASE_URL,
+        timeout: float | None = None,
+        max_retries: int | None = None,
+        backoff_base: float = 0.5,
+        backoff_max: float = 30.0,
+        max_connections: int | None = None,
+        max_concurrency_per_host: int | None = None,
+        transport: httpx.BaseTransport | httpx.AsyncBaseTransport | None = None,
+        data_mode: str = "live",
+        archive: ResponseArchive | None = None,
+    ):
+        """
+        :param base_url: Base URL that relative request paths are resolved against.
+        :param timeout: Request timeout in seconds (FINANCIAL_DATASETS_TIMEOUT, default 30).
+        :param max_retries: Retries after the first attempt (FINANCIAL_DATASETS_MAX_RETRIES, default 5).
+        :param backoff_base: Backoff ceiling for the first retry, doubled on every further retry.
+        :param backoff_max: Upper bound for a single backoff delay.
+        :param max_connections: Size of the connection pool (FINANCIAL_DATASETS_MAX_CONNECTIONS, default 20).
+        :param max_concurrency_per_host: In-flight requests allowed per host (FINANCIAL_DATASETS_MAX_CONCURRENCY, default 8).
+        :param transport: Optional httpx transport, e.g. a MockTransport in tests.
+        :param data_mode: "live" talks to the API, "record" also saves every response to `archive`,
+            "replay" answers only from `archive` and never touches the network.
+        :param archive: Response archive used by the record and replay modes.
+        """
+        self.base_url = base_url
+        self.timeout = timeout
+        self.max_retries = max_retries
+        self.backoff_base = backoff_base
+        self.backoff_max = backoff_max
+        self.max_connections = max_connections
+        self.max_concurrency_per_host = max_concurrency_per_host
+        self.transport = transport
+        self.set_data_mode(data_mode, archive)
+        self._lock = threading.Lock()
+
+    def set_data_mode(self, data_mode: str, archive: ResponseArchive | None = None):
+        if data_mode not in DATA_MODES:
+            raise ValueError(f"Unknown data mode: {data_mode}. Expected one of {', '.join(DATA_MODES)}")
+        if data_mode != "live" and archive is None:
+            raise ValueError(f"Data mode {data_mode} requires a response archive")
+        self.data_mode = data_mode
+        self.archive = archive
+        # Requests already recorded by this client; repeats are answered from the archive
+        self._recorded: set[str] = set()
+
+    def _replay(self, request: httpx.Request) -> httpx.Response:
+        response = self.archive.load(request)
+        if response is None:
+            raise ArchiveMissError(f"No recorded response for {request.method} {request.url} in {self.archive.path}")
+        return response
+
+    def _configure(self):
+        """Fill unset settings from the environment."""
+        if self.timeout is None:
+            self.timeout = _env_float("FINANCIAL_DATASETS_TIMEOUT", 30.0)
+        if self.max_retries is None:
+            self.max_retries = _env_int("FINANCIAL_DATASETS_MAX_RETRIES", 5)
+        if self.max_connections is None:
+            self.max_connections = _env_int("FINANCIAL_DATASETS_MAX_CONNECTIONS", 20)
+        if self.max_concurrency_per_host is None:
+            self.max_concurrency_per_host = _env_int("FINANCIAL_DATASETS_MAX_CONCURRENCY", 8)
+
+    def _client_kwargs(self) -> dict:
+        return {
+            "base_url": self.base_url,
+            "timeout": self.timeout,
+            "limits": httpx.Limits(max_connections=self.max_connections, max_keepalive_connections=self.max_connections),
+            "transport": self.transport,
+        }
+
+    def _headers(self, extra: dict[str, str] | None = None) -> dict[str, str]:
+        headers = {}
+        if api_key := os.environ.get("FINANCIAL_DATASETS_API_KEY"):
+            headers["X-API-KEY"] = api_key
+        return {**headers, **(extra or {})}
+
+    def _should_retry(self, attempt: int, response: httpx.Response | None) -> bool:
+        """Whether to retry after attempt number `attempt` (0-based); a None response means a transport error."""
+        if attempt >= self.max_retries:
+            return False
+        return response is None or response.status_code in RETRY_STATUS_CODES
+
+    def _record(self, url: str, kwargs: dict, started: float, attempt: int, response: httpx.Response | None):
+        """Account a finished request, with all of its retries, in the global data stats."""
+        dataset, ticker = request_labels(url, kwargs.get("params"), kwargs.get("json"))
+        failed = response is None or response.status_code >= 400
+        get_stats().record_request(dataset, ticker, time.perf_counter() - started, attempts=attempt + 1, failed=failed)
+
+    def backoff_delay(self, attempt: int, response: httpx.Response | None = None) -> float:
+        """
+        Delay before retry number `attempt` (0-based): Retry-After if given, else full-jitter exponential backoff.
+        Either way the delay is capped at backoff_max, so a misbehaving server cannot park a worker indefinitely.
+        """
+        if response is not None:
+            retry_after = parse_retry_after(response.headers.get("Retry-After"))
+            if retry_after is not None:
+                return min(retry_after, self.backoff_max)
+        return random.uniform(0, min(self.backoff_max, self.backoff_base * 2**attempt))
+
+
+class FinancialDatasetsClient(_BaseClient):
+    """
+    Pooled HTTP client with timeouts, retries and a per-host concurrency cap.
+
+    Connections are kept alive across calls. Requests that fail with a transport error or
+    a retryable status code are retried with exponential backoff and full jitter, honouring
+    the server's Retry-After header when present. Settings left as None are read from the
+    environment when the first request is made, so values loaded from .env are picked up.
+    """
+
+    def __init__(self, *args, **kwargs):
+        super().__init__(*args, **kwargs)
+        self._client: httpx.Client | None = None
+        self._host_semaphores: dict[str, threading.BoundedSemaphore] = {}
+
+    def _get_client(self) -> httpx.Client:
+        if self._client is None:
+            with self._lock:
+                if self._client is None:
+                    self._configure()
+                    self._client = httpx.Client(**self._client_kwargs())
+        return self._client
+
+    def _get_host_semaphore(self, host: str) -> threading.BoundedSemaphore:
+        with self._lock:
+            if host not in self._host_semaphores:
+                self._host_semaphores[host] = threading.BoundedSemaphore(self.max_concurrency_per_host)
+            return self._host_semaphores[host]
+
+    def request(self, method: str, url: str, **kwargs) -> httpx.Response:
+        """
+        Send a request, retrying transport errors and retryable status codes.
+        Returns the last response once retries are exhausted, so callers can report the error.
+        In replay mode the response comes from the archive; in record mode it is also saved there, and
+        repeats of a request already recorded by this client are answered from the archive.
+        """
+        if self.data_mode == "live":
+            return self._send(method, url, **kwargs)
+
+        request = self._get_client().build_request(method, url, **kwargs)
+        key = self.archive.request_key(request)
+        if self.data_mode == "replay" or key in self._recorded:
+            return self._replay(request)
+        response = self._send(method, url, **kwargs)
+        self.archive.save(request, response)
+        self._recorded.add(key)
+        return response
+
+    def _send(self, method: str, url: str, **kwargs) -> httpx.Response:
+        client = self._get_client()
+        semaphore = self._get_host_semaphore(client.build_request(method, url).url.host)
+        headers = self._headers(kwargs.pop("headers", None))
+
+        started = time.perf_counter()
+        attempt = 0
+        while True:
+            response = None
+            try:
+                with semaphore:
+                    response = client.request(method, url, headers=headers, **kwargs)
+            except httpx.TransportError:
+                if not self._should_retry(attempt, None):
+                    self._record(url, kwargs, started, attempt, None)
+                    raise
+            if response is not None and not self._should_retry(attempt, response):
+                self._record(url, kwargs, started, attempt, response)
+                return response
+            time.sleep(self.backoff_delay(attempt, response))
+            attempt += 1
+
+    def get(self, url: str, params: dict | None = None, **kwargs) -> httpx.Response:
+        return self.request("GET", url, params=params, **kwargs)
+
+    def post(self, url: str, json: dict | None = None, **kwargs) -> httpx.Response:
+        return self.request("POST", url, json=json, **kwargs)
+
+    def close(self):
+        """Close pooled connections."""
+        with self._lock:
+            if self._client is not None:
+                self._client.close()
+                self._client = None
+
+
+class AsyncFinancialDatasetsClient(_BaseClient):
+    """
+    Asyncio counterpart of FinancialDatasetsClient with the same retry and concurrency policy.
+
+    An instance is bound to the event loop it is first used on; use get_async_client() to get
+    the instance for the running loop.
+    """
+
+    def __init__(self, *args, **kwargs):
+        super().__init__(*args, **kwargs)
+        self._client: httpx.AsyncClient | None = None
+        self._host_semaphores: dict[str, asyncio.Semaphore] = {}
+
+    def _get_client(self) -> httpx.AsyncClient:
+        if self._client is None:
+            self._configure()
+            self._client = httpx.AsyncClient(**self._client_kwargs())
+        return self._client
+
+    def _get_host_semaphore(self, host: str) -> asyncio.Semaphore:
+        if host not in self._host_semaphores:
+            self._host_semaphores[host] = asyncio.Semaphore(self.max_concurrency_per_host)
+        return self._host_semaphores[host]
+
+    async def request(self, method: str, url: str, **kwargs) -> httpx.Response:
+        """
+        Send a request, retrying transport errors and retryable status codes.
+        Returns the last response once retries are exhausted, so callers can report the error.
+        In replay mode the response comes from the archive; in record mode it is also saved there, and
+        repeats of a request already recorded by this client are answered from the archive.
+        """
+        if self.data_mode == "live":
+            return await self._send(method, url, **kwargs)
+
+        request = self._get_client().build_request(method, url, **kwargs)
+        key = self.archive.request_key(request)
+        if self.data_mode == "replay" or key in self._recorded:
+            return self._replay(request)
+        response = await self._send(method, url, **kwargs)
+        self.archive.save(request, response)
+        self._recorded.add(key)
+        return response
+
+    async def _send(self, method: str, url: str, **kwargs) -> httpx.Response:
+        client = self._get_client()
+        semaphore = self._get_host_semaphore(client.build_request(method, url).url.host)
+        headers = self._headers(kwargs.pop("headers", None))
+
+        started = time.perf_counter()
+        attempt = 0
+        while True:
+            response = None
+            try:
+                async with semaphore:
+                    response = await client.request(method, url, headers=headers, **kwargs)
+            except httpx.TransportError:
+                if not self._should_retry(attempt, None):
+                    self._record(url, kwargs, started, attempt, None)
+                    raise
+            if response is not None and not self._should_retry(attempt, response):
+                self._record(url, kwargs, started, attempt, response)
+                return response
+            await asyncio.sleep(self.backoff_delay(attempt, response))
+            attempt += 1
+
+    async def get(self, url: str, params: dict | None = None, **kwargs) -> httpx.Response:
+        return await self.request("GET", url, params=params, **kwargs)
+
+    async def post(self, url: str, json: dict | None = None, **kwargs) -> httpx.Response:
+        return await self.request("POST", url, json=json, **kwargs)
+
+    async def aclose(self):
+        """Close pooled connections."""
+        if self._client is not None:
+            await self._client.aclose()
+            self._client = None
+
+
+# Global client instances; async clients are bound to an event loop, so keep one per loop
+_client = FinancialDatasetsClient()
+_async_clients: weakref.WeakKeyDictionary[asyncio.AbstractEventLoop, AsyncFinancialDatasetsClient] = weakref.WeakKeyDictionary()
+_data_mode: tuple[str, ResponseArchive | None] = ("live", None)
+
+
+def set_data_mode(data_mode: str, archive_dir: str | None = None):
+    """
+    Switch the global clients between live, record and replay modes.
+    `archive_dir` defaults to FINANCIAL_DATASETS_ARCHIVE_DIR, then .cache/api_archive.
+    """
+    global _data_mode
+    archive = None
+    if data_mode != "live":
+        archive = ResponseArchive(archive_dir or os.environ.get("FINANCIAL_DATASETS_ARCHIVE_DIR") or DEFAULT_ARCHIVE_DIR)
+    _client.set_data_mode(data_mode, archive)
+    for client in list(_async_clients.values()):
+        client.set_data_mode(data_mode, archive)
+    _data_mode = (data_mode, archive)
+
+
+def get_data_mode() -> str:
+    """The data mode set by set_data_mode: live, record or replay."""
+    return _data_mode[0]
+
+
+def get_client() -> FinancialDatasetsClient:
+    """Get the global Financial Datasets API client."""
+    return _client
+
+
+def get_async_client() -> AsyncFinancialDatasetsClient:
+    """Get the async Financial Datasets API client for the running event loop."""
+    loop = asyncio.get_running_loop()
+    if loop not in _async_clients:
+        _async_clients[loop] = AsyncFinancialDatasetsClient(data_mode=_data_mode[0], archive=_data_mode[1])
+    return _async_clients[loop]
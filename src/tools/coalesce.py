@@ -0,0 +1,110 @@
+"""Coalescing of concurrent requests that can be answered by one combined upstream call."""
+
+import asyncio
+import threading
+import time
+from collections.abc import Awaitable, Callable, Iterable
+from concurrent.futures import Future
+
+
+class _Batch:
+    def __init__(self):
+        self.items: set[str] = set()
+        self.done: Future = Future()
+
+
+class RequestCoalescer:
+    """
+    Merges concurrent requests for the same key into a single fetch of the union of their items.
+
+    Items already being fetched for a key are not fetched again: a caller waits for the in-flight
+    batches that cover some of its items and adds only the rest to the open batch, so every item is
+    fetched by exactly one batch. The first caller for a key opens that batch and, if `window` is set,
+    waits for other callers to add their items before it performs the fetch.
+    """
+
+    def __init__(self, window: float = 0.0):
+        """
+        :param window: Seconds the first caller waits for others to join its batch. 0 fetches at once,
+            so only callers that overlap an in-flight fetch share it.
+        """
+        self.window = window
+        self._open: dict[str, _Batch] = {}
+        self._in_flight: dict[str, list[_Batch]] = {}
+        self._lock = threading.Lock()
+
+    def _join(self, key: str, items: Iterable[str]) -> tuple[_Batch | None, list[_Batch]]:
+        """
+        Add the items that no in-flight batch covers to the open batch for `key`. Return the batch the caller
+        opened (and has to fetch), if any, and every batch the caller has to wait for.
+        """
+        with self._lock:
+            pending = set(items)
+            waits = []
+            for batch in self._in_flight.get(key, []):
+                if pending & batch.items:
+                    waits.append(batch)
+                    pending -= batch.items
+            if not pending:
+                return None, waits
+
+            batch = self._open.get(key)
+            led = None
+            if batch is None:
+                batch = led = self._open[key] = _Batch()
+            batch.items.update(pending)
+            waits.append(batch)
+            return led, waits
+
+    def _close(self, key: str):
+        # Later callers start a new batch and skip the items this one fetches
+        with self._lock:
+            self._in_flight.setdefault(key, []).append(self._open.pop(key))
+
+    def _finish(self, key: str, batch: _Batch, error: BaseException | None):
+        with self._lock:
+            in_flight = self._in_flight[key]
+            in_flight.remove(batch)
+            if not in_flight:
+                del self._in_flight[key]
+        if error is None:
+            batch.done.set_result(None)
+        else:
+            batch.done.set_exception(error)
+
+    def request(self, key: str, items: Iterable[str], fetch: Callable[[list[str]], None]):
+        """
+        Block until `items` for `key` have been fetched.
+        `fetch` receives the sorted items of a batch; exceptions it raises propagate to every caller waiting for it.
+        """
+        batch, waits = self._join(key, items)
+        if batch is not None:
+            if self.window > 0:
+                time.sleep(self.window)
+            self._close(key)
+            error = None
+            try:
+                fetch(sorted(batch.items))
+            except BaseException as e:
+                error = e
+            self._finish(key, batch, error)
+
+        for waited in waits:
+            waited.done.result()
+
+    async def arequest(self, key: str, items: Iterable[str], fetch: Callable[[list[str]], Awaitable[None]]):
+        """Async version of `request`. Coroutines and threads join the same batches."""
+        batch, waits = self._join(key, items)
+        if batch is not None:
+            if self.window > 0:
+                await asyncio.sleep(self.window)
+            self._close(key)
+            error = None
+            try:
+                await fetch(sorted(batch.items))
+            except BaseException as e:
+                error = e
+            self._finish(key, batch, error)
+
+        for waited in waits:
+            await asyncio.wrap_future(waited.done)
@@ -0,0 +1,207 @@
+"""
+Request parameters, response parsing and cache writes of the Financial Datasets endpoints,
+shared by the synchronous fetchers in src/tools/api.py and the async ones in src/tools/async_api.py.
+"""
+
+import os
+
+import httpx
+
+from src.data.cache import get_cache, last_completed_day
+from src.data.models import (
+    CompanyNews,
+    CompanyNewsResponse,
+    FinancialMetrics,
+    FinancialMetricsResponse,
+    InsiderTrade,
+    InsiderTradeResponse,
+    LineItem,
+    LineItemResponse,
+    Price,
+    PriceResponse,
+)
+from src.data.stats import get_stats
+from src.tools.client import get_data_mode
+from src.tools.coalesce import RequestCoalescer
+from src.tools.singleflight import SingleFlight
+
+# Global cache and stats instances
+cache = get_cache()
+stats = get_stats()
+
+# Concurrent callers (e.g. analyst nodes running in parallel) that miss the cache for the same
+# request wait for a single upstream fetch instead of each hitting the API
+in_flight = SingleFlight()
+
+# Agents starting at the same time request overlapping line items for the same ticker; items already
+# being fetched are shared. Requests are keyed by query (ticker, period, end_date, limit) rather than by
+# report period, since the periods a query returns are only known once it has been answered.
+# FINANCIAL_DATASETS_COALESCE_WINDOW_MS makes the first caller wait so concurrent ones can join its call.
+line_items_coalescer = RequestCoalescer(window=float(os.environ.get("FINANCIAL_DATASETS_COALESCE_WINDOW_MS", "0")) / 1000)
+
+
+def canonical_requests() -> bool:
+    """
+    Whether requests have to be made exactly as the caller asked, whatever the cache already holds.
+
+    The record and replay data modes archive responses by exact request, and cache gaps, coalesced line
+    items and concurrent fetches make requests depend on the cache contents and on thread timing. In these
+    modes the fetchers request the caller's whole window and line items instead, so a recording made with
+    a warm cache also replays with a cold one.
+    """
+    return get_data_mode() != "live"
+
+
+def raise_for_status(ticker: str, response: httpx.Response):
+    if response.status_code != 200:
+        raise Exception(f"Error fetching data: {ticker} - {response.status_code} - {response.text}")
+
+
+def next_page_end_date(page_dates: list[str], start_date: str | None, limit: int) -> str | None:
+    """Return the end date for the next page of a paginated endpoint, or None when pagination is done."""
+    # Only continue pagination if we have a start_date and got a full page
+    if not page_dates or not start_date or len(page_dates) < limit:
+        return None
+
+    # Update end_date to the oldest date from current batch for next iteration
+    next_end_date = min(page_dates).split("T")[0]
+
+    # If we've reached or passed the start_date, we can stop
+    if next_end_date <= start_date:
+        return None
+    return next_end_date
+
+
+def prices_params(ticker: str, start_date: str, end_date: str) -> dict:
+    return {
+        "ticker": ticker,
+        "interval": "day",
+        "interval_multiplier": 1,
+        "start_date": start_date,
+        "end_date": end_date,
+    }
+
+
+def parse_prices(ticker: str, response: httpx.Response) -> list[Price]:
+    raise_for_status(ticker, response)
+    # Parse response with Pydantic model
+    price_response = PriceResponse(**response.json())
+    return price_response.prices
+
+
+def store_prices(ticker: str, start_date: str, end_date: str, prices: list[Price]):
+    # Record the range as covered even if it is empty (e.g. weekends and holidays)
+    cache.set_prices(ticker, [p.model_dump() for p in prices], start_date=start_date, end_date=end_date)
+
+
+def financial_metrics_cache_key(ticker: str, end_date: str, period: str, limit: int) -> str:
+    return f"{ticker}_{period}_{end_date}_{limit}"
+
+
+def financial_metrics_params(ticker: str, end_date: str, period: str, limit: int) -> dict:
+    return {
+        "ticker": ticker,
+        "report_period_lte": end_date,
+        "limit": limit,
+        "period": period,
+    }
+
+
+def parse_financial_metrics(ticker: str, response: httpx.Response) -> list[FinancialMetrics]:
+    raise_for_status(ticker, response)
+    # Parse response with Pydantic model
+    metrics_response = FinancialMetricsResponse(**response.json())
+    return metrics_response.financial_metrics
+
+
+def store_financial_metrics(cache_key: str, financial_metrics: list[FinancialMetrics]) -> list[FinancialMetrics]:
+    if not financial_metrics:
+        return []
+
+    # Cache the results as dicts using the comprehensive cache key
+    cache.set_financial_metrics(cache_key, [m.model_dump() for m in financial_metrics])
+    return financial_metrics
+
+
+def line_items_cache_key(ticker: str, end_date: str, period: str, limit: int) -> str:
+    return f"{ticker}_{period}_{end_date}_{limit}"
+
+
+def line_items_body(ticker: str, line_items: list[str], end_date: str, period: str, limit: int) -> dict:
+    return {
+        "tickers": [ticker],
+        "line_items": line_items,
+        "end_date": end_date,
+        "period": period,
+        "limit": limit,
+    }
+
+
+def parse_line_items(ticker: str, response: httpx.Response) -> list[LineItem]:
+    raise_for_status(ticker, response)
+    response_model = LineItemResponse(**response.json())
+    return response_model.search_results
+
+
+def store_line_items(cache_key: str, line_items: list[str], search_results: list[LineItem]):
+    # Record the line items as fetched even if the API had no values for them
+    cache.set_line_items(cache_key, [item.model_dump() for item in search_results], line_items=line_items)
+
+
+def cached_line_items(cache_key: str, line_items: list[str], limit: int) -> list[LineItem]:
+    """Project the cached report periods onto the requested line items."""
+    fields = {"ticker", "report_period", "period", "currency", *line_items}
+    rows = cache.get_line_items(cache_key) or []
+    return [LineItem(**{field: value for field, value in row.items() if field in fields}) for row in rows[:limit]]
+
+
+def filings_cache_key(ticker: str, end_date: str, start_date: str | None, limit: int) -> str:
+    return f"{ticker}_{start_date or 'none'}_{end_date}_{limit}"
+
+
+def insider_trades_params(ticker: str, end_date: str, start_date: str | None, limit: int) -> dict:
+    params = {"ticker": ticker, "filing_date_lte": end_date}
+    if start_date:
+        params["filing_date_gte"] = start_date
+    params["limit"] = limit
+    return params
+
+
+def parse_insider_trades(ticker: str, response: httpx.Response) -> list[InsiderTrade]:
+    raise_for_status(ticker, response)
+    response_model = InsiderTradeResponse(**response.json())
+    return response_model.insider_trades
+
+
+def store_insider_trades(cache_key: str, end_date: str, all_trades: list[InsiderTrade]) -> list[InsiderTrade]:
+    if not all_trades:
+        return []
+
+    # Cache the results using the comprehensive cache key. The latest trades up to today can
+    # still change, so only results for completed days are persisted.
+    cache.set_insider_trades(cache_key, [trade.model_dump() for trade in all_trades], persist=end_date <= last_completed_day())
+    return all_trades
+
+
+def company_news_params(ticker: str, end_date: str, start_date: str | None, limit: int) -> dict:
+    params = {"ticker": ticker, "end_date": end_date}
+    if start_date:
+        params["start_date"] = start_date
+    params["limit"] = limit
+    return params
+
+
+def parse_company_news(ticker: str, response: httpx.Response) -> list[CompanyNews]:
+    raise_for_status(ticker, response)
+    response_model = CompanyNewsResponse(**response.json())
+    return response_model.news
+
+
+def store_company_news(cache_key: str, end_date: str, all_news: list[CompanyNews]) -> list[CompanyNews]:
+    if not all_news:
+        return []
+
+    # Cache the results using the comprehensive cache key. The latest news up to today can
+    # still change, so only results for completed days are persisted.
+    cache.set_company_news(cache_key, [news.model_dump() for news in all_news], persist=end_date <= last_completed_day())
+    return all_news
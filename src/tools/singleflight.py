@@ -0,0 +1,68 @@
+"""Single-flight de-duplication of concurrent calls that share a key."""
+
+import asyncio
+import threading
+from collections.abc import Awaitable, Callable, Hashable
+from concurrent.futures import Future
+from typing import TypeVar
+
+T = TypeVar("T")
+
+
+class SingleFlight:
+    """
+    Ensures that only one call per key is in flight at a time.
+
+    The first caller for a key runs the work; callers that arrive while it is running wait for
+    its result (or exception) instead of repeating it. Thread-based callers use `do` and asyncio
+    callers use `ado`. Both share the same in-flight table, so a coroutine can wait on a fetch
+    started by a thread and vice versa.
+    """
+
+    def __init__(self):
+        self._calls: dict[Hashable, Future] = {}
+        self._lock = threading.Lock()
+
+    def _join(self, key: Hashable) -> tuple[Future, bool]:
+        """Return the in-flight future for `key` and whether the caller became its leader."""
+        with self._lock:
+            if key in self._calls:
+                return self._calls[key], False
+            future = self._calls[key] = Future()
+            return future, True
+
+    def _finish(self, key: Hashable, future: Future, result=None, error: BaseException | None = None):
+        with self._lock:
+            del self._calls[key]
+        if error is not None:
+            future.set_exception(error)
+        else:
+            future.set_result(result)
+
+    def do(self, key: Hashable, fn: Callable[[], T]) -> T:
+        """Run `fn` unless a call for `key` is already in flight, in which case wait for that call's result."""
+        future, is_leader = self._join(key)
+        if not is_leader:
+            return future.result()
+
+        try:
+            result = fn()
+        except BaseException as e:
+            self._finish(key, future, error=e)
+            raise
+        self._finish(key, future, result=result)
+        return result
+
+    async def ado(self, key: Hashable, fn: Callable[[], Awaitable[T]]) -> T:
+        """Async version of `do`: await `fn()` unless a call for `key` is already in flight."""
+        future, is_leader = self._join(key)
+        if not is_leader:
+            return await asyncio.wrap_future(future)
+
+        try:
+            result = await fn()
+        except BaseException as e:
+            self._finish(key, future, error=e)
+            raise
+        self._finish(key, future, result=result)
+        return result
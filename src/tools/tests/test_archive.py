@@ -0,0 +1,61 @@
+import httpx
+import pytest
+
+import src.tools.api as api
+import src.tools.client as client_module
+import src.tools.endpoints as endpoints
+from src.data.cache import Cache
+from src.tools.archive import ResponseArchive
+from src.tools.client import FinancialDatasetsClient
+
+
+def _handler(requests):
+    def handle(request):
+        requests.append(request)
+        if request.url.path == "/prices/":
+            day = request.url.params["start_date"]
+            return httpx.Response(200, json={"ticker": "AAPL", "prices": [{"open": 1.0, "close": 2.0, "high": 2.0, "low": 1.0, "volume": 10, "time": f"{day}T00:00:00Z"}]})
+        row = {"ticker": "AAPL", "report_period": "2024-09-30", "period": "ttm", "currency": "USD", "revenue": 5.0, "net_income": 1.0}
+        return httpx.Response(200, json={"search_results": [row]})
+
+    return handle
+
+
+def _use(monkeypatch, data_mode, archive, cache, requests):
+    client = FinancialDatasetsClient(transport=httpx.MockTransport(_handler(requests)), data_mode=data_mode, archive=archive)
+    monkeypatch.setattr(api, "_client", client)
+    monkeypatch.setattr(client_module, "_data_mode", (data_mode, archive))
+    for module in (api, endpoints):
+        monkeypatch.setattr(module, "cache", cache)
+
+
+def _run():
+    prices = api.get_prices("AAPL", "2024-01-02", "2024-01-05")
+    line_items = api.search_line_items("AAPL", ["revenue", "net_income"], "2024-12-31")
+    return [price.close for price in prices], [(item.revenue, item.net_income) for item in line_items]
+
+
+def test_a_run_recorded_with_a_warm_cache_replays_with_a_cold_one(monkeypatch, tmp_path):
+    archive = ResponseArchive(tmp_path)
+
+    # The cache already holds part of the price window and one of the line items
+    warm = Cache()
+    warm.set_prices("AAPL", [{"open": 1.0, "close": 2.0, "high": 2.0, "low": 1.0, "volume": 10, "time": "2024-01-02T00:00:00Z"}], start_date="2024-01-02", end_date="2024-01-03")
+    warm.set_line_items("AAPL_ttm_2024-12-31_10", [{"ticker": "AAPL", "report_period": "2024-09-30", "period": "ttm", "currency": "USD", "revenue": 5.0}], line_items=["revenue"])
+    recorded = []
+    _use(monkeypatch, "record", archive, warm, recorded)
+    expected = _run()
+    _run()
+    # Whole windows are requested despite the warm cache, and repeats come from the archive
+    assert [request.url.params.get("start_date") for request in recorded] == ["2024-01-02", None]
+
+    replayed = []
+    _use(monkeypatch, "replay", archive, Cache(), replayed)
+    assert _run() == expected
+    assert replayed == []
+
+
+def test_replay_fails_on_requests_that_were_not_recorded(monkeypatch, tmp_path):
+    _use(monkeypatch, "replay", ResponseArchive(tmp_path), Cache(), [])
+    with pytest.raises(Exception, match="No recorded response"):
+        api.get_prices("AAPL", "2024-01-02", "2024-01-05")
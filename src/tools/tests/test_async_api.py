@@ -0,0 +1,62 @@
+import asyncio
+
+import httpx
+
+import src.tools.async_api as async_api
+import src.tools.endpoints as endpoints
+from src.data.cache import Cache
+from src.tools.coalesce import RequestCoalescer
+
+
+class _FakeClient:
+    """Answers price and line-item requests and records every call."""
+
+    def __init__(self):
+        self.calls = []
+
+    async def get(self, url, params=None, **kwargs):
+        self.calls.append((url, params["ticker"]))
+        await asyncio.sleep(0.01)
+        return httpx.Response(200, json={"ticker": params["ticker"], "prices": [{"open": 1.0, "close": 1.0, "high": 1.0, "low": 1.0, "volume": 1, "time": params["start_date"]}]})
+
+    async def post(self, url, json=None, **kwargs):
+        self.calls.append((url, tuple(json["line_items"])))
+        await asyncio.sleep(0.01)
+        row = {"ticker": json["tickers"][0], "report_period": "2024-09-30", "period": "ttm", "currency": "USD", **{item: 1.0 for item in json["line_items"]}}
+        return httpx.Response(200, json={"search_results": [row]})
+
+    async def aclose(self):
+        pass
+
+
+def _use(monkeypatch, coalesce_window=0.0):
+    client, cache = _FakeClient(), Cache()
+    for module in (async_api, endpoints):
+        monkeypatch.setattr(module, "cache", cache)
+    monkeypatch.setattr(async_api, "line_items_coalescer", RequestCoalescer(window=coalesce_window))
+    monkeypatch.setattr(async_api, "get_async_client", lambda: client)
+    return client
+
+
+def test_prefetch_accepts_a_generator_and_runs_inside_an_event_loop(monkeypatch):
+    client = _use(monkeypatch)
+
+    async def caller():
+        return async_api.prefetch_universe(["AAPL", "MSFT"], "2024-01-02", "2024-01-02", datasets=(dataset for dataset in ["prices"]))
+
+    assert asyncio.run(caller()) == {}
+    assert sorted(client.calls) == [("/prices/", "AAPL"), ("/prices/", "MSFT")]
+
+
+def test_async_line_item_searches_are_coalesced(monkeypatch):
+    client = _use(monkeypatch, coalesce_window=0.05)
+
+    async def run():
+        return await asyncio.gather(
+            async_api.asearch_line_items("AAPL", ["revenue"], "2024-12-31"),
+            async_api.asearch_line_items("AAPL", ["net_income", "revenue"], "2024-12-31"),
+        )
+
+    first, second = asyncio.run(run())
+    assert client.calls == [("/financials/search/line-items", ("net_income", "revenue"))]
+    assert first[0].revenue == 1.0 and second[0].net_income == 1.0
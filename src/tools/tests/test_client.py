@@ -0,0 +1,101 @@
+import threading
+from concurrent.futures import ThreadPoolExecutor
+
+import httpx
+import pytest
+
+import src.tools.client as client_module
+from src.tools.client import FinancialDatasetsClient
+
+
+def _client(handler, **kwargs) -> FinancialDatasetsClient:
+    return FinancialDatasetsClient(transport=httpx.MockTransport(handler), **kwargs)
+
+
+def _responses(*responses):
+    """A handler answering with `responses` in turn, recording every request."""
+    requests = []
+
+    def handle(request):
+        requests.append(request)
+        return responses[min(len(requests), len(responses)) - 1]
+
+    return handle, requests
+
+
+@pytest.fixture
+def sleeps(monkeypatch):
+    delays = []
+    monkeypatch.setattr(client_module.time, "sleep", delays.append)
+    return delays
+
+
+def test_retry_after_is_honoured_up_to_the_backoff_cap():
+    client = FinancialDatasetsClient(backoff_max=30.0)
+    assert client.backoff_delay(0, httpx.Response(429, headers={"Retry-After": "2"})) == 2.0
+    assert client.backoff_delay(0, httpx.Response(429, headers={"Retry-After": "86400"})) == 30.0
+    assert 0 <= client.backoff_delay(10, httpx.Response(503)) <= 30.0
+
+
+def test_rate_limited_requests_wait_for_retry_after(sleeps):
+    handler, requests = _responses(httpx.Response(429, headers={"Retry-After": "3"}), httpx.Response(200, json={"ok": True}))
+
+    response = _client(handler).get("/prices/", params={"ticker": "AAPL"})
+
+    assert response.json() == {"ok": True}
+    assert len(requests) == 2
+    assert sleeps == [3.0]
+
+
+def test_server_errors_are_retried_up_to_the_limit(sleeps):
+    handler, requests = _responses(httpx.Response(503))
+
+    response = _client(handler, max_retries=2).get("/prices/", params={"ticker": "AAPL"})
+
+    # The last response is returned for the caller to report
+    assert response.status_code == 503
+    assert len(requests) == 3
+    assert len(sleeps) == 2
+
+
+def test_transport_errors_are_raised_once_retries_are_exhausted(sleeps):
+    attempts = []
+
+    def handler(request):
+        attempts.append(request)
+        raise httpx.ConnectError("connection refused", request=request)
+
+    with pytest.raises(httpx.ConnectError):
+        _client(handler, max_retries=1).get("/prices/", params={"ticker": "AAPL"})
+    assert len(attempts) == 2
+
+
+def test_client_errors_are_not_retried(sleeps):
+    handler, requests = _responses(httpx.Response(404), httpx.Response(200))
+
+    assert _client(handler).get("/prices/", params={"ticker": "AAPL"}).status_code == 404
+    assert len(requests) == 1
+    assert sleeps == []
+
+
+def test_in_flight_requests_are_capped_per_host():
+    lock = threading.Lock()
+    in_flight = [0]
+    peak = [0]
+    release = threading.Event()
+
+    def handler(request):
+        with lock:
+            in_flight[0] += 1
+            peak[0] = max(peak[0], in_flight[0])
+        release.wait(0.05)
+        with lock:
+            in_flight[0] -= 1
+        return httpx.Response(200, json={})
+
+    client = _client(handler, max_concurrency_per_host=2, max_connections=10)
+    with ThreadPoolExecutor(max_workers=6) as executor:
+        responses = list(executor.map(lambda i: client.get("/prices/", params={"ticker": f"T{i}"}), range(6)))
+
+    assert all(response.status_code == 200 for response in responses)
+    assert peak[0] == 2
@@ -0,0 +1,51 @@
+import threading
+import time
+
+from src.tools.coalesce import RequestCoalescer
+
+
+def test_a_lone_caller_does_not_wait_for_the_window():
+    coalescer = RequestCoalescer()
+    fetched = []
+
+    started = time.perf_counter()
+    coalescer.request("AAPL", ["revenue"], fetched.append)
+    assert time.perf_counter() - started < 0.01
+    assert fetched == [["revenue"]]
+
+
+def test_items_in_flight_are_not_fetched_again():
+    coalescer = RequestCoalescer()
+    fetched = []
+    gate = threading.Event()
+
+    def fetch(items):
+        fetched.append(items)
+        if items == ["net_income", "revenue"]:
+            gate.wait()
+
+    first = threading.Thread(target=coalescer.request, args=("AAPL", ["revenue", "net_income"], fetch))
+    first.start()
+    time.sleep(0.02)
+    # Arrives while the first fetch is in flight: only free_cash_flow is new
+    second = threading.Thread(target=coalescer.request, args=("AAPL", ["revenue", "free_cash_flow"], fetch))
+    second.start()
+    time.sleep(0.02)
+    assert second.is_alive()  # still waiting for revenue
+    gate.set()
+    for thread in (first, second):
+        thread.join()
+
+    assert fetched == [["net_income", "revenue"], ["free_cash_flow"]]
+
+
+def test_callers_within_the_window_share_one_fetch():
+    coalescer = RequestCoalescer(window=0.05)
+    fetched = []
+    threads = [threading.Thread(target=coalescer.request, args=("AAPL", items, fetched.append)) for items in (["revenue"], ["net_income"], ["revenue"])]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+
+    assert fetched == [["net_income", "revenue"]]
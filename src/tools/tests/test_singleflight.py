@@ -0,0 +1,48 @@
+import asyncio
+import threading
+import time
+
+import pytest
+
+from src.tools.singleflight import SingleFlight
+
+
+def test_concurrent_threads_share_one_call():
+    flight = SingleFlight()
+    calls = []
+
+    def fetch():
+        calls.append(1)
+        time.sleep(0.05)
+        return "result"
+
+    results = []
+    threads = [threading.Thread(target=lambda: results.append(flight.do("key", fetch))) for _ in range(5)]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+
+    assert len(calls) == 1
+    assert results == ["result"] * 5
+
+
+def test_async_callers_share_one_call_and_errors_propagate():
+    flight = SingleFlight()
+    calls = []
+
+    async def fetch():
+        calls.append(1)
+        await asyncio.sleep(0.05)
+        raise ValueError("boom")
+
+    async def run():
+        return await asyncio.gather(*(flight.ado("key", fetch) for _ in range(3)), return_exceptions=True)
+
+    results = asyncio.run(run())
+    assert len(calls) == 1
+    assert all(isinstance(result, ValueError) for result in results)
+
+    # The failed call is no longer in flight, so the next caller retries
+    with pytest.raises(KeyError):
+        flight.do("key", lambda: {}["missing"])
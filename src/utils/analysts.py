@@ -1,76 +1,99 @@
 """Constants and utilities related to analysts configuration."""
 
+from src.agents.aswath_damodaran import PROMPT_VERSION as ASWATH_DAMODARAN_PROMPT_VERSION
 from src.agents.aswath_damodaran import aswath_damodaran_agent
+from src.agents.ben_graham import PROMPT_VERSION as BEN_GRAHAM_PROMPT_VERSION
 from src.agents.ben_graham import ben_graham_agent
+from src.agents.bill_ackman import PROMPT_VERSION as BILL_ACKMAN_PROMPT_VERSION
 from src.agents.bill_ackman import bill_ackman_agent
+from src.agents.cathie_wood import PROMPT_VERSION as CATHIE_WOOD_PROMPT_VERSION
 from src.agents.cathie_wood import cathie_wood_agent
+from src.agents.charlie_munger import PROMPT_VERSION as CHARLIE_MUNGER_PROMPT_VERSION
 from src.agents.charlie_munger import charlie_munger_agent
 from src.agents.fundamentals import fundamentals_analyst_agent
+from src.agents.michael_burry import PROMPT_VERSION as MICHAEL_BURRY_PROMPT_VERSION
 from src.agents.michael_burry import michael_burry_agent
+from src.agents.peter_lynch import PROMPT_VERSION as PETER_LYNCH_PROMPT_VERSION
 from src.agents.peter_lynch import peter_lynch_agent
+from src.agents.phil_fisher import PROMPT_VERSION as PHIL_FISHER_PROMPT_VERSION
 from src.agents.phil_fisher import phil_fisher_agent
+from src.agents.rakesh_jhunjhunwala import PROMPT_VERSION as RAKESH_JHUNJHUNWALA_PROMPT_VERSION
 from src.agents.rakesh_jhunjhunwala import rakesh_jhunjhunwala_agent
 from src.agents.sentiment import sentiment_analyst_agent
+from src.agents.stanley_druckenmiller import PROMPT_VERSION as STANLEY_DRUCKENMILLER_PROMPT_VERSION
 from src.agents.stanley_druckenmiller import stanley_druckenmiller_agent
 from src.agents.technicals import technical_analyst_agent
 from src.agents.valuation import valuation_analyst_agent
+from src.agents.warren_buffett import PROMPT_VERSION as WARREN_BUFFETT_PROMPT_VERSION
 from src.agents.warren_buffett import warren_buffett_agent
+from src.llm.decisions import with_decision_store
 
 # Define analyst configuration - single source of truth
 ANALYST_CONFIG = {
     "aswath_damodaran": {
         "display_name": "Aswath Damodaran",
         "agent_func": aswath_damodaran_agent,
+        "prompt_version": ASWATH_DAMODARAN_PROMPT_VERSION,
         "order": 0,
     },
     "ben_graham": {
         "display_name": "Ben Graham",
         "agent_func": ben_graham_agent,
+        "prompt_version": BEN_GRAHAM_PROMPT_VERSION,
         "order": 1,
     },
     "bill_ackman": {
         "display_name": "Bill Ackman",
         "agent_func": bill_ackman_agent,
+        "prompt_version": BILL_ACKMAN_PROMPT_VERSION,
         "order": 2,
     },
     "cathie_wood": {
         "display_name": "Cathie Wood",
         "agent_func": cathie_wood_agent,
+        "prompt_version": CATHIE_WOOD_PROMPT_VERSION,
         "order": 3,
     },
     "charlie_munger": {
         "display_name": "Charlie Munger",
         "agent_func": charlie_munger_agent,
+        "prompt_version": CHARLIE_MUNGER_PROMPT_VERSION,
         "order": 4,
     },
     "michael_burry": {
         "display_name": "Michael Burry",
         "agent_func": michael_burry_agent,
+        "prompt_version": MICHAEL_BURRY_PROMPT_VERSION,
         "order": 5,
     },
     "peter_lynch": {
         "display_name": "Peter Lynch",
         "agent_func": peter_lynch_agent,
+        "prompt_version": PETER_LYNCH_PROMPT_VERSION,
         "order": 6,
     },
     "phil_fisher": {
         "display_name": "Phil Fisher",
         "agent_func": phil_fisher_agent,
+        "prompt_version": PHIL_FISHER_PROMPT_VERSION,
         "order": 7,
     },
     "rakesh_jhunjhunwala": {
         "display_name": "Rakesh Jhunjhunwala",
         "agent_func": rakesh_jhunjhunwala_agent,
+        "prompt_version": RAKESH_JHUNJHUNWALA_PROMPT_VERSION,
         "order": 8,
     },
     "stanley_druckenmiller": {
         "display_name": "Stanley Druckenmiller",
         "agent_func": stanley_druckenmiller_agent,
+        "prompt_version": STANLEY_DRUCKENMILLER_PROMPT_VERSION,
         "order": 9,
     },
     "warren_buffett": {
         "display_name": "Warren Buffett",
         "agent_func": warren_buffett_agent,
+        "prompt_version": WARREN_BUFFETT_PROMPT_VERSION,
         "order": 10,
     },
     "technical_analyst": {
@@ -100,5 +123,8 @@ ANALYST_ORDER = [(config["display_name"], key) for key, config in sorted(ANALYST
 
 
 def get_analyst_nodes():
-    """Get the mapping of analyst keys to their (node_name, agent_func) tuples."""
-    return {key: (f"{key}_agent", config["agent_func"]) for key, config in ANALYST_CONFIG.items()}
+    """
+    Get the mapping of analyst keys to their (node_name, agent_func) tuples.
+    Analysts that use an LLM, those with a prompt version, reuse the signals kept in the decision store.
+    """
+    return {key: (f"{key}_agent", with_decision_store(f"{key}_agent", config["agent_func"], config["prompt_version"]) if "prompt_version" in config else config["agent_func"]) for key, config in ANALYST_CONFIG.items()}
@@ -229,8 +229,11 @@ def print_trading_output(result: dict) -> None:
         print(f"{Fore.CYAN}{wrapped_reasoning}{Style.RESET_ALL}")
 
 
-def print_backtest_results(table_rows: list) -> None:
-    """Print the backtest results in a nicely formatted table"""
+def print_backtest_results(table_rows: list, summary: Any = None) -> None:
+    """
+    Print the backtest results in a nicely formatted table, below the latest portfolio summary.
+    The summary is a DaySummary; without one, it is taken from the rows format_backtest_row made with is_summary=True.
+    """
     # Clear the screen
     os.system("cls" if os.name == "nt" else "clear")
 
@@ -245,7 +248,7 @@ def print_backtest_results(table_rows: list) -> None:
             ticker_rows.append(row)
 
     # Display latest portfolio summary
-    if summary_rows:
+    if summary is None and summary_rows:
         latest_summary = summary_rows[-1]
         print(f"\n{Fore.WHITE}{Style.BRIGHT}PORTFOLIO SUMMARY:{Style.RESET_ALL}")
 
@@ -266,6 +269,21 @@ def print_backtest_results(table_rows: list) -> None:
             print(f"Sortino Ratio: {latest_summary[11]}")
         if latest_summary[12]:  # Max drawdown
             print(f"Max Drawdown: {latest_summary[12]}")
+    elif summary is not None:
+        return_color = Fore.GREEN if summary.return_pct >= 0 else Fore.RED
+        print(f"\n{Fore.WHITE}{Style.BRIGHT}PORTFOLIO SUMMARY:{Style.RESET_ALL}")
+        print(f"Cash Balance: {Fore.CYAN}${summary.cash_balance:,.2f}{Style.RESET_ALL}")
+        print(f"Total Position Value: {Fore.YELLOW}${summary.total_position_value:,.2f}{Style.RESET_ALL}")
+        print(f"Total Value: {Fore.WHITE}${summary.total_value:,.2f}{Style.RESET_ALL}")
+        print(f"Return: {return_color}{summary.return_pct:+.2f}%{Style.RESET_ALL}")
+
+        # Display performance metrics if available
+        if summary.sharpe_ratio is not None:
+            print(f"Sharpe Ratio: {Fore.YELLOW}{summary.sharpe_ratio:.2f}{Style.RESET_ALL}")
+        if summary.sortino_ratio is not None:
+            print(f"Sortino Ratio: {Fore.YELLOW}{summary.sortino_ratio:.2f}{Style.RESET_ALL}")
+        if summary.max_drawdown is not None:
+            print(f"Max Drawdown: {Fore.RED}{abs(summary.max_drawdown):.2f}%{Style.RESET_ALL}")
 
     # Add vertical spacing
     print("\n" * 2)
@@ -306,6 +324,44 @@ def print_backtest_results(table_rows: list) -> None:
     print("\n" * 4)
 
 
+def print_data_stats(stats: dict) -> None:
+    """Print per-dataset cache and API usage from a DataStats snapshot."""
+    rows = []
+    for dataset, counters in stats["datasets"].items():
+        latency = counters["latency_ms"]
+        hit_rate = counters["hit_rate"]
+        rows.append(
+            [
+                dataset,
+                counters["hits"],
+                counters["misses"],
+                f"{hit_rate:.1%}" if hit_rate is not None else "-",
+                counters["requests"],
+                counters["retries"],
+                counters["errors"],
+                f"{latency['p50']:.0f}" if latency else "-",
+                f"{latency['p90']:.0f}" if latency else "-",
+                f"{latency['p99']:.0f}" if latency else "-",
+                f"{counters['bytes_stored'] / 1024:,.1f}",
+                f"{counters['bytes_written'] / 1024:,.1f}",
+                counters["evictions"],
+            ]
+        )
+
+    print(f"\n{Fore.WHITE}{Style.BRIGHT}DATA CACHE / API USAGE:{Style.RESET_ALL}")
+    if not rows:
+        print("No data requests recorded")
+        return
+    print(
+        tabulate(
+            rows,
+            headers=["Dataset", "Hits", "Misses", "Hit Rate", "Requests", "Retries", "Errors", "p50 ms", "p90 ms", "p99 ms", "Stored KiB", "Written KiB", "Evictions"],
+            tablefmt="grid",
+            colalign=("left", *["right"] * 12),
+        )
+    )
+
+
 def format_backtest_row(
     date: str,
     ticker: str,
@@ -1,11 +1,121 @@
 """Helper functions for LLM"""
 
 import json
+import os
+import threading
+from collections.abc import Iterator
+from concurrent.futures import ThreadPoolExecutor
+from contextlib import contextmanager
+from contextvars import ContextVar, copy_context
+from typing import Any
 
-from pydantic import BaseModel
+from langchain_core.messages import HumanMessage
+from langchain_core.prompt_values import ChatPromptValue
+from pydantic import BaseModel, ValidationError
 
-from src.llm.models import get_model, get_model_info
+from src.llm.cache import get_response_cache, prompt_messages, response_key
+from src.llm.models import get_model_info, get_model_registry
+from src.llm.scheduler import get_llm_scheduler
 from src.utils.progress import progress
+from src.utils.tickers import ticker_workers
+
+# Output tokens assumed per request when estimating its size for the scheduler
+ESTIMATED_OUTPUT_TOKENS = 500
+
+BATCH_INSTRUCTIONS = """Analyze each ticker above independently, as if it were the only one.
+Return a single JSON object with a "signals" key that maps each of these tickers to its signal, each in exactly the JSON format requested above: {tickers}"""
+
+# Tickers whose LLM call returned a default output after failing, collected by track_failed_tickers
+_failed_tickers: ContextVar[set[str] | None] = ContextVar("failed_tickers", default=None)
+
+
+@contextmanager
+def track_failed_tickers() -> Iterator[set[str]]:
+    """Collect the tickers whose LLM calls within the block fall back to a default output."""
+    failed: set[str] = set()
+    token = _failed_tickers.set(failed)
+    try:
+        yield failed
+    finally:
+        _failed_tickers.reset(token)
+
+
+class _LLMRequest:
+    """Model selection, cached outputs, and output parsing shared by call_llm and acall_llm."""
+
+    def __init__(self, prompt: any, pydantic_model: type[BaseModel], agent_name: str | None, state: dict | None, ticker: str | None, use_cache: bool):
+        self.prompt = prompt
+        self.pydantic_model = pydantic_model
+        self.agent_name = agent_name
+        self.ticker = ticker
+        model_name = model_provider = None
+
+        # Extract model configuration if state is provided and agent_name is available
+        if state and agent_name:
+            model_name, model_provider = get_agent_model_config(state, agent_name)
+
+        # Fallback to defaults if still not provided
+        if not model_name:
+            model_name = "gpt-4o"
+        if not model_provider:
+            model_provider = "OPENAI"
+        self.model_name, self.model_provider = model_name, model_provider
+        self.model_info = get_model_info(model_name, model_provider)
+        self.response_cache = get_response_cache() if use_cache else None
+        self.cache_key = None
+        self._llm = None
+
+    @property
+    def llm(self):
+        """Shared client, already wrapped for structured output unless the model lacks JSON mode."""
+        if self._llm is None:
+            self._llm = get_model_registry().get_structured(self.model_name, self.model_provider, self.pydantic_model)
+        return self._llm
+
+    def saved_output(self) -> BaseModel | None:
+        """An output from the response cache, if any."""
+        # Any agent, run or user that sent this exact request before gets the same response. create_model leaves
+        # every client at its provider's default temperature, so the key needs no client to read it from.
+        if self.response_cache is not None:
+            self.cache_key = response_key(self.prompt, self.model_name, self.model_provider, None, self.pydantic_model)
+            return self.response_cache.get(self.cache_key, self.pydantic_model)
+        return None
+
+    def parse(self, result: any) -> BaseModel | None:
+        """The structured output of a model response, or None if it holds no usable JSON."""
+        # For non-JSON support models, we need to extract and parse the JSON manually
+        if self.model_info and not self.model_info.has_json_mode():
+            parsed_result = extract_json_from_response(result.content)
+            return self.pydantic_model(**parsed_result) if parsed_result else None
+        return result
+
+    def save(self, result: BaseModel):
+        # Only real model outputs are cached, never the defaults used after failures
+        if self.cache_key is not None:
+            self.response_cache.set(self.cache_key, result)
+
+    def estimated_tokens(self) -> int:
+        """Rough prompt plus output size, for the scheduler's tokens-per-minute limits."""
+        return len(json.dumps(prompt_messages(self.prompt), default=str)) // 4 + ESTIMATED_OUTPUT_TOKENS
+
+    def failed(self, attempt: int, max_retries: int, error: Exception, default_factory) -> BaseModel | None:
+        """Report a failed attempt; after the last one, the default response to return."""
+        if self.agent_name:
+            progress.update_status(self.agent_name, None, f"Error - retry {attempt + 1}/{max_retries}")
+
+        if attempt == max_retries - 1:
+            print(f"Error in LLM call after {max_retries} attempts: {error}")
+            return self.default(default_factory)
+        return None
+
+    def default(self, default_factory) -> BaseModel:
+        """The output used when the model gave none, noted for track_failed_tickers."""
+        if self.ticker and (failed := _failed_tickers.get()) is not None:
+            failed.add(self.ticker)
+        # Use default_factory if provided, otherwise create a basic default
+        if default_factory:
+            return default_factory()
+        return create_default_response(self.pydantic_model)
 
 
 def call_llm(
@@ -15,6 +125,8 @@ def call_llm(
     state: dict | None = None,
     max_retries: int = 3,
     default_factory=None,
+    ticker: str | None = None,
+    use_cache: bool = True,
 ) -> BaseModel:
     """
     Makes an LLM call with retry logic, handling both JSON supported and non-JSON supported models.
@@ -26,58 +138,165 @@ def call_llm(
         state: Optional state object to extract agent-specific model configuration
         max_retries: Maximum number of retries (default: 3)
         default_factory: Optional factory function to create default response on failure
+        ticker: Optional ticker the call is about, reported to track_failed_tickers when the call fails
+        use_cache: Whether the response cache may answer and store this call, when it is enabled
 
     Returns:
         An instance of the specified Pydantic model
     """
+    request = _LLMRequest(prompt, pydantic_model, agent_name, state, ticker, use_cache)
+    if (saved := request.saved_output()) is not None:
+        return saved
 
-    # Extract model configuration if state is provided and agent_name is available
-    if state and agent_name:
-        model_name, model_provider = get_agent_model_config(state, agent_name)
+    # Call the LLM with retries, within the provider's and model's rate limits
+    scheduler = get_llm_scheduler()
+    for attempt in range(max_retries):
+        try:
+            result = request.parse(scheduler.run_sync(request.model_provider, request.model_name, agent_name, request.estimated_tokens(), lambda: request.llm.invoke(prompt)))
+            if result is None:
+                continue
+            request.save(result)
+            return result
 
-    # Fallback to defaults if still not provided
-    if not model_name:
-        model_name = "gpt-4o"
-    if not model_provider:
-        model_provider = "OPENAI"
+        except Exception as e:
+            if (default := request.failed(attempt, max_retries, e, default_factory)) is not None:
+                return default
 
-    model_info = get_model_info(model_name, model_provider)
-    llm = get_model(model_name, model_provider)
+    # Every attempt returned a response without usable JSON
+    return request.default(None)
 
-    # For non-JSON support models, we can use structured output
-    if not (model_info and not model_info.has_json_mode()):
-        llm = llm.with_structured_output(
-            pydantic_model,
-            method="json_mode",
-        )
 
-    # Call the LLM with retries
+async def acall_llm(
+    prompt: any,
+    pydantic_model: type[BaseModel],
+    agent_name: str | None = None,
+    state: dict | None = None,
+    max_retries: int = 3,
+    default_factory=None,
+    ticker: str | None = None,
+    use_cache: bool = True,
+) -> BaseModel:
+    """
+    Async version of call_llm. The LLM scheduler queues the request until its provider and model have capacity,
+    so an agent can submit the prompts of all its tickers at once, e.g. with asyncio.gather.
+    """
+    request = _LLMRequest(prompt, pydantic_model, agent_name, state, ticker, use_cache)
+    if (saved := request.saved_output()) is not None:
+        return saved
+
+    scheduler = get_llm_scheduler()
     for attempt in range(max_retries):
         try:
-            # Call the LLM
-            result = llm.invoke(prompt)
-
-            # For non-JSON support models, we need to extract and parse the JSON manually
-            if model_info and not model_info.has_json_mode():
-                parsed_result = extract_json_from_response(result.content)
-                if parsed_result:
-                    return pydantic_model(**parsed_result)
-            else:
-                return result
+            result = request.parse(await scheduler.run(request.model_provider, request.model_name, agent_name, request.estimated_tokens(), lambda: request.llm.ainvoke(prompt)))
+            if result is None:
+                continue
+            request.save(result)
+            return result
 
         except Exception as e:
-            if agent_name:
-                progress.update_status(agent_name, None, f"Error - retry {attempt + 1}/{max_retries}")
-
-            if attempt == max_retries - 1:
-                print(f"Error in LLM call after {max_retries} attempts: {e}")
-                # Use default_factory if provided, otherwise create a basic default
-                if default_factory:
-                    return default_factory()
-                return create_default_response(pydantic_model)
-
-    # This should never be reached due to the retry logic above
-    return create_default_response(pydantic_model)
+            if (default := request.failed(attempt, max_retries, e, default_factory)) is not None:
+                return default
+
+    return request.default(None)
+
+
+def call_llm_many(requests: list[dict[str, any]]) -> list[BaseModel]:
+    """
+    Submit several call_llm requests (each a dict of its keyword arguments) at once from synchronous code
+    and return their outputs in order. Takes about as long as the slowest request within the rate limits.
+
+    The requests run on at most ticker_workers() threads with the caller's context, not on an event loop of their
+    own: agents call this from several threads at once, and the async clients are tied to the event loop that
+    first used them.
+    """
+    workers = min(len(requests), ticker_workers())
+    if workers <= 1:
+        return [call_llm(**request) for request in requests]
+    with ThreadPoolExecutor(max_workers=workers, thread_name_prefix="llm") as executor:
+        futures = [executor.submit(copy_context().run, call_llm, **request) for request in requests]
+        return [future.result() for future in futures]
+
+
+class BatchedOutputs(BaseModel):
+    """Outputs of a batched request, keyed by ticker; each one is validated separately."""
+
+    signals: dict[str, dict[str, Any]]
+
+
+def batch_prompt(prompts: dict[str, ChatPromptValue]) -> ChatPromptValue:
+    """
+    Combine the prompts of several tickers into one asking for an output per ticker. The prompts share their
+    system messages, which are sent once, followed by each ticker's own messages.
+    """
+    first = next(iter(prompts.values()))
+    system = [message for message in first.messages if message.type == "system"]
+    sections = []
+    for ticker, prompt in prompts.items():
+        content = "\n\n".join(str(message.content) for message in prompt.messages if message.type != "system")
+        sections.append(f"=== {ticker} ===\n{content}")
+    sections.append(BATCH_INSTRUCTIONS.format(tickers=", ".join(prompts)))
+    return ChatPromptValue(messages=[*system, HumanMessage(content="\n\n".join(sections))])
+
+
+def call_llm_per_ticker(
+    prompts: dict[str, any],
+    pydantic_model: type[BaseModel],
+    agent_name: str | None = None,
+    state: dict | None = None,
+    default_factory=None,
+    batch_size: int | None = None,
+) -> dict[str, BaseModel]:
+    """
+    Get an output for every ticker's prompt, keyed like `prompts`. The prompts are sent at once, one request
+    per ticker or, with a batch size above 1, `batch_size` tickers per request (see batch_prompt). A batched
+    output is validated per ticker, and tickers missing from it or invalid fall back to their own request.
+
+    Args:
+        prompts: Each ticker's prompt; prompts batched together must share their system messages
+        pydantic_model: The Pydantic model class of each ticker's output
+        agent_name: Optional name of the agent for progress updates and model config extraction
+        state: Optional state object to extract agent-specific model configuration
+        default_factory: Optional factory function to create default response on failure
+        batch_size: Tickers per request (default: get_llm_batch_size())
+    """
+    batch_size = batch_size or get_llm_batch_size()
+    tickers = list(prompts)
+    outputs: dict[str, BaseModel] = {}
+
+    if batch_size > 1 and len(tickers) > 1:
+        # A batch of one would only add the batch instructions to a single-ticker request
+        batches = [batch for i in range(0, len(tickers), batch_size) if len(batch := tickers[i : i + batch_size]) > 1]
+        requests = [{"prompt": batch_prompt({ticker: prompts[ticker] for ticker in batch}), "pydantic_model": BatchedOutputs, "agent_name": agent_name, "state": state, "default_factory": lambda: BatchedOutputs(signals={})} for batch in batches]
+        for batch, response in zip(batches, call_llm_many(requests)):
+            for ticker in batch:
+                try:
+                    outputs[ticker] = pydantic_model.model_validate(response.signals[ticker])
+                except (KeyError, ValidationError):
+                    pass
+
+    remaining = [ticker for ticker in tickers if ticker not in outputs]
+    requests = [{"prompt": prompts[ticker], "pydantic_model": pydantic_model, "agent_name": agent_name, "state": state, "default_factory": default_factory, "ticker": ticker} for ticker in remaining]
+    if requests:
+        outputs.update(zip(remaining, call_llm_many(requests)))
+    return {ticker: outputs[ticker] for ticker in tickers}
+
+
+_batch_size: int | None = None
+_batch_size_lock = threading.Lock()
+
+
+def set_llm_batch_size(size: int | None):
+    """Tickers per request in call_llm_per_ticker; None restores the LLM_BATCH_SIZE environment variable."""
+    global _batch_size
+    with _batch_size_lock:
+        _batch_size = size
+
+
+def get_llm_batch_size() -> int:
+    """Tickers per request in call_llm_per_ticker: set_llm_batch_size, else LLM_BATCH_SIZE, else 1 (no batching)."""
+    if _batch_size is not None:
+        return max(1, _batch_size)
+    return max(1, int(os.environ.get("LLM_BATCH_SIZE") or 1))
 
 
 def create_default_response(model_class: type[BaseModel]) -> BaseModel:
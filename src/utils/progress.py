@@ -1,3 +1,4 @@
+import threading
 from collections.abc import Callable
 from datetime import UTC, datetime
 
@@ -19,6 +20,8 @@ class AgentProgress:
         self.live = Live(self.table, console=console, refresh_per_second=4)
         self.started = False
         self.update_handlers: list[Callable[[str, str | None, str], None]] = []
+        # Agents report from parallel threads
+        self._lock = threading.RLock()
 
     def register_handler(self, handler: Callable[[str, str | None, str], None]):
         """Register a handler to be called when agent status updates."""
@@ -44,25 +47,26 @@ class AgentProgress:
 
     def update_status(self, agent_name: str, ticker: str | None = None, status: str = "", analysis: str | None = None):
         """Update the status of an agent."""
-        if agent_name not in self.agent_status:
-            self.agent_status[agent_name] = {"status": "", "ticker": None}
+        with self._lock:
+            if agent_name not in self.agent_status:
+                self.agent_status[agent_name] = {"status": "", "ticker": None}
 
-        if ticker:
-            self.agent_status[agent_name]["ticker"] = ticker
-        if status:
-            self.agent_status[agent_name]["status"] = status
-        if analysis:
-            self.agent_status[agent_name]["analysis"] = analysis
+            if ticker:
+                self.agent_status[agent_name]["ticker"] = ticker
+            if status:
+                self.agent_status[agent_name]["status"] = status
+            if analysis:
+                self.agent_status[agent_name]["analysis"] = analysis
 
-        # Set the timestamp as UTC datetime
-        timestamp = datetime.now(UTC).isoformat()
-        self.agent_status[agent_name]["timestamp"] = timestamp
+            # Set the timestamp as UTC datetime
+            timestamp = datetime.now(UTC).isoformat()
+            self.agent_status[agent_name]["timestamp"] = timestamp
 
-        # Notify all registered handlers
-        for handler in self.update_handlers:
-            handler(agent_name, ticker, status, analysis, timestamp)
+            # Notify all registered handlers
+            for handler in self.update_handlers:
+                handler(agent_name, ticker, status, analysis, timestamp)
 
-        self._refresh_display()
+            self._refresh_display()
 
     def get_all_status(self):
         """Get the current status of all agents as a dictionary."""
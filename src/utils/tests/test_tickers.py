@@ -0,0 +1,63 @@
+import threading
+import time
+
+import pytest
+
+import src.agents.ben_graham as ben_graham
+from src.utils.tickers import run_per_ticker
+
+
+def test_results_follow_ticker_order_and_workers_are_bounded():
+    active = peak = 0
+    lock = threading.Lock()
+
+    def analyze(ticker):
+        nonlocal active, peak
+        with lock:
+            active += 1
+            peak = max(peak, active)
+        # Later tickers finish first
+        time.sleep(0.01 * (10 - int(ticker[1:])))
+        with lock:
+            active -= 1
+        return ticker.lower()
+
+    tickers = [f"T{i}" for i in range(10)]
+    results = run_per_ticker(tickers, analyze, max_workers=3)
+    assert list(results) == tickers and list(results.values()) == [ticker.lower() for ticker in tickers]
+    assert peak == 3
+
+
+def test_first_failure_in_ticker_order_is_raised():
+    def analyze(ticker):
+        if ticker != "AAPL":
+            time.sleep(0.01 if ticker == "MSFT" else 0)
+            raise ValueError(ticker)
+        return ticker
+
+    with pytest.raises(ValueError, match="MSFT"):
+        run_per_ticker(["AAPL", "MSFT", "NVDA"], analyze, max_workers=3)
+
+
+def test_agent_signals_do_not_depend_on_the_other_tickers(monkeypatch):
+    prompts = {}
+
+    def prompt(ticker, analysis_data):
+        prompts[ticker] = analysis_data
+        return ticker
+
+    def call_llm_per_ticker(prompts, pydantic_model, agent_name, state, default_factory):
+        return {ticker: pydantic_model(signal="neutral", confidence=50.0, reasoning=prompt) for ticker, prompt in prompts.items()}
+
+    monkeypatch.setattr(ben_graham, "search_line_items", lambda ticker, *args, **kwargs: [])
+    monkeypatch.setattr(ben_graham, "get_market_cap", lambda ticker, end_date: None)
+    monkeypatch.setattr(ben_graham, "graham_prompt", prompt)
+    monkeypatch.setattr(ben_graham, "call_llm_per_ticker", call_llm_per_ticker)
+
+    state = {"data": {"end_date": "2024-12-31", "tickers": ["NVDA", "AAPL", "MSFT"], "analyst_signals": {}}, "metadata": {"show_reasoning": False}}
+    ben_graham.ben_graham_agent(state)
+
+    signals = state["data"]["analyst_signals"]["ben_graham_agent"]
+    assert list(signals) == ["NVDA", "AAPL", "MSFT"]
+    assert [signal["reasoning"] for signal in signals.values()] == ["NVDA", "AAPL", "MSFT"]
+    assert all(list(prompts[ticker]) == [ticker] for ticker in signals)
@@ -0,0 +1,28 @@
+"""Run an agent's per-ticker pipeline for all of its tickers at once."""
+
+import os
+from collections.abc import Callable
+from concurrent.futures import ThreadPoolExecutor
+from typing import TypeVar
+
+T = TypeVar("T")
+
+# Tickers an agent analyzes at the same time; its LLM calls are further limited by the LLM scheduler
+DEFAULT_TICKER_WORKERS = 8
+
+
+def ticker_workers() -> int:
+    """Worker threads per agent: AGENT_TICKER_WORKERS if set, where 1 analyzes the tickers one by one."""
+    return max(1, int(os.environ.get("AGENT_TICKER_WORKERS") or DEFAULT_TICKER_WORKERS))
+
+
+def run_per_ticker(tickers: list[str], analyze: Callable[[str], T], max_workers: int | None = None) -> dict[str, T]:
+    """
+    Run `analyze(ticker)` for every ticker on a bounded thread pool. The results are keyed by ticker in the order
+    of `tickers`, whatever order they finish in. If any ticker fails, the first failure in ticker order is raised.
+    """
+    workers = min(max_workers or ticker_workers(), len(tickers))
+    if workers <= 1:
+        return {ticker: analyze(ticker) for ticker in tickers}
+    with ThreadPoolExecutor(max_workers=workers, thread_name_prefix="ticker") as executor:
+        return dict(zip(tickers, executor.map(analyze, tickers)))